@@ -0,0 +1,78 @@
+'''
+Benchmark of the memory of a `ComponentWindowsManager` while a tool panel is opened and closed in a tight loop.
+
+Every cycle creates a window with `create_window()`, initializes it, and destroys it. A frame is drawn every `--frame-every` cycles.
+The memory is sampled along the way: the blocks allocated by Python, the vertices allocated in the batch of the manager and its groups.
+
+    delete  `destroy_window()` deletes the shapes of the window
+    pool    `destroy_window()` keeps the window in a `ComponentWindowPool`, `create_window()` recycles it
+
+Usage:
+    python benchmarks/bench_churn.py [--cycles 100000] [--samples 10] [--modes delete pool]
+'''
+import argparse, gc, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from utils.components.window import ComponentWindowsManager, ComponentWindowPool
+from utils.metrics.headless import HeadlessWindow
+
+MODES = ('delete', 'pool')
+
+
+def get_vertices(manager:ComponentWindowsManager) -> int:
+    __domains = [domain for domains in manager.batch.group_map.values() for domain in domains.values()]
+    return sum(sum(domain.allocator.get_allocated_regions()[1]) for domain in __domains)
+
+
+def get_sample(manager:ComponentWindowsManager, cycle:int) -> dict:
+    gc.collect()
+    return {'cycle': cycle, 'blocks': sys.getallocatedblocks(), 'vertices': get_vertices(manager), 'groups': len(manager.batch.group_map)}
+
+
+def run(mode:str, cycles:int, samples:int, frame_every:int) -> list:
+    manager = ComponentWindowsManager(window=HeadlessWindow(1280, 720), **({'window_pool': ComponentWindowPool()} if mode == 'pool' else {}))
+    for index in range(4):
+        manager.create_window(name=f'Panel_{index}', show_title=True)
+    manager.on_init()
+    manager.window.draw()
+
+    __samples, __start = [get_sample(manager, 0)], time.perf_counter()
+    for cycle in range(1, cycles + 1):
+        __window = manager.create_window(name='Tool', show_title=True, title=f'Tool {cycle % 7}')
+        manager.destroy_window(__window.name)
+        if cycle % frame_every == 0:
+            manager.window.draw()
+        if cycle % max(cycles // samples, 1) == 0:
+            __samples.append(get_sample(manager, cycle))
+    __samples[-1]['us_per_cycle'] = (time.perf_counter() - __start) / cycles * 1e6
+    manager.window.close()
+    return __samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cycles', type=int, default=100000)
+    parser.add_argument('--samples', type=int, default=10)
+    parser.add_argument('--frame-every', type=int, default=10)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        __samples = run(mode, args.cycles, args.samples, args.frame_every)
+        print(f"{mode}: {__samples[-1]['us_per_cycle']:.0f} us per cycle")
+        print(f"{'cycle':>10}{'blocks':>12}{'vertices':>10}{'groups':>8}")
+        for sample in __samples:
+            print(f"{sample['cycle']:>10}{sample['blocks']:>12}{sample['vertices']:>10}{sample['groups']:>8}")
+        __growth = __samples[-1]['blocks'] - __samples[1]['blocks'] if len(__samples) > 2 else 0
+        print(f'blocks since the first sample: {__growth:+d}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+'''
+Benchmark of a `ComponentConsoleWindow` fed with build logs: the lines ingested per second and the frame time with a long history.
+
+Ingestion is measured without drawing:
+
+    buffer   `LineRingBuffer.extend()` with batches of `--batch` lines
+    console  `write()` of a chunk of `--batch` lines from a worker thread, moved into the scrollback by the next redraw of the console
+
+The console is then filled with `--history` lines and frames are drawn in an invisible pyglet window, `glFinish` included:
+
+    idle      no new line
+    stream    `--lines-per-frame` new lines per frame, the console follows them
+    scroll    the console scrolls up by a page every frame
+    document  a baseline without virtualization: a multiline `Label` showing the visible lines, its text set again every frame
+
+Usage:
+    python benchmarks/bench_console.py [--history 1000000] [--batch 1000] [--lines-per-frame 200] [--frames 120]
+'''
+import argparse, gc, os, sys, threading, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from pyglet import gl
+from pyglet.text import Label
+from utils.components.window import ComponentWindowsManager
+from utils.components.console import ComponentConsoleWindow
+from utils.types.t_buffers import LineRingBuffer
+
+MODES = ('idle', 'stream', 'scroll', 'document')
+LEVELS = ('INFO', 'INFO', 'INFO', 'DEBUG', 'WARNING')
+
+
+def get_lines(start:int, count:int) -> list:
+    ''' Lines of a build log, of 60 to 120 characters. '''
+    return [f'[{index:09d}] {LEVELS[index % len(LEVELS)]:<7} compiling src/module_{index % 977}/unit_{index % 31}.cpp'
+            + ' -O2 -Wall' * (index % 7) for index in range(start, start + count)]
+
+
+def bench_ingest(total:int, batch:int) -> dict:
+    __chunks = [get_lines(start, batch) for start in range(0, total, batch)]
+    __texts = ['\n'.join(chunk) + '\n' for chunk in __chunks]
+    gc.collect()
+
+    __buffer = LineRingBuffer(total, 256 * 1024 * 1024)
+    __start = time.perf_counter()
+    for chunk in __chunks:
+        __buffer.extend(chunk)
+    __results = {'buffer': total / (time.perf_counter() - __start)}
+
+    pyglet.window.Window._enable_event_queue = True
+    manager = ComponentWindowsManager(width=1280, height=720, visible=False)
+    pyglet.window.Window._enable_event_queue = False
+    console = manager.create_window(name='Console', show_title=True, window_class=ComponentConsoleWindow, max_lines=total, max_bytes=256 * 1024 * 1024)
+    manager.on_init()
+    manager.on_resize(1280, 720)
+    manager.on_draw()
+    gc.collect()
+    __start = time.perf_counter()
+    for text in __texts:
+        __writer = threading.Thread(target=console.write, args=(text,))
+        __writer.start()
+        __writer.join()
+        console.on_redraw()
+    __results['console'] = total / (time.perf_counter() - __start)
+    assert console.scrollback.total == total, 'the console lost lines'
+    manager.window.close()
+    return __results
+
+
+def bench_frames(mode:str, history:int, lines_per_frame:int, frames:int) -> dict:
+    pyglet.window.Window._enable_event_queue = True
+    manager = ComponentWindowsManager(width=1280, height=720, visible=False)
+    # The events of the pyglet window are dispatched at once, like in `run()`
+    pyglet.window.Window._enable_event_queue = False
+    console = manager.create_window(name='Console', show_title=True, window_class=ComponentConsoleWindow, max_lines=history, max_bytes=256 * 1024 * 1024)
+    manager.on_init()
+    manager.on_resize(1280, 720)
+    for start in range(0, history, 100000):
+        console.write_lines(get_lines(start, min(100000, history - start)))
+        console.flush_pending()
+    manager.on_draw()
+
+    __document = None
+    if mode == 'document':
+        x, y, width, height = console.get_content_rect()
+        console.hide_shapes()
+        console.background.visible = True
+        __document = Label('', x=x + console.padding, y=y + height - console.padding, width=width, multiline=True, anchor_y='top',
+                           font_name=console.font_name, font_size=console.font_size, batch=console.content_batch, group=console.content_group)
+        __rows = console.rows.count
+    elif mode == 'scroll':
+        console.scroll(-history // 2)
+        manager.on_draw()
+
+    __chunks = [get_lines(history + frame * lines_per_frame, lines_per_frame) for frame in range(frames)]
+    __times = []
+    gc.collect()
+    for frame in range(frames):
+        __start = time.perf_counter()
+        if mode == 'stream':
+            console.write_lines(__chunks[frame])
+        elif mode == 'scroll':
+            console.on_key_press(pyglet.window.key.PAGEUP, 0)
+        elif mode == 'document':
+            console.scrollback.extend(__chunks[frame])
+            __document.text = '\n'.join(console.scrollback.get_lines(len(console.scrollback) - __rows, len(console.scrollback)))
+        manager.on_draw()
+        gl.glFinish()
+        __times.append((time.perf_counter() - __start) * 1000)
+
+    __buffer = console.scrollback
+    __memory = len(__buffer._data) + __buffer._starts.itemsize * len(__buffer._starts) + __buffer._lengths.itemsize * len(__buffer._lengths)
+    manager.window.close()
+    __times.sort()
+    return {'mode': mode, 'frame_ms': __times[len(__times) // 2], 'p95_ms': __times[int(len(__times) * 0.95)],
+            'lines': len(__buffer), 'memory_mb': __memory / 1024 / 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--history', type=int, default=1000000)
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--lines-per-frame', type=int, default=200)
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    __ingest = bench_ingest(args.history, args.batch)
+    print(f"{'ingest':<9}{'lines/s':>12}")
+    for name, rate in __ingest.items():
+        print(f'{name:<9}{rate:>12,.0f}')
+
+    print(f"{'mode':<9}{'frame ms':>10}{'p95 ms':>10}{'lines':>10}{'MiB':>8}")
+    for mode in args.modes:
+        result = bench_frames(mode, args.history, args.lines_per_frame, args.frames)
+        print(f"{result['mode']:<9}{result['frame_ms']:>10.3f}{result['p95_ms']:>10.3f}{result['lines']:>10}{result['memory_mb']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+'''
+Benchmark of `ComponentConstraintStack` against `ComponentHorizontalStack` and `ComponentVerticalStack` on trees of windows.
+
+Every inner window of a tree lays out its children with its own layout, horizontal and vertical stacks alternate by depth.
+The tree is laid out from the root, every window gives its rectangle to its layout, like a manager does with its layout.
+Three passes are timed for each shape of tree:
+
+    build   the first layout pass, the constraint stacks also create their solvers
+    resize  a layout pass after the root is resized, every layout of the tree is dirty
+    edit    a layout pass after the `min_size` of one leaf changed, only the layouts around it are dirty
+
+The constraint stack keeps its solver between passes: a resize and a new `min_size` are suggested values of edit variables
+and repair the current solution, they do not solve the system again.
+
+Usage:
+    python benchmarks/bench_constraints.py [--repeat 5] [--wide 200] [--deep 8] [--bushy 3x8]
+'''
+import argparse, gc, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from classes.windows.c_window import Window
+from utils.components.layout import ComponentHorizontalStack, ComponentVerticalStack, ComponentConstraintStack
+from utils.types.t_vectors import SVEC2, VEC2
+
+
+class PlainWindow(Window):
+    ''' The runtime `Window` with the abstract methods implemented. '''
+    def get_manager(self) -> 'PlainWindow':
+        return self
+
+    def on_draw(self) -> None: ...
+
+    def on_init(self) -> None: ...
+
+    def run(self) -> None: ...
+
+
+def create_layout(kind:str, depth:int):
+    ''' A stack of the given kind, horizontal at even depths and vertical at odd depths. '''
+    __orientation = 'horizontal' if depth % 2 == 0 else 'vertical'
+    if kind == 'constraint':
+        __layout = ComponentConstraintStack(orientation=__orientation, bevel=VEC2(2,2), margin=VEC2(2,2))
+    elif __orientation == 'horizontal':
+        __layout = ComponentHorizontalStack(bevel=VEC2(2,2), margin=VEC2(2,2))
+    else:
+        __layout = ComponentVerticalStack(bevel=VEC2(2,2), margin=VEC2(2,2))
+    # Nested layouts are placed by their window, not by the manager
+    __layout.parent = __layout
+    return __layout
+
+
+def create_tree(kind:str, depth:int, breadth:int, level:int = 0, counter:list = None) -> PlainWindow:
+    ''' A window with `breadth` children down to `depth` levels. Returns the root, the leaves are the windows without children. '''
+    counter = counter if counter is not None else [0]
+    counter[0] += 1
+    window = PlainWindow(name=f'Window_{counter[0]}', min_size=SVEC2(2 + counter[0] % 5, 2 + counter[0] % 3))
+    if level < depth:
+        window.layout = create_layout(kind, level)
+        for _ in range(breadth):
+            window.layout.add(create_tree(kind, depth, breadth, level + 1, counter))
+    return window
+
+
+def layout_tree(window:PlainWindow) -> None:
+    ''' Lays out the window's children in its rectangle, then the children's children. '''
+    __layout = window._layout
+    if __layout is None:
+        return
+    __layout.position = window.position
+    __layout.size = window.size
+    __layout.do_layout()
+    for child in __layout.children:
+        layout_tree(child)
+
+
+def leaves(window:PlainWindow) -> list:
+    if window._layout is None:
+        return [window]
+    return [leaf for child in window._layout.children for leaf in leaves(child)]
+
+
+def measure(kind:str, depth:int, breadth:int, repeat:int) -> tuple:
+    ''' The best build, resize and edit times of `repeat` trees, in milliseconds. '''
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        root = create_tree(kind, depth, breadth)
+        root.size = SVEC2(200000, 200000)
+        __leaf = leaves(root)[len(leaves(root)) // 2]
+
+        __start = time.perf_counter()
+        layout_tree(root)
+        __build = time.perf_counter()
+        root.size = SVEC2(190000, 190000)
+        layout_tree(root)
+        __resize = time.perf_counter()
+        __leaf.min_size = SVEC2(__leaf.min_size.x + 7, __leaf.min_size.y + 7)
+        layout_tree(root)
+        __edit = time.perf_counter()
+        times.append(((__build - __start) * 1000, (__resize - __build) * 1000, (__edit - __resize) * 1000))
+    return tuple(min(values) for values in zip(*times)), root
+
+
+def compare(roots:list) -> float:
+    ''' The largest difference between the rectangles of the leaves of trees of the same shape. '''
+    __difference = 0.0
+    for windows in zip(*(leaves(root) for root in roots)):
+        for window in windows[1:]:
+            __difference = max(__difference, abs(window.size.x - windows[0].size.x), abs(window.size.y - windows[0].size.y),
+                               abs(window.position.x - windows[0].position.x), abs(window.position.y - windows[0].position.y))
+    return __difference
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--wide', type=int, default=200, help='the number of children of a single layout')
+    parser.add_argument('--deep', type=int, default=8, help='the depth of a binary tree')
+    parser.add_argument('--bushy', default='3x8', help='the depth and breadth of a tree, e.g. 3x8')
+    args = parser.parse_args()
+
+    __depth, __breadth = (int(value) for value in args.bushy.split('x'))
+    shapes = {
+        f'wide 1x{args.wide}': (1, args.wide),
+        f'deep {args.deep}x2': (args.deep, 2),
+        f'bushy {__depth}x{__breadth}': (__depth, __breadth),
+    }
+
+    print(f'{"tree":<14} {"leaves":>7} {"layout":<11} {"build ms":>9} {"resize ms":>10} {"edit ms":>8}')
+    for name, (depth, breadth) in shapes.items():
+        roots = []
+        for kind in ('stack', 'constraint'):
+            (build, resize, edit), root = measure(kind, depth, breadth, args.repeat)
+            roots.append(root)
+            print(f'{name:<14} {breadth ** depth:>7} {kind:<11} {build:>9.2f} {resize:>10.2f} {edit:>8.2f}')
+        print(f'{"":<14} {"":>7} largest difference of the leaves: {compare(roots):.3g}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+'''
+Benchmark of the OpenGL draw calls issued by one frame of `ComponentWindowsManager`.
+
+Compares windows drawing into the shared batch of the manager (one `Group` per layer) 
+with windows that own a private `Batch`, which was the previous behaviour.
+The draw calls are counted with `DrawCallCounter`.
+
+Usage:
+    python benchmarks/bench_draw_calls.py [--panels 10 50 200] [--frames 50]
+'''
+import argparse, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from pyglet.graphics import Batch
+
+from utils.components.window import ComponentWindowsManager
+from utils.metrics.draw_calls import DrawCallCounter
+
+
+def run(panels:int, frames:int, shared:bool) -> dict:
+    manager = ComponentWindowsManager(width=1280, height=720, visible=False)
+    for index in range(panels):
+        if shared:
+            manager.create_window(name=f'Panel_{index}', show_title=True)
+        else:
+            manager.create_window(name=f'Panel_{index}', show_title=True, batch=Batch())
+    manager.on_init()
+
+    manager.draw_call_counter = DrawCallCounter()
+    manager.draw_call_counter.install()
+
+    frame_times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        manager.on_draw()
+        frame_times.append(time.perf_counter() - start)
+
+    manager.draw_call_counter.uninstall()
+    manager.window.close()
+
+    frame_times.sort()
+    return {
+        'panels': panels,
+        'mode': 'shared batch' if shared else 'batch per window',
+        'draw_calls': manager.draw_calls,
+        'frame_ms_median': frame_times[len(frame_times) // 2] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--panels', type=int, nargs='+', default=[10, 50, 200])
+    parser.add_argument('--frames', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'panels':>8}  {'mode':<20}{'draw calls':>12}{'median ms':>12}")
+    for panels in args.panels:
+        for shared in (False, True):
+            result = run(panels, args.frames, shared)
+            print(f"{result['panels']:>8}  {result['mode']:<20}{result['draw_calls']:>12}{result['frame_ms_median']:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+'''
+Benchmark of a `ComponentFileManagerWindow` opening a directory of `--files` files, created in a temporary directory.
+
+Frames are drawn in an invisible pyglet window, `glFinish` included, one every `--frame-ms` milliseconds, from the call to `open()`:
+
+    idle      a baseline of `--idle-frames` frames before `open()`, nothing changing: the cost of drawing the windows alone
+    first     the frames and the time until the first entries are shown, and the time of the frame that showed them
+    complete  the frames and the time until the whole sorted listing is shown, and the frame times meanwhile
+    cached    `open()` of the directory again, its listing cached and watched: a single frame
+    changed   a file is created in the directory: the time until it is shown, with the inotify events read every frame
+    sync      a baseline without the scanner: `os.scandir`, `stat` and the sort on the main thread, the frame it blocks
+
+`over` is the number of frames longer than `--frame-ms`: the listing is received without blocking the frames if the frames
+of `first` and `complete` take about as long as the `idle` ones. With a software OpenGL driver the idle frames alone may exceed the budget.
+
+Usage:
+    python benchmarks/bench_files.py [--files 200000] [--frame-ms 16.7] [--idle-frames 30] [--directory DIRECTORY]
+'''
+import argparse, gc, os, shutil, stat, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from pyglet import clock, gl
+from utils.components.window import ComponentWindowsManager
+from utils.components.files import ComponentFileManagerWindow
+
+
+def create_tree(directory:str, files:int) -> None:
+    ''' Files of 0 to 4095 bytes, and a directory for every 1000 files. '''
+    for index in range(files):
+        if index % 1000 == 0:
+            os.mkdir(os.path.join(directory, f'dir_{index // 1000:04d}'))
+        with open(os.path.join(directory, f'file_{index:07d}.log'), 'wb') as file:
+            file.write(b'x' * (index % 4096))
+
+
+def shown(window:ComponentFileManagerWindow) -> int:
+    ''' The number of entries shown by the rows. '''
+    return sum(1 for item, height in zip(window.rows._items, window.rows._heights) if item is not None and height is not None and item >= window.HEADER_ROWS)
+
+
+def draw(manager:ComponentWindowsManager, times:list) -> None:
+    ''' Draws a frame after the scheduled functions, like `run()`. '''
+    __start = time.perf_counter()
+    clock.tick()
+    manager.on_draw()
+    gl.glFinish()
+    times.append((time.perf_counter() - __start) * 1000)
+
+
+def wait_frame(start:float, frames:int, frame_ms:float) -> None:
+    ''' Waits for the next frame, `frame_ms` after the previous one. '''
+    __delay = start + frames * frame_ms / 1000 - time.perf_counter()
+    if __delay > 0:
+        time.sleep(__delay)
+
+
+def summarize(case:str, frames:int, start:float, entries:int, times:list, frame_ms:float) -> dict:
+    ''' The result of a case: its frames and time, and the median, 95th percentile and longest of the frame `times`. '''
+    __sorted = sorted(times)
+    return {'case': case, 'frames': frames, 'ms': (time.perf_counter() - start) * 1000, 'entries': entries, 'frame_ms': __sorted[len(__sorted) // 2],
+            'p95_ms': __sorted[int(len(__sorted) * 0.95)], 'max_ms': __sorted[-1], 'over': sum(1 for value in times if value > frame_ms)}
+
+
+def bench_window(directory:str, frame_ms:float, idle_frames:int) -> list:
+    pyglet.window.Window._enable_event_queue = True
+    manager = ComponentWindowsManager(width=1280, height=720, visible=False)
+    # The events of the pyglet window are dispatched at once, like in `run()`
+    pyglet.window.Window._enable_event_queue = False
+    # The directory is not prefetched from its parent during the idle frames
+    window = manager.create_window(name='File Manager', show_title=True, window_class=ComponentFileManagerWindow, path=os.path.dirname(directory), prefetch=0)
+    manager.on_init()
+    manager.on_resize(1280, 720)
+    manager.on_draw()
+    gc.collect()
+
+    __results, __times = [], []
+    __start = time.perf_counter()
+    for frame in range(idle_frames):
+        wait_frame(__start, frame + 1, frame_ms)
+        draw(manager, __times)
+    # The first frames compile the shaders and fill the caches of the driver
+    __results.append(summarize('idle', idle_frames, __start, len(window.entries), __times[idle_frames // 3:] or __times, frame_ms))
+
+    __times = []
+    __start, __frames = time.perf_counter(), 0
+    window.open(directory)
+    while not shown(window):
+        __frames += 1
+        wait_frame(__start, __frames, frame_ms)
+        draw(manager, __times)
+    __first = summarize('first', __frames, __start, len(window.entries), __times, frame_ms)
+    # The time of the frame that showed the first entries
+    __first['frame_ms'] = __times[-1]
+    __results.append(__first)
+    while window._loading:
+        __frames += 1
+        wait_frame(__start, __frames, frame_ms)
+        draw(manager, __times)
+    __results.append(summarize('complete', __frames, __start, len(window.entries), __times, frame_ms))
+
+    window.open(os.path.dirname(directory))
+    manager.on_draw()
+    __times, __start = [], time.perf_counter()
+    window.open(directory)
+    draw(manager, __times)
+    __results.append(summarize('cached', 1, __start, len(window.entries), __times, frame_ms))
+
+    __times, __frames, __count = [], 0, len(window.entries)
+    __start = time.perf_counter()
+    open(os.path.join(directory, '0_changed.log'), 'wb').close()
+    while len(window.entries) == __count or window._loading:
+        __frames += 1
+        wait_frame(__start, __frames, frame_ms)
+        draw(manager, __times)
+        if time.perf_counter() - __start > 60:
+            break
+    __results.append(summarize('changed', __frames, __start, len(window.entries), __times, frame_ms))
+    manager.window.close()
+    return __results
+
+
+def bench_sync(directory:str) -> dict:
+    gc.collect()
+    __start = time.perf_counter()
+    __entries = []
+    with os.scandir(directory) as iterator:
+        for entry in iterator:
+            __stat = entry.stat(follow_symlinks=False)
+            __entries.append((not stat.S_ISDIR(__stat.st_mode), entry.name.casefold(), entry.name, __stat.st_size))
+    __entries.sort()
+    __ms = (time.perf_counter() - __start) * 1000
+    return {'case': 'sync', 'frames': 1, 'ms': __ms, 'entries': len(__entries), 'frame_ms': __ms, 'p95_ms': __ms, 'max_ms': __ms, 'over': 1}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=200000)
+    parser.add_argument('--frame-ms', type=float, default=1000 / 60)
+    parser.add_argument('--idle-frames', type=int, default=30)
+    parser.add_argument('--directory', default=None, help='a directory to list instead of creating one')
+    args = parser.parse_args()
+
+    __temporary = None
+    if args.directory is None:
+        __temporary = tempfile.mkdtemp(prefix='bench_files_')
+        args.directory = os.path.join(__temporary, 'tree')
+        os.mkdir(args.directory)
+        create_tree(args.directory, args.files)
+    try:
+        __results = bench_window(args.directory, args.frame_ms, args.idle_frames) + [bench_sync(args.directory)]
+    finally:
+        if __temporary is not None:
+            shutil.rmtree(__temporary, ignore_errors=True)
+
+    print(f"frame budget: {args.frame_ms:.1f} ms")
+    print(f"{'case':<10}{'frames':>8}{'ms':>10}{'entries':>10}{'frame ms':>10}{'p95 ms':>10}{'max ms':>10}{'over':>6}")
+    for result in __results:
+        print(f"{result['case']:<10}{result['frames']:>8}{result['ms']:>10.1f}{result['entries']:>10}"
+              f"{result['frame_ms']:>10.3f}{result['p95_ms']:>10.3f}{result['max_ms']:>10.3f}{result['over']:>6}")
+    __idle, __first = __results[0], __results[1]
+    print(f"first entries shown by frame {__first['frames']}, in {__first['frame_ms']:.1f} ms: "
+          f"{__first['frame_ms'] - args.frame_ms:+.1f} ms over the budget, {__first['frame_ms'] - __idle['frame_ms']:+.1f} ms over an idle frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+'''
+Benchmark of the hit testing and routing of mouse events by the `ComponentInputDispatcher` of a `ComponentWindowsManager`.
+
+For every count of `--panels`, the manager holds the panels spread over the regions of a border layout, each with `--widgets` child windows.
+`--events` random mouse motion events are then hit tested, the best of `--repeat` runs is kept:
+
+    linear         a scan of all windows from the top down, what a dispatcher without an index would do
+    grid           `ComponentSpatialGrid.hit()`, the test of the dispatcher
+    routed         the events dispatched by the pyglet window: hit test, hover changes and the handlers of the windows
+    routed linear  the same routing with the linear scan instead of the grid
+
+`routed` includes the cost of the pyglet event dispatch and of the handlers, it compares with `routed linear`, not with `linear`.
+The crossover is the number of windows from which the grid is faster than the linear scan for all the larger counts.
+Both hit tests are checked to find the same windows. The update of the grid after a layout pass is timed as well, for the last count:
+after a resize, when nothing moved and when a panel grew.
+
+Usage:
+    python benchmarks/bench_input.py [--panels 1 2 5 10 20 100] [--widgets 4] [--events 100000] [--cell-size 128] [--repeat 3]
+'''
+import argparse, gc, os, random, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from utils.components.window import ComponentWindow, ComponentWindowsManager, ComponentWindowModel
+from utils.components.workspace import ComponentWorkspace, WorkspaceState, LayoutState
+from utils.components.input import ComponentInputDispatcher
+from utils.metrics.headless import HeadlessWindow
+from utils.types.t_vectors import SVEC2
+
+ANCHORS = ('north', 'south', 'west', 'east', 'center')
+
+
+class Widget(ComponentWindow):
+    ''' A window that counts the motion events it receives. '''
+    def on_mouse_motion(self, x:int, y:int, dx:int, dy:int) -> None:
+        self.__dict__['motions'] = self.__dict__.get('motions', 0) + 1
+
+
+def create_manager(panels:int, widgets:int, cell_size:float) -> ComponentWindowsManager:
+    __windows, __parents = [], {}
+    for index in range(panels):
+        __windows.append(ComponentWindowModel(name=f'Panel_{index}', anchor=ANCHORS[index % len(ANCHORS)], min_size=SVEC2(10, 10)))
+        for widget in range(widgets):
+            __windows.append(ComponentWindowModel(name=f'Widget_{index}_{widget}', min_size=SVEC2(2, 2), bevel=(1, 1)))
+            __parents[f'Widget_{index}_{widget}'] = f'Panel_{index}'
+    state = WorkspaceState(layout=LayoutState(type='border'), windows=__windows, parents=__parents)
+
+    manager = ComponentWindowsManager(window=HeadlessWindow(1920, 1080))
+    manager.input_dispatcher = ComponentInputDispatcher(manager, cell_size)
+    ComponentWorkspace(manager, window_classes={model.name: Widget for model in __windows}).restore(state)
+    manager.on_init()
+    manager.window.set_size(1920, 1080)
+    manager.window.draw()
+    return manager
+
+
+def hit_linear(windows:list, x:float, y:float):
+    for window in reversed(windows):
+        if (window.position.x <= x < window.position.x + window.size.x and window.position.y <= y < window.position.y + window.size.y
+                and ComponentInputDispatcher.is_shown(window)):
+            return window
+    return None
+
+
+def timed(function, *args, repeat:int = 1) -> float:
+    ''' The best time of `repeat` calls in milliseconds. '''
+    __best = None
+    for _ in range(repeat):
+        gc.collect()
+        __start = time.perf_counter()
+        function(*args)
+        __time = (time.perf_counter() - __start) * 1000
+        __best = __time if __best is None else min(__best, __time)
+    return __best
+
+
+def measure(panels:int, widgets:int, events:int, cell_size:float, seed:int, repeat:int) -> tuple:
+    ''' The best times of the hit tests and of the routing per event in microseconds, and the manager. '''
+    manager = create_manager(panels, widgets, cell_size)
+    dispatcher = manager.input_dispatcher
+    windows = dispatcher.get_windows()
+    __random = random.Random(seed)
+    points = [(__random.randrange(1920), __random.randrange(1080)) for _ in range(events)]
+
+    __linear = [hit_linear(windows, x, y) for x, y in points[:2000]]
+    __grid = [dispatcher.hit(x, y) for x, y in points[:2000]]
+    assert __linear == __grid, 'the grid and the linear scan found different windows'
+
+    __times = {
+        'linear': timed(lambda: [hit_linear(windows, x, y) for x, y in points], repeat=repeat),
+        'grid': timed(lambda: [dispatcher.hit(x, y) for x, y in points], repeat=repeat),
+        'routed': timed(lambda: [manager.window.dispatch_event('on_mouse_motion', x, y, 1, 1) for x, y in points], repeat=repeat),
+    }
+    # The hit test of the dispatcher is replaced by the linear scan
+    dispatcher.hit = lambda x, y: hit_linear(windows, x, y)
+    __times['routed linear'] = timed(lambda: [manager.window.dispatch_event('on_mouse_motion', x, y, 1, 1) for x, y in points], repeat=repeat)
+    del dispatcher.hit
+    return {name: total * 1000 / events for name, total in __times.items()}, manager
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--panels', type=int, nargs='+', default=[1, 2, 5, 10, 20, 100])
+    parser.add_argument('--widgets', type=int, default=4)
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--cell-size', type=float, default=128)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'windows':>8}{'cells':>7}{'per cell':>10}{'linear us':>11}{'grid us':>9}{'routed us':>11}{'routed linear us':>18}")
+    __crossover = None
+    for panels in args.panels:
+        __times, manager = measure(panels, args.widgets, args.events, args.cell_size, args.seed, args.repeat)
+        __count = len(manager.input_dispatcher.get_windows())
+        __cells = manager.input_dispatcher.grid._cells
+        print(f"{__count:>8}{len(__cells):>7}{sum(map(len, __cells.values())) / max(len(__cells), 1):>10.1f}{__times['linear']:>11.2f}"
+              f"{__times['grid']:>9.2f}{__times['routed']:>11.2f}{__times['routed linear']:>18.2f}")
+        if __times['grid'] >= __times['linear']:
+            __crossover = None
+        elif __crossover is None:
+            __crossover = __count
+    print(f'crossover: the grid is faster than the linear scan from {__crossover} windows' if __crossover is not None
+          else 'crossover: the linear scan is faster for the largest count')
+
+    # The grid is updated by the first hit test after a layout pass
+    dispatcher = manager.input_dispatcher
+    manager.window.set_size(1800, 1000)
+    manager.window.draw()
+    __resized = timed(dispatcher.update)
+    __unchanged = timed(dispatcher.update)
+    __panel = manager.get('Panel_0')
+    __panel.min_size = SVEC2(__panel.min_size.x + 40, __panel.min_size.y + 40)
+    manager.window.draw()
+    __moves = dispatcher.update()
+    __panel.min_size = SVEC2(__panel.min_size.x - 40, __panel.min_size.y - 40)
+    manager.window.draw()
+    __relayout = timed(dispatcher.update)
+    print(f'{__count} windows: grid update after a resize {__resized:.2f} ms, unchanged {__unchanged:.2f} ms, '
+          f'after a panel grew {__relayout:.2f} ms ({__moves} windows moved)')
+
+if __name__ == '__main__':
+    main()
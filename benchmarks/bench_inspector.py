@@ -0,0 +1,139 @@
+'''
+Benchmark of a `ComponentInspectorWindow` showing an object graph of `--fields` fields, every node expanded.
+
+The graph is a pydantic model with a list of items, each a pydantic model with `VEC2`, `SVEC2` and `RGB` fields and a list of tags.
+Frames are drawn in an invisible pyglet window, `glFinish` included, for every size of `--fields`:
+
+    idle     no value changes
+    mutate   `--changes` fields of random items change every frame, the visible ones among them
+    scroll   the inspector scrolls down by a page every frame
+    reread   a baseline without the change check: every field is read and formatted again every frame
+
+`check ms` is the time of `update_values()` alone, the change check of the visible rows. The frame time should not depend on the fields.
+
+Usage:
+    python benchmarks/bench_inspector.py [--fields 5000 50000] [--changes 200] [--frames 120]
+'''
+import argparse, gc, os, random, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from pyglet import gl
+from pydantic import BaseModel, ConfigDict
+from utils.components.window import ComponentWindowsManager
+from utils.components.inspector import ComponentInspectorWindow, InspectorNode
+from utils.types.t_vectors import SVEC2, VEC2
+from utils.types.t_colors import RGB
+
+MODES = ('idle', 'mutate', 'scroll', 'reread')
+
+
+class Item(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    name:str
+    position:VEC2
+    size:SVEC2
+    color:RGB
+    visible:bool = True
+    depth:float = 0.0
+    tags:list = []
+
+
+class Scene(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    name:str
+    items:list
+
+
+# The fields of an item and of its values: 7 fields, 2 + 2 components, 3 channels and 3 tags
+ITEM_FIELDS = 17
+
+
+def create_scene(fields:int) -> Scene:
+    return Scene(name='scene', items=[Item(name=f'item_{index}', position=VEC2(index, -index), size=SVEC2(64, 32), color=RGB(index % 256, 128, 64),
+                                           depth=index / 10, tags=['static', 'mesh', f'layer_{index % 8}']) for index in range(fields // ITEM_FIELDS)])
+
+
+def mutate(scene:Scene, changes:int, frame:int) -> None:
+    for index in random.sample(range(len(scene.items)), min(changes, len(scene.items))):
+        __item = scene.items[index]
+        __field = (index + frame) % 4
+        if __field == 0:
+            __item.position.x += 1
+        elif __field == 1:
+            __item.depth = frame / 10
+        elif __field == 2:
+            __item.color.r = (__item.color.r + 1) % 256
+        else:
+            __item.visible = not __item.visible
+
+
+def bench(mode:str, fields:int, changes:int, frames:int) -> dict:
+    pyglet.window.Window._enable_event_queue = True
+    manager = ComponentWindowsManager(width=1280, height=720, visible=False)
+    # The events of the pyglet window are dispatched at once, like in `run()`
+    pyglet.window.Window._enable_event_queue = False
+    scene = create_scene(fields)
+    inspector = manager.create_window(name='Inspector', show_title=True, window_class=ComponentInspectorWindow, target=scene)
+    manager.on_init()
+    manager.on_resize(1280, 720)
+    manager.on_draw()
+
+    __start = time.perf_counter()
+    index = 0
+    while index < inspector.get_item_count():
+        inspector.expand(index)
+        index += 1
+    __expand = (time.perf_counter() - __start) * 1000
+    manager.on_draw()
+
+    __times, __checks = [], []
+    random.seed(0)
+    gc.collect()
+    for frame in range(frames):
+        __start = time.perf_counter()
+        if mode == 'mutate':
+            mutate(scene, changes, frame)
+        elif mode == 'scroll':
+            inspector.on_key_press(pyglet.window.key.PAGEDOWN, 0)
+        elif mode == 'reread':
+            for node in inspector._visible:
+                InspectorNode.format_value(node.read(inspector._frame + 1))
+        __check = time.perf_counter()
+        inspector.update_values()
+        __checks.append((time.perf_counter() - __check) * 1000)
+        manager.on_draw()
+        gl.glFinish()
+        __times.append((time.perf_counter() - __start) * 1000)
+
+    __rows = inspector.get_item_count()
+    manager.window.close()
+    __times.sort()
+    __checks.sort()
+    return {'mode': mode, 'fields': __rows - 1, 'expand_ms': __expand, 'frame_ms': __times[len(__times) // 2],
+            'p95_ms': __times[int(len(__times) * 0.95)], 'check_ms': __checks[len(__checks) // 2]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fields', type=int, nargs='+', default=[5000, 50000])
+    parser.add_argument('--changes', type=int, default=200)
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'fields':>8}{'expand ms':>11}{'frame ms':>10}{'p95 ms':>10}{'check ms':>10}")
+    for fields in args.fields:
+        for mode in args.modes:
+            result = bench(mode, fields, args.changes, args.frames)
+            print(f"{result['mode']:<8}{result['fields']:>8}{result['expand_ms']:>11.1f}{result['frame_ms']:>10.3f}{result['p95_ms']:>10.3f}{result['check_ms']:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+'''
+Benchmark of window construction and of the attribute assignments of the layout hot path.
+
+Windows and layouts are plain objects whose keyword arguments are validated once by a pydantic model.
+Before, they were pydantic models themselves: every `child.size = ...` of a layout pass went through
+`BaseModel.__setattr__`, and every read of a private flag through `BaseModel.__getattr__`.
+The former classes are copied below, with the same fields and invalidation logic, for comparison.
+
+Usage:
+    python benchmarks/bench_models.py [--windows 2000] [--assignments 100000] [--children 100]
+'''
+import argparse, gc, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from pydantic import BaseModel, PrivateAttr
+from classes.windows.c_window import Window
+from classes.windows.c_layout import Layout
+from utils.components.layout import ComponentVerticalStack
+from utils.types.t_vectors import SVEC2, VEC2
+
+
+class LegacyLayout(BaseModel):
+    ''' The fields of the former pydantic `Layout`, copied for every window like the default layout of the former `Window`. '''
+    children:list = []
+    parent:'LegacyLayout' = None
+    position:VEC2 = VEC2(0,0)
+    size:SVEC2 = SVEC2(0,0)
+    max_size:SVEC2 = SVEC2(0,0)
+    min_size:SVEC2 = SVEC2(0,0)
+
+    _dirty:bool = PrivateAttr(default=True)
+    _dirty_subtree:bool = PrivateAttr(default=True)
+    _in_layout:bool = PrivateAttr(default=False)
+
+
+class LegacyWindow(BaseModel):
+    ''' The former pydantic `Window`, with the fields and the `__setattr__` of the runtime window. '''
+    name:str = 'Window'
+    parent:'LegacyWindow' = None
+    children:dict = {}
+    size:SVEC2 = SVEC2(200,200)
+    position:VEC2 = VEC2(0,0)
+    anchor:str = 'north'
+    fixed:bool = True
+    layout:LegacyLayout = LegacyLayout()
+    min_size:SVEC2 = SVEC2(50,50)
+    max_size:SVEC2 = SVEC2(0,0)
+    bevel:VEC2 = VEC2(15,15)
+
+    _dirty:bool = PrivateAttr(default=True)
+    _container:Layout = PrivateAttr(default=None)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        if self.parent is None:
+            self.parent = self
+
+    def __setattr__(self, name:str, value) -> None:
+        if name in ('size', 'position'):
+            if getattr(self, name) != value:
+                super().__setattr__(name, value)
+                self._dirty = True
+        elif name in ('min_size', 'max_size'):
+            if getattr(self, name) != value:
+                super().__setattr__(name, value)
+                if self._container is not None:
+                    self._container.invalidate()
+        else:
+            super().__setattr__(name, value)
+
+    @property
+    def container(self) -> Layout:
+        return self._container
+
+    @container.setter
+    def container(self, layout:Layout) -> None:
+        self._container = layout
+
+    def get_manager(self) -> 'LegacyWindow':
+        return self
+
+
+class PlainWindow(Window):
+    ''' The runtime `Window` with the abstract methods implemented. '''
+    def get_manager(self) -> 'PlainWindow':
+        return self
+
+    def on_draw(self) -> None: ...
+
+    def on_init(self) -> None: ...
+
+    def run(self) -> None: ...
+
+
+def measure(function, count:int, repeat:int = 5) -> float:
+    ''' The mean time of a call of `function` in microseconds, the best of `repeat` runs. '''
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for index in range(count):
+            function(index)
+        times.append((time.perf_counter() - start) / count * 1e6)
+    return min(times)
+
+
+def layout_pass(window_class:type, children:int, passes:int) -> float:
+    ''' The mean time of a full layout pass of a vertical stack, in microseconds. '''
+    stack = ComponentVerticalStack()
+    stack.parent = stack
+    for index in range(children):
+        stack.add(window_class(name=f'Panel_{index}'))
+
+    def relayout(index:int) -> None:
+        stack.size = SVEC2(1280, 720 + index % 2)
+        stack.do_layout()
+    return measure(relayout, passes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--windows', type=int, default=2000)
+    parser.add_argument('--assignments', type=int, default=100000)
+    parser.add_argument('--children', type=int, default=100)
+    parser.add_argument('--passes', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f'{"":<28} {"pydantic us":>12} {"plain us":>10} {"speedup":>8}')
+    rows = []
+
+    rows.append(('construct window',
+                 measure(lambda index: LegacyWindow(name='Panel', size=SVEC2(100, 100)), args.windows),
+                 measure(lambda index: PlainWindow(name='Panel', size=SVEC2(100, 100)), args.windows)))
+
+    legacy, plain = LegacyWindow(name='Panel'), PlainWindow(name='Panel')
+    rows.append(('assign size',
+                 measure(lambda index: setattr(legacy, 'size', SVEC2(index, 100)), args.assignments),
+                 measure(lambda index: setattr(plain, 'size', SVEC2(index, 100)), args.assignments)))
+    rows.append(('assign position',
+                 measure(lambda index: setattr(legacy, 'position', VEC2(index, 100)), args.assignments),
+                 measure(lambda index: setattr(plain, 'position', VEC2(index, 100)), args.assignments)))
+    rows.append(('read size',
+                 measure(lambda index: legacy.size, args.assignments),
+                 measure(lambda index: plain.size, args.assignments)))
+    rows.append((f'layout pass, {args.children} children',
+                 layout_pass(LegacyWindow, args.children, args.passes),
+                 layout_pass(PlainWindow, args.children, args.passes)))
+
+    for name, before, after in rows:
+        print(f'{name:<28} {before:>12.2f} {after:>10.2f} {before / after:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
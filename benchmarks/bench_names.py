@@ -0,0 +1,93 @@
+'''
+Benchmark of adding windows to a manager and looking them up by name and by path.
+
+The manager keeps a name index of all its windows and the next free suffix of every base name,
+so adding a window with a taken name and resolving a name are constant time.
+The legacy algorithm, which probed the suffixes one by one and rebuilt the children dict on every insertion,
+is run on the same names for comparison.
+
+Usage:
+    python benchmarks/bench_names.py [--windows 10000] [--names 100] [--lookups 100000]
+'''
+import argparse, os, random, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from utils.components.window import ComponentWindowsManager, ComponentWindow
+
+
+def legacy_add(children:dict, name:str) -> dict:
+    ''' The former `Window.set_nonexistant_name()` and `Window.add()`, on plain names. '''
+    def set_nonexistant_name(name:str, index:int = 1) -> str:
+        if name in children:
+            _name = name.split('_')
+            if _name[-1].isdigit():
+                index = int(_name[-1]) + 1
+                _name = ''.join(_name[:-1]) + f'_{index}'
+            else:
+                _name = name + f'_{index}'
+            return set_nonexistant_name(_name, index)
+        return name
+
+    name = set_nonexistant_name(name)
+    return children | {name: {'window': None, 'name': name}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--windows', type=int, default=10000)
+    parser.add_argument('--names', type=int, default=100, help='the number of distinct base names')
+    parser.add_argument('--lookups', type=int, default=100000)
+    args = parser.parse_args()
+
+    names = [f'Panel{index % args.names}' for index in range(args.windows)]
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), args.windows // args.names + 100))
+
+    start = time.perf_counter()
+    children = {}
+    for name in names:
+        children = legacy_add(children, name)
+    legacy_time = time.perf_counter() - start
+
+    manager = ComponentWindowsManager(width=1280, height=720, visible=False)
+    windows = [ComponentWindow(name=name) for name in names]
+    start = time.perf_counter()
+    for window in windows:
+        manager.add(window)
+    add_time = time.perf_counter() - start
+
+    # Every tenth window gets a child, looked up by path
+    parents = windows[::10]
+    for parent in parents:
+        parent.add(ComponentWindow(name='Toolbar'))
+
+    lookups = [random.choice(windows).name for _ in range(args.lookups)]
+    start = time.perf_counter()
+    for name in lookups:
+        manager.get(name)
+    name_time = time.perf_counter() - start
+
+    paths = [f'{parent.name}/{next(iter(parent.children))}' for parent in random.choices(parents, k=args.lookups)]
+    start = time.perf_counter()
+    for path in paths:
+        manager.get(path)
+    path_time = time.perf_counter() - start
+    manager.window.close()
+
+    assert len(manager.children) == len(set(children)) == args.windows
+    print(f'windows: {args.windows}, base names: {args.names}')
+    print(f'{"":<24} {"total ms":>10} {"per op us":>10}')
+    print(f'{"legacy add":<24} {legacy_time * 1000:>10.1f} {legacy_time / args.windows * 1e6:>10.2f}')
+    print(f'{"add":<24} {add_time * 1000:>10.1f} {add_time / args.windows * 1e6:>10.2f}')
+    print(f'{"get by name":<24} {name_time * 1000:>10.1f} {name_time / args.lookups * 1e6:>10.2f}')
+    print(f'{"get by path":<24} {path_time * 1000:>10.1f} {path_time / args.lookups * 1e6:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+'''
+Benchmark of the overhead of `Profiler` on the frames of a `ComponentWindowsManager`.
+
+Every frame resizes the manager, so the layout runs and every window is redrawn, then draws the windows.
+The frames are timed without a profiler, with a profiler that is set on the manager but disabled, and with the profiler enabled.
+A disabled profiler restores the original methods, only the manager tests it once per frame.
+
+Usage:
+    python benchmarks/bench_profiler.py [--windows 100] [--frames 200] [--trace trace.json]
+'''
+import argparse, gc, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from utils.components.window import ComponentWindowsManager
+from utils.components.layout import ComponentBorderStack
+from utils.metrics.profiler import Profiler
+
+ANCHORS = ('north', 'south', 'west', 'east', 'center')
+
+
+def create_manager(windows:int) -> ComponentWindowsManager:
+    manager = ComponentWindowsManager(width=1280, height=720, visible=False)
+    manager.layout = ComponentBorderStack()
+    for index in range(windows):
+        manager.create_window(name=f'Panel_{index}', anchor=ANCHORS[index % len(ANCHORS)], show_title=index % 2 == 0)
+    manager.layout.on_init()
+    manager.on_init()
+    manager.clock = pyglet.clock.get_default()
+    # Like `run()`, the events are dispatched at once, not queued
+    pyglet.window.Window._enable_event_queue = False
+    return manager
+
+
+def run(manager:ComponentWindowsManager, frames:int) -> list:
+    ''' The times of `frames` frames in milliseconds, sorted. '''
+    times = []
+    gc.collect()
+    for frame in range(frames):
+        start = time.perf_counter()
+        manager.on_resize(1280 + frame % 2, 720)
+        manager._redraw(1 / 60)
+        times.append((time.perf_counter() - start) * 1000)
+    return sorted(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--windows', type=int, default=100)
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--trace', default='', help='saves the spans of the enabled profiler to this file as a Chrome trace')
+    args = parser.parse_args()
+
+    manager = create_manager(args.windows)
+    profiler = Profiler()
+    rows = [('no profiler', run(manager, args.frames))]
+    manager.profiler = profiler
+    rows.append(('disabled', run(manager, args.frames)))
+    profiler.install()
+    rows.append(('enabled', run(manager, args.frames)))
+    profiler.uninstall()
+    manager.window.close()
+
+    print(f'windows: {args.windows}, frames: {args.frames}')
+    print(f'{"profiler":<14} {"median ms":>10} {"p95 ms":>10}')
+    for name, times in rows:
+        print(f'{name:<14} {times[len(times) // 2]:>10.3f} {times[int(len(times) * 0.95)]:>10.3f}')
+
+    print(f'spans: {len(profiler.spans)}, frames: {len(profiler.frames)}')
+    __summary = sorted(profiler.get_summary().items(), key=lambda item: -item[1][1])
+    print(f'{"category":<14} {"name":<26} {"calls":>7} {"total ms":>10} {"max ms":>8}')
+    for (category, name), (calls, total, longest) in __summary[:8]:
+        print(f'{category:<14} {name:<26} {calls:>7} {total:>10.2f} {longest:>8.3f}')
+
+    if args.trace != '':
+        profiler.save(args.trace)
+        print(f'trace saved to {args.trace}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+'''
+Benchmark of `ComponentWindow.on_redraw` under a simulated resize storm.
+
+Compares the retained-mode redraw (shapes are created once in `on_init` and mutated afterwards) 
+with the previous immediate-mode redraw that built a new `Rectangle`, `Label` and `Sprite` on every resize.
+For every mode it reports the time of one frame (redraw of all panels + `batch.draw()`), 
+the number of memory blocks allocated during the storm and the number of vertex lists left in the batches.
+
+Usage:
+    python benchmarks/bench_redraw.py [--panels 50] [--frames 200]
+'''
+import argparse, gc, os, sys, time, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from pyglet.shapes import Rectangle
+from pyglet.text import Label
+from pyglet.sprite import Sprite
+
+from utils.components.window import ComponentWindow
+from utils.types.t_vectors import SVEC2, VEC2
+from const import STYLES
+
+
+class ImmediateComponentWindow(ComponentWindow):
+    '''
+    Reproduces the old immediate-mode `on_redraw`, which created new shapes on every call.
+    '''
+    def on_redraw(self) -> None:
+        self.background = Rectangle(self.position.x, 
+                                    self.position.y, 
+                                    self.size.width, 
+                                    self.size.height, 
+                                    color=self.background_color.__repr__(), 
+                                    batch=self.batch)
+        if self.show_title:
+            self.title_background = Rectangle(self.position.x, 
+                        self.position.y + self.size.height - self.title_height, 
+                        self.size.width, self.title_height, 
+                        color=self.title_background_color.__repr__(), 
+                        batch=self.batch)
+                
+            self.title_label = Label(self.get_title_text(), 
+                    font_name=STYLES.FONT.value, 
+                    color=self.title_color.__repr__(), 
+                    font_size=STYLES.FONT_SIZE.value, 
+                    x=self.position.x + 10 + self.title_icon.width, 
+                    y=self.position.y + self.size.height - self.title_height + (self.title_height - STYLES.FONT_SIZE.value + 3) / 2,
+                    batch=self.batch)
+                
+            self.title_label_icon = Sprite(img=self.title_icon, 
+                    x=self.position.x + 3, 
+                    y=self.position.y + self.size.height - self.title_height + (self.title_height - self.title_icon.width) / 2, 
+                    batch=self.batch)
+
+
+def count_vertex_lists(batch) -> int:
+    count = 0
+    for domains in batch.group_map.values():
+        for domain in domains.values():
+            count += len(domain.allocator.get_allocated_regions()[0])
+    return count
+
+
+def run(window_class, panels:int, frames:int) -> dict:
+    windows = []
+    for index in range(panels):
+        window = window_class(name=f'Panel_{index}', show_title=True)
+        window.size = SVEC2(200, 150)
+        window.position = VEC2(0, 0)
+        window.on_init()
+        windows.append(window)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    frame_times = []
+
+    for frame in range(frames):
+        start = time.perf_counter()
+        for index, window in enumerate(windows):
+            window.size = SVEC2(200 + frame % 100, 150 + frame % 50)
+            window.position = VEC2(index * 10, frame % 30)
+            window.on_resize(window.size.width, window.size.height)
+        for window in windows:
+            window.on_draw()
+        frame_times.append(time.perf_counter() - start)
+
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    frame_times.sort()
+    return {
+        'mode': window_class.__name__,
+        'frame_ms_median': frame_times[len(frame_times) // 2] * 1000,
+        'frame_ms_p95': frame_times[int(len(frame_times) * 0.95)] * 1000,
+        'allocated_blocks': blocks,
+        'vertex_lists': sum(count_vertex_lists(window.batch) for window in windows),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--panels', type=int, default=50)
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'mode':<28}{'median ms':>12}{'p95 ms':>12}{'alloc blocks':>16}{'vertex lists':>16}")
+    for window_class in (ImmediateComponentWindow, ComponentWindow):
+        result = run(window_class, args.panels, args.frames)
+        print(f"{result['mode']:<28}{result['frame_ms_median']:>12.3f}{result['frame_ms_p95']:>12.3f}"
+              f"{result['allocated_blocks']:>16}{result['vertex_lists']:>16}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+'''
+Benchmark of resize handling in `ComponentWindowsManager` during an interactive drag.
+
+The OS sends several resize events per frame while the window is dragged. 
+The manager keeps only the latest size and runs the layout once per frame, 
+so the number of layout passes follows the number of frames, not the number of events.
+
+Usage:
+    python benchmarks/bench_resize.py [--panels 100] [--frames 120] [--events-per-frame 8]
+'''
+import argparse, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from utils.components.window import ComponentWindowsManager
+from utils.components.layout import ComponentBorderStack
+
+ANCHORS = ('north', 'south', 'east', 'west', 'center')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--panels', type=int, default=100)
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--events-per-frame', type=int, default=8)
+    args = parser.parse_args()
+
+    manager = ComponentWindowsManager(width=1280, height=720, visible=False)
+    manager.layout = ComponentBorderStack()
+    for index in range(args.panels):
+        manager.create_window(name=f'Panel_{index}', anchor=ANCHORS[index % len(ANCHORS)], show_title=True)
+    manager.layout.on_init()
+    manager.on_init()
+
+    resize_events, layout_passes = manager.resize_events, manager.layout_passes
+    frame_times = []
+    for frame in range(args.frames):
+        start = time.perf_counter()
+        for event in range(args.events_per_frame):
+            manager.on_resize(1280 + frame * 4 + event, 720 + frame * 2 + event)
+        manager.on_draw()
+        frame_times.append(time.perf_counter() - start)
+    manager.window.close()
+
+    frame_times.sort()
+    print(f'resize events: {manager.resize_events - resize_events}')
+    print(f'layout passes: {manager.layout_passes - layout_passes}')
+    print(f'frame median:  {frame_times[len(frame_times) // 2] * 1000:.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+'''
+Benchmark of world matrix computation for a `ComponentScene` hierarchy.
+
+Compares a per-node Python traversal that multiplies `MAT4` objects with the batched update of `ComponentScene`,
+for a full update of all nodes and for incremental updates after moving one node.
+
+Usage:
+    python benchmarks/bench_scene.py [--nodes 10000] [--branching 4] [--repeat 10]
+'''
+import argparse, math, os, random, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from utils.components.scene import ComponentScene
+from utils.types.t_matrix import MAT4, QUAT, TRANSFORM
+from utils.types.t_vectors import VEC3
+
+
+def build_scene(nodes:int, branching:int) -> ComponentScene:
+    scene = ComponentScene(capacity=nodes)
+    random.seed(0)
+    for index in range(nodes):
+        parent = scene.nodes[(index - 1) // branching] if index > 0 else None
+        scene.create_node(name=f'Node_{index}', parent=parent,
+                          position=VEC3(random.uniform(-1, 1), random.uniform(-1, 1), random.uniform(-1, 1)),
+                          rotation=QUAT.from_axis_angle(VEC3(0, 1, 0), random.uniform(0, math.pi)),
+                          scale=VEC3(1, 1, 1))
+    return scene
+
+
+def naive_update(scene:ComponentScene) -> list:
+    worlds = [None] * len(scene)
+    for node in scene.nodes:
+        local = TRANSFORM(node.position, node.rotation, node.scale).to_matrix()
+        parent = node.parent
+        worlds[node.index] = worlds[parent.index] @ local if parent is not None else local
+    return worlds
+
+
+def measure(function, repeat:int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--nodes', type=int, default=10000)
+    parser.add_argument('--branching', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    scene = build_scene(args.nodes, args.branching)
+    print(f'{len(scene)} nodes, {len(scene.get_levels())} levels')
+
+    naive = naive_update(scene)
+    scene.update()
+    error = max(float(np.abs(naive[index].data - scene.world_matrices[index]).max()) for index in range(len(scene)))
+    print(f'max difference to the per-node traversal: {error:.2e}')
+
+    def full_update():
+        scene.dirty[:len(scene)] = True
+        scene.update()
+
+    leaf = scene.nodes[-1]
+    middle = scene.nodes[len(scene) // (args.branching ** 2)]
+
+    def move(node):
+        def update():
+            node.position = VEC3(random.random(), 0, 0)
+            scene.update()
+        return update
+
+    print(f"{'case':<36}{'ms':>10}")
+    print(f"{'per-node MAT4 traversal':<36}{measure(lambda: naive_update(scene), max(1, args.repeat // 5)):>10.3f}")
+    print(f"{'batched full update':<36}{measure(full_update, args.repeat):>10.3f}")
+    print(f"{'batched update, root moved':<36}{measure(move(scene.nodes[0]), args.repeat):>10.3f}")
+    print(f"{'batched update, inner node moved':<36}{measure(move(middle), args.repeat):>10.3f}")
+    print(f"{'batched update, leaf moved':<36}{measure(move(leaf), args.repeat):>10.3f}")
+    print(f"{'batched update, nothing changed':<36}{measure(scene.update, args.repeat):>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+'''
+Benchmark of the import-time cost of `import pyglshell`.
+
+Each run imports the application in a fresh interpreter with `python -X importtime`
+and reads the cumulative import times it reports on stderr. Icons are lazy handles,
+so no image should be decoded and no OpenGL context created while importing.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--module pyglshell] [--top 10]
+'''
+import argparse, os, subprocess, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module:str) -> tuple:
+    ''' Imports `module` in a new interpreter, returns the wall time and the cumulative import time of each module in microseconds. '''
+    env = dict(os.environ, PYGLET_HEADLESS='1')
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr}')
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        cumulative[name.strip()] = int(cumulative_us)
+    return wall, cumulative
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--module', default='pyglshell')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    walls, totals, modules = [], [], {}
+    for _ in range(args.runs):
+        wall, cumulative = import_times(args.module)
+        walls.append(wall)
+        totals.append(cumulative[args.module])
+        for name, value in cumulative.items():
+            modules.setdefault(name, []).append(value)
+
+    walls.sort()
+    totals.sort()
+    print(f'import {args.module}: {totals[len(totals) // 2] / 1000:.1f} ms median over {args.runs} runs')
+    print(f'interpreter wall:    {walls[len(walls) // 2] * 1000:.1f} ms')
+    print()
+    print(f'{"module":<40} {"cumulative ms":>14}')
+    medians = {name: sorted(values)[len(values) // 2] for name, values in modules.items()}
+    for name, value in sorted(medians.items(), key=lambda item: -item[1])[:args.top]:
+        print(f'{name:<40} {value / 1000:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
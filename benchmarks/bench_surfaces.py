@@ -0,0 +1,101 @@
+'''
+Benchmark of the content of the windows: drawn in the shared layer, clipped by a `ScissorGroup`, or cached in a `ComponentContentSurface`.
+
+Every panel draws rows of text and rectangles in its content area, more than fit in it. Frames are drawn in an invisible
+pyglet window, `glFinish` included, while the content of `--changed` panels changes every frame:
+
+    shared  `clip_content=False`, the content of all windows is drawn by the draw calls of the shared content layer and overflows
+    clipped `clip_content=True`, each window draws its content with its own scissor rectangle
+    cached  `cache_content=True`, the content is rendered into a texture when it changes, the frames draw one quad per window
+
+Usage:
+    python benchmarks/bench_surfaces.py [--panels 16] [--rows 60] [--changed 1] [--frames 120]
+'''
+import argparse, gc, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from pyglet import gl
+from pyglet.shapes import Rectangle
+from pyglet.text import Label
+from utils.components.window import ComponentWindowsManager
+from utils.metrics.draw_calls import DrawCallCounter
+
+MODES = {
+    'shared': {'clip_content': False},
+    'clipped': {'clip_content': True},
+    'cached': {'cache_content': True},
+}
+
+
+def create_content(window, rows:int) -> list:
+    ''' Rows of labels and rectangles from the top of the content area, the last rows overflow it. '''
+    x, y, width, height = window.get_content_rect()
+    __content = []
+    for row in range(rows):
+        __y = y + height - (row + 1) * 16
+        __content.append(Rectangle(x + 2, __y, width * 0.3, 14, color=(60, 60 + row % 8 * 20, 90), batch=window.content_batch, group=window.content_group))
+        __content.append(Label(f'row {row} of {window.name}', x=x + 6, y=__y + 2, font_size=9, batch=window.content_batch, group=window.content_group))
+    return __content
+
+
+def run(mode:str, panels:int, rows:int, changed:int, frames:int) -> dict:
+    pyglet.window.Window._enable_event_queue = True
+    manager = ComponentWindowsManager(width=1600, height=900, visible=False)
+    # The events of the pyglet window are dispatched at once, like in `run()`
+    pyglet.window.Window._enable_event_queue = False
+    windows = [manager.create_window(name=f'Panel_{index}', show_title=True, **MODES[mode]) for index in range(panels)]
+    manager.on_init()
+    manager.on_resize(1600, 900)
+    manager.on_draw()
+    contents = [create_content(window, rows) for window in windows]
+    for window in windows:
+        window.invalidate_content()
+    manager.on_draw()
+
+    __surfaces = [window.content_surface for window in windows if window.content_surface is not None]
+    __renders = sum(surface.renders for surface in __surfaces)
+    __times = []
+    gc.collect()
+    with DrawCallCounter() as counter:
+        for frame in range(frames):
+            __start = time.perf_counter()
+            for index in range(changed):
+                __window = windows[(frame + index) % panels]
+                __label = contents[(frame + index) % panels][1]
+                __label.text = f'row 0 frame {frame}'
+                __window.invalidate_content()
+            manager.on_draw()
+            gl.glFinish()
+            __times.append((time.perf_counter() - __start) * 1000)
+        __calls = counter.calls / frames
+
+    __renders = sum(surface.renders for surface in __surfaces) - __renders
+    manager.window.close()
+    __times.sort()
+    return {'mode': mode, 'frame_ms': __times[len(__times) // 2], 'p95_ms': __times[int(len(__times) * 0.95)],
+            'draw_calls': __calls, 'renders_per_frame': __renders / frames}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--panels', type=int, default=16)
+    parser.add_argument('--rows', type=int, default=60)
+    parser.add_argument('--changed', type=int, default=1)
+    parser.add_argument('--frames', type=int, default=120)
+    args = parser.parse_args()
+
+    print(f"{'mode':<9}{'frame ms':>10}{'p95 ms':>10}{'draws':>8}{'renders':>9}")
+    for mode in MODES:
+        result = run(mode, args.panels, args.rows, args.changed, args.frames)
+        print(f"{result['mode']:<9}{result['frame_ms']:>10.3f}{result['p95_ms']:>10.3f}{result['draw_calls']:>8.1f}{result['renders_per_frame']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+'''
+Benchmark of the text layout cost of the title bars while the windows are resized.
+
+The title of a window shows its size and position, which change on every resize. For each `title_mode` of `ComponentWindow`,
+a resize storm is replayed and the time spent laying text out is measured per frame:
+
+    full    the whole title is laid out again by `Label.text` whenever the size or the position changes
+    split   the title is laid out once, the digits of the size and position are replaced in a `ComponentNumericLabel`
+    static  the title alone
+
+The text time is the time spent in `TextLayout._update`, the layout of pyglet, and in `ComponentNumericLabel.set_values`.
+
+Usage:
+    python benchmarks/bench_titles.py [--panels 50] [--frames 200]
+'''
+import argparse, gc, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from pyglet.text.layout import TextLayout
+from utils.components.window import ComponentWindow
+from utils.components.text import ComponentNumericLabel
+from utils.types.t_utils import GLYPH_CACHE
+from utils.types.t_vectors import SVEC2, VEC2
+
+
+class TextTimer:
+    ''' Accumulates the time spent in the wrapped text methods while it is installed. '''
+    FUNCTIONS = ((TextLayout, '_update'), (ComponentNumericLabel, 'set_values'))
+
+    def __init__(self):
+        self.time = 0.0
+        self.calls = {}
+        self._originals = {}
+
+    def _wrap(self, function, name:str):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.time += time.perf_counter() - start
+                self.calls[name] = self.calls.get(name, 0) + 1
+        return timed
+
+    def __enter__(self) -> 'TextTimer':
+        for cls, name in self.FUNCTIONS:
+            self._originals[(cls, name)] = cls.__dict__[name]
+            setattr(cls, name, self._wrap(cls.__dict__[name], name))
+        return self
+
+    def __exit__(self, *args) -> None:
+        for (cls, name), function in self._originals.items():
+            setattr(cls, name, function)
+
+
+def run(mode:str, panels:int, frames:int) -> dict:
+    windows = []
+    for index in range(panels):
+        window = ComponentWindow(name=f'Panel_{index}', show_title=True, title_mode=mode)
+        window.size = SVEC2(200, 150)
+        window.on_init()
+        windows.append(window)
+
+    frame_times = []
+    gc.collect()
+    with TextTimer() as timer:
+        for frame in range(frames):
+            start = time.perf_counter()
+            for index, window in enumerate(windows):
+                # A drag back and forth: the sizes repeat
+                window.size = SVEC2(200 + frame % 100, 150 + frame % 50)
+                window.position = VEC2(index * 10, frame % 30)
+                window.on_resize(window.size.width, window.size.height)
+            frame_times.append(time.perf_counter() - start)
+
+    frame_times.sort()
+    return {
+        'mode': mode,
+        'frame_ms_median': frame_times[len(frame_times) // 2] * 1000,
+        'text_ms_per_frame': timer.time / frames * 1000,
+        'layouts_per_frame': timer.calls.get('_update', 0) / frames,
+        'numeric_updates_per_frame': timer.calls.get('set_values', 0) / frames,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--panels', type=int, default=50)
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'frame ms':>10}{'text ms':>10}{'layouts':>10}{'numeric':>10}")
+    for mode in ('full', 'split', 'static'):
+        result = run(mode, args.panels, args.frames)
+        print(f"{result['mode']:<8}{result['frame_ms_median']:>10.3f}{result['text_ms_per_frame']:>10.3f}"
+              f"{result['layouts_per_frame']:>10.1f}{result['numeric_updates_per_frame']:>10.1f}")
+    __cache = GLYPH_CACHE.get_default()
+    print(f'glyph cache: {__cache.hits} hits, {__cache.misses} misses')
+
+
+if __name__ == '__main__':
+    main()
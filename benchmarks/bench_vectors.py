@@ -0,0 +1,130 @@
+'''
+Micro-benchmark of the `VEC2`, `SVEC2` and `GRID4` value types.
+
+Compares the slotted types of `utils.types.t_vectors` with the previous property-based classes, 
+reproduced below, on construction, attribute access and arithmetic. Also reports the memory used by one instance.
+
+Usage:
+    python benchmarks/bench_vectors.py [--number 200000]
+'''
+import argparse, os, sys, timeit, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.types.t_vectors import VEC2, SVEC2, GRID4
+
+
+class LegacyVEC2:
+    def __init__(self, x: float, y: float):
+        self._x = x
+        self._y = y
+
+    @property
+    def x(self) -> float:
+        return self._x
+    
+    @x.setter
+    def x(self, x:float) -> None:
+        self._x = x
+
+    @property
+    def y(self) -> float:
+        return self._y
+    
+    @y.setter
+    def y(self, y:float) -> None:
+        self._y = y
+
+    def __add__(self, other):
+        if isinstance(other, LegacyVEC2):
+            return LegacyVEC2(self._x + other.x, self._y + other.y)
+        return NotImplemented
+
+    def __mul__(self, scalar: float):
+        return LegacyVEC2(self._x * scalar, self._y * scalar)
+
+
+class LegacySVEC2(LegacyVEC2):
+    def __init__(self, width: float, height: float):
+        self._x = self._width = width
+        self._y = self._height = height
+
+    @property
+    def width(self) -> float:
+        return self._width
+
+    @property
+    def height(self) -> float:
+        return self._height
+
+
+class LegacyGRID4:
+    def __init__(self, west: float, east: float, north: float, south: float):
+        self._west = west
+        self._east = east
+        self._north = north
+        self._south = south
+
+    @property
+    def west(self) -> float:
+        return self._west
+
+    @property
+    def north(self) -> float:
+        return self._north
+
+    def __add__(self, other):
+        if isinstance(other, LegacyGRID4):
+            return LegacyGRID4(self._west + other._west, self._east + other._east, self._north + other._north, self._south + other._south)
+        return NotImplemented
+
+
+CASES = (
+    ('VEC2 construction', 'VEC2(1.0, 2.0)'),
+    ('VEC2 attribute access', 'a.x + a.y'),
+    ('VEC2 addition', 'a + b'),
+    ('VEC2 scalar multiplication', 'a * 2.0'),
+    ('SVEC2 construction', 'SVEC2(1.0, 2.0)'),
+    ('SVEC2 width/height access', 's.width + s.height'),
+    ('GRID4 construction', 'GRID4(1.0, 2.0, 3.0, 4.0)'),
+    ('GRID4 attribute access', 'g.west + g.north'),
+    ('GRID4 addition', 'g + g'),
+)
+
+
+def instance_size(factory) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(10000)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) // len(instances)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=200000)
+    args = parser.parse_args()
+
+    current = {'VEC2': VEC2, 'SVEC2': SVEC2, 'GRID4': GRID4}
+    legacy = {'VEC2': LegacyVEC2, 'SVEC2': LegacySVEC2, 'GRID4': LegacyGRID4}
+    setup = 'a = VEC2(1.0, 2.0); b = VEC2(3.0, 4.0); s = SVEC2(5.0, 6.0); g = GRID4(1.0, 2.0, 3.0, 4.0)'
+
+    print(f"{'case':<30}{'legacy ns':>12}{'slotted ns':>12}{'speedup':>10}")
+    for name, statement in CASES:
+        timings = []
+        for namespace in (legacy, current):
+            timer = timeit.Timer(statement, setup, globals=dict(namespace))
+            timings.append(min(timer.repeat(3, args.number)) / args.number * 1e9)
+        print(f"{name:<30}{timings[0]:>12.1f}{timings[1]:>12.1f}{timings[0] / timings[1]:>9.2f}x")
+
+    print()
+    print(f"{'type':<30}{'legacy B':>12}{'slotted B':>12}")
+    for name, arguments in (('VEC2', (1.0, 2.0)), ('SVEC2', (1.0, 2.0)), ('GRID4', (1.0, 2.0, 3.0, 4.0))):
+        sizes = [instance_size(lambda: namespace[name](*arguments)) for namespace in (legacy, current)]
+        print(f"{name:<30}{sizes[0]:>12}{sizes[1]:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+'''
+Benchmark of saving and restoring a workspace of many windows with `ComponentWorkspace`.
+
+A manager with a border layout and `--windows` windows spread over its regions, with their own sizes, colors, icons and a few nested windows,
+is saved as JSON and in the binary format. Each encoding is then read back into a new manager: the document is validated by one pydantic call
+and the validated models are used by the windows as they are. The restore time is the time from the encoded bytes to the windows placed in the layout,
+before their shapes are created by `on_init()`.
+
+Usage:
+    python benchmarks/bench_workspace.py [--windows 200] [--repeat 20]
+'''
+import argparse, gc, json, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from utils.components.window import ComponentWindowsManager, ComponentWindow
+from utils.components.layout import ComponentBorderStack
+from utils.components.workspace import ComponentWorkspace
+from utils.types.t_vectors import SVEC2
+from utils.types.t_colors import RGB
+from const import STYLES
+
+ANCHORS = ('north', 'center', 'south', 'west', 'east')
+ICONS = (STYLES.ICONS.value.CONSOLE, STYLES.ICONS.value.FILEMANAGER, STYLES.ICONS.value.OBSERVER, STYLES.ICONS.value.NOICON)
+
+
+def create_manager() -> ComponentWindowsManager:
+    return ComponentWindowsManager(width=1280, height=720, visible=False)
+
+
+def populate(manager:ComponentWindowsManager, count:int) -> None:
+    ''' Adds `count` windows to the manager, every tenth window is a child of the previous one. '''
+    manager.layout = ComponentBorderStack()
+    manager.layout.center.min_size = SVEC2(320, 480)
+    for index in range(count):
+        if index % 10 == 9:
+            window.add(ComponentWindow(name=f'Toolbar_{index}', title=f'Toolbar of {window.name}'))
+            continue
+        window = manager.create_window(name=f'Panel_{index}', anchor=ANCHORS[index % len(ANCHORS)],
+                                       min_size=SVEC2(20 + index % 7, 20 + index % 5), show_title=index % 2 == 0,
+                                       title_icon=ICONS[index % len(ICONS)].value.path, background_color=RGB(index % 256, 40, 60))
+    manager.layout.on_init()
+
+
+def measure(function, repeat:int) -> float:
+    ''' The best time of `repeat` calls of `function` in milliseconds. '''
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--windows', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    manager = create_manager()
+    populate(manager, args.windows)
+    workspace = ComponentWorkspace(manager)
+    encodings = {'json': workspace.dumps(), 'binary': workspace.dumps(binary=True)}
+
+    print(f'windows: {sum(1 for _ in manager.walk()) - 1}')
+    print(f'{"":<8} {"bytes":>8} {"save ms":>8} {"decode ms":>10} {"restore ms":>11}')
+    for name, data in encodings.items():
+        save = measure(lambda: workspace.dumps(binary=name == 'binary'), args.repeat)
+        decode = measure(lambda: ComponentWorkspace.decode(data), args.repeat)
+        # The windows are restored into new managers, created ahead of the measured calls
+        targets = iter([create_manager() for _ in range(args.repeat)])
+        restore = measure(lambda: ComponentWorkspace(next(targets)).loads(data), args.repeat)
+        print(f'{name:<8} {len(data):>8} {save:>8.2f} {decode:>10.2f} {restore:>11.2f}')
+
+    restored = create_manager()
+    ComponentWorkspace(restored).loads(encodings['binary'])
+    assert [window.name for window in restored.walk()][1:] == [window.name for window in manager.walk()][1:]
+    assert json.loads(ComponentWorkspace(restored).dumps()) == json.loads(encodings['json'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+'''
+Headless benchmark harness of the window manager and the layout engine.
+
+A `ComponentWindowsManager` is driven without a native window, with a `HeadlessWindow`, or with an invisible pyglet window
+with `--window offscreen`. Its windows are restored from a synthetic workspace, panels spread over all regions of a
+`ComponentBorderStack`, or from a workspace file saved by the shell. Sequences of events are then replayed, one frame at a time:
+
+    idle        nothing changes, the frames only draw
+    resize      a drag of the window border, several resize events per frame
+    redraw      the titles and colors of some windows change every frame
+    relayout    the minimum size of a window changes every frame
+
+Every scenario is replayed twice. The first time the frames are timed and split with a `Profiler`:
+the layout passes, the redraws of the windows and the rest of the frame, which is mostly drawing.
+The second time the allocations are traced with `tracemalloc`, which slows the frames down too much to time them.
+
+The report is written as JSON. With `--baseline`, the median frame times are compared with a previous report
+and the harness exits with an error if a scenario got slower than `--tolerance`.
+
+Usage:
+    python benchmarks/harness.py [--panels 300] [--frames 60] [--output report.json] [--baseline previous.json]
+'''
+import argparse, gc, json, os, platform, random, sys, time, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['headless'] = True
+pyglet.resource.path = [ROOT]
+pyglet.resource.reindex()
+
+from utils.components.window import ComponentWindowsManager, ComponentWindowModel
+from utils.components.workspace import ComponentWorkspace, WorkspaceState, LayoutState
+from utils.metrics.headless import HeadlessWindow
+from utils.metrics.profiler import Profiler
+from utils.types.t_vectors import SVEC2
+from utils.types.t_colors import RGB
+
+ANCHORS = ('north', 'south', 'west', 'east', 'center')
+SCENARIOS = ('idle', 'resize', 'redraw', 'relayout')
+
+
+def create_workspace(panels:int, seed:int = 0) -> WorkspaceState:
+    ''' A workspace of `panels` windows spread over the regions of a border layout, with random minimum sizes and titles. '''
+    __random = random.Random(seed)
+    __windows = [ComponentWindowModel(name=f'Panel_{index}',
+                                      anchor=ANCHORS[index % len(ANCHORS)],
+                                      min_size=SVEC2(__random.randint(10, 60), __random.randint(10, 60)),
+                                      show_title=__random.random() < 0.5) for index in range(panels)]
+    return WorkspaceState(layout=LayoutState(type='border'), windows=__windows)
+
+
+def create_manager(state:WorkspaceState, window:str = 'fake', width:int = 1280, height:int = 720) -> ComponentWindowsManager:
+    if window == 'fake':
+        manager = ComponentWindowsManager(window=HeadlessWindow(width, height))
+    else:
+        manager = ComponentWindowsManager(width=width, height=height, visible=False)
+    ComponentWorkspace(manager).restore(state)
+    manager.on_init()
+    # Like `run()`, the events of a pyglet window are dispatched at once, not queued
+    pyglet.window.Window._enable_event_queue = False
+    manager.on_resize(width, height)
+    manager.on_draw()
+    return manager
+
+
+def replay(manager:ComponentWindowsManager, scenario:str, frames:int, seed:int = 0) -> None:
+    '''
+    Replays `frames` frames of a scenario. Returns a generator that yields after the events of a frame are dispatched,
+    the caller draws the frame.
+    '''
+    __random = random.Random(seed)
+    __windows = [window for window in manager.walk() if window is not manager]
+    __width, __height = manager.size.width, manager.size.height
+
+    for frame in range(frames):
+        if scenario == 'resize':
+            # Four resize events per frame, only the last one is applied by the manager
+            for step in range(4):
+                __offset = (frame * 4 + step) % 400
+                __offset = __offset if __offset < 200 else 400 - __offset
+                manager.window.dispatch_event('on_resize', __width + __offset * 2, __height + __offset)
+        elif scenario == 'redraw':
+            for window in __random.sample(__windows, min(10, len(__windows))):
+                window.title = f'{window.name} {frame}'
+                window.background_color = RGB(__random.randint(0, 60), __random.randint(0, 60), __random.randint(0, 60))
+        elif scenario == 'relayout':
+            __window = __random.choice(__windows)
+            __window.min_size = SVEC2(__random.randint(10, 80), __random.randint(10, 80))
+        yield frame
+
+
+def get_top_level_time(spans:list, category:str) -> float:
+    ''' The time of the spans of `category` that are not nested in another span of the same category, in milliseconds. '''
+    __time, __end = 0, 0
+    for _, _, start, duration, _ in sorted(span for span in spans if span[0] == category):
+        if start >= __end:
+            __time += duration
+            __end = start + duration
+    return __time / 1e6
+
+
+def get_statistics(values:list) -> dict:
+    __values = sorted(values)
+    if not __values:
+        return {'median': 0.0, 'p95': 0.0, 'max': 0.0, 'mean': 0.0}
+    return {
+        'median': __values[len(__values) // 2],
+        'p95': __values[min(int(len(__values) * 0.95), len(__values) - 1)],
+        'max': __values[-1],
+        'mean': sum(__values) / len(__values),
+    }
+
+
+def run_scenario(state:WorkspaceState, scenario:str, frames:int, window:str, seed:int) -> dict:
+    ''' Replays a scenario on a new manager, timed then traced. Returns the report of the scenario. '''
+    manager = create_manager(state, window)
+    profiler = Profiler()
+    manager.profiler = profiler
+    __frame, __layout, __redraw, __draw = [], [], [], []
+    __passes = manager.layout_passes
+
+    gc.collect()
+    with profiler:
+        for _ in replay(manager, scenario, frames, seed):
+            profiler.reset()
+            __start = time.perf_counter()
+            manager.window.draw(1 / 60)
+            __frame.append((time.perf_counter() - __start) * 1000)
+
+            __spans = profiler.spans
+            __layout.append(get_top_level_time(__spans, 'layout'))
+            __redraw.append(get_top_level_time(__spans, 'redraw'))
+            __draw.append(__frame[-1] - get_top_level_time(__spans, 'update_layout') - get_top_level_time(__spans, 'update_windows'))
+    __passes = manager.layout_passes - __passes
+    __culled = manager.culled_windows
+    manager.window.close()
+
+    manager = create_manager(state, window)
+    gc.collect()
+    tracemalloc.start()
+    __before = tracemalloc.take_snapshot()
+    for _ in replay(manager, scenario, frames, seed):
+        manager.window.draw(1 / 60)
+    __after = tracemalloc.take_snapshot()
+    __peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    manager.window.close()
+    __allocations = [stat for stat in __after.compare_to(__before, 'filename') if stat.count_diff > 0]
+
+    return {
+        'frames': frames,
+        'layout_passes': __passes,
+        'culled_windows': __culled,
+        'frame_ms': get_statistics(__frame),
+        'layout_ms': get_statistics(__layout),
+        'redraw_ms': get_statistics(__redraw),
+        'draw_ms': get_statistics(__draw),
+        'allocated_blocks': sum(stat.count_diff for stat in __allocations),
+        'allocated_kib': sum(stat.size_diff for stat in __allocations) / 1024,
+        'peak_traced_kib': __peak / 1024,
+    }
+
+
+def compare(report:dict, baseline:dict, tolerance:float) -> list:
+    ''' The scenarios whose median frame time is more than `tolerance` slower than in the baseline, with the ratio. '''
+    __regressions = []
+    for scenario, result in report['scenarios'].items():
+        __previous = baseline.get('scenarios', {}).get(scenario)
+        if __previous is None or __previous['frame_ms']['median'] <= 0:
+            continue
+        __ratio = result['frame_ms']['median'] / __previous['frame_ms']['median']
+        if __ratio > 1 + tolerance:
+            __regressions.append((scenario, __ratio))
+    return __regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--panels', type=int, default=300)
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--window', choices=('fake', 'offscreen'), default='fake')
+    parser.add_argument('--workspace', default='', help='replays the windows of a saved workspace instead of a synthetic one')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--output', default='', help='writes the report to this file instead of the standard output')
+    parser.add_argument('--baseline', default='', help='a previous report to compare the median frame times with')
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args()
+
+    if args.workspace != '':
+        with open(args.workspace, 'rb') as file:
+            state = ComponentWorkspace.decode(file.read())
+    else:
+        state = create_workspace(args.panels, args.seed)
+
+    report = {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pyglet': pyglet.version,
+            'platform': platform.platform(),
+            'window': args.window,
+            'workspace': args.workspace or 'synthetic',
+            'panels': len(state.windows),
+            'seed': args.seed,
+        },
+        'scenarios': {scenario: run_scenario(state, scenario, args.frames, args.window, args.seed) for scenario in args.scenarios},
+    }
+
+    __text = json.dumps(report, indent=2)
+    if args.output != '':
+        with open(args.output, 'w') as file:
+            file.write(__text)
+    else:
+        print(__text)
+
+    if args.baseline != '':
+        with open(args.baseline) as file:
+            __regressions = compare(report, json.load(file), args.tolerance)
+        for scenario, ratio in __regressions:
+            print(f'regression: {scenario} median frame time x{ratio:.2f}', file=sys.stderr)
+        if __regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
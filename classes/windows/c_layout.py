@@ -1,31 +1,115 @@
-from typing import List
+from typing import List, Any
 from abc import ABC, abstractmethod
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from utils.types.t_vectors import VEC2, SVEC2
 
-class Layout(ABC, BaseModel): 
+class LayoutModel(BaseModel):
+    '''
+    The `LayoutModel` class describes the configuration of a `Layout`. It is validated once, when the layout is created, 
+    the layout itself is a plain object, so the assignments of a layout pass do not go through pydantic.
+    '''
+    children: List[Any] = Field(default_factory=list)
+    parent: 'Layout' = None
+    position:VEC2 = Field(default_factory=VEC2(0,0).copy)
+    size:SVEC2 = Field(default_factory=SVEC2(0,0).copy)
+    max_size:SVEC2 = Field(default_factory=SVEC2(0,0).copy)
+    min_size:SVEC2 = Field(default_factory=SVEC2(0,0).copy)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+class Layout(ABC): 
     '''
     The `Layout` class is an abstract base class that represents a layout for a user interface element. 
     It provides a set of properties and methods for managing the size, position, and children of the layout. 
     The class is designed to be subclassed by concrete layout implementations, which must provide implementations for the abstract methods `get_min_size()`, `get_max_size()`, and `do_layout()`.
+
+    The layout keeps a dirty flag. Setting `size` or `position` marks the layout dirty, setting `min_size`, `max_size` or `children`
+    also marks the parent dirty, because the parent uses them to place this layout. `do_layout()` of a clean layout does nothing,
+    so a layout pass only visits the subtrees that changed.
+
+    The keyword arguments are validated by the `MODEL` of the layout, a pydantic model, and copied to plain attributes.
     '''
+    MODEL:type = LayoutModel
 
-    children: List[BaseModel] = []
-    parent: 'Layout' = None
-    position:VEC2 = VEC2(0,0)
-    size:SVEC2 = SVEC2(0,0)
-    max_size:SVEC2 = SVEC2(0,0)
-    min_size:SVEC2 = SVEC2(0,0)
+    def __init__(self, **data):
+        self.__dict__.update(self.MODEL(**data).__dict__)
+        self.__dict__.update(_dirty=True, _dirty_subtree=True, _in_layout=False)
+
+    def __setattr__(self, name:str, value) -> None:
+        # Changes made by the layout to itself while it is laid out are results, not new constraints.
+        if name not in ('size', 'position', 'min_size', 'max_size', 'children') or self._in_layout:
+            super().__setattr__(name, value)
+        elif name == 'children':
+            super().__setattr__(name, value)
+            self.invalidate(propagate=True)
+        elif getattr(self, name) != value:
+            super().__setattr__(name, value)
+            self.invalidate(propagate=name in ('min_size', 'max_size'))
+
+    def invalidate(self, propagate:bool = False) -> None:
+        '''
+        Marks the layout dirty, so the next layout pass recomputes its children.
+
+        Parameters:
+            propagate (bool): Also marks the parent dirty, used when a constraint the parent depends on has changed.
+        '''
+        self._dirty = True
+        __parent = self.parent
 
-    def add(self, element:BaseModel) -> None:
+        if propagate and __parent is not None and __parent is not self:
+            __parent.invalidate()
+            return
+
+        while __parent is not None and __parent is not self and not __parent._dirty_subtree:
+            __parent._dirty_subtree = True
+            __parent = __parent.parent
+
+    def is_dirty(self) -> bool:
+        ''' Checks if the layout or any layout below it must be laid out again. '''
+        return self._dirty or self._dirty_subtree
+
+    def begin_layout(self) -> bool:
+        '''
+        Starts a layout pass of this layout. Returns False if the layout is clean and the pass can be skipped.
+        '''
+        if not self.is_dirty():
+            return False
+        self._in_layout = True
+        return True
+
+    def end_layout(self) -> None:
+        ''' Finishes the layout pass started with `begin_layout()` and marks the layout clean. '''
+        self._in_layout = False
+        self._dirty = False
+        self._dirty_subtree = False
+
+    def add(self, element:Any) -> None:
         '''
         Adds the given element to the list of children for this layout, if it is not already present.
         
         Parameters:
-            element (BaseModel): The element to add as a child of this layout.
+            element (Any): The element to add as a child of this layout.
         '''
-        if element not in self.children:
+        # A window that is in no layout yet is new, the list is not searched
+        if getattr(element, 'container', False) is None or element not in self.children:
             self.children.append(element)
+            if hasattr(element, 'container'):
+                element.container = self
+            self.invalidate(propagate=True)
+
+    def remove(self, element:Any) -> None:
+        '''
+        Removes the given element from the list of children for this layout, if it is present.
+
+        Parameters:
+            element (Any): The element to remove.
+        '''
+        if element in self.children:
+            self.children.remove(element)
+            if getattr(element, 'container', None) is self:
+                element.container = None
+        self.invalidate(propagate=True)
 
     @abstractmethod
     def get_min_size(self) -> SVEC2: ...
@@ -34,4 +118,7 @@ class Layout(ABC, BaseModel):
     def get_max_size(self) -> SVEC2: ...
 
     @abstractmethod
-    def do_layout(self) -> None: ...
\ No newline at end of file
+    def do_layout(self) -> None: ...
+
+
+LayoutModel.model_rebuild()
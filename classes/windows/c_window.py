@@ -1,3 +1,4 @@
+from typing import Any, Dict
 from pydantic import BaseModel, Field
 from pyglet.clock import Clock
 from utils.types.t_vectors import SVEC2, VEC2
@@ -6,7 +7,27 @@ from utils.components.layout import ComponentHorizontalStack
 import random
 from abc import ABC, abstractmethod
 
-class Window(ABC, BaseModel):
+class WindowModel(BaseModel):
+    """
+    The `WindowModel` class describes the configuration of a `Window`: the keyword arguments of the window are validated by it once, 
+    when the window is created. The window itself is a plain object, so the layout pass and the redraw do not go through pydantic.
+    """
+    name:str = None
+    parent: 'Window' = None
+    children: Dict[str, dict] = Field(default_factory=dict)
+    size: SVEC2 = Field(default_factory=SVEC2(200,200).copy)
+    position:VEC2 = Field(default_factory=VEC2(0,0).copy)
+    anchor:str = 'north'
+    fixed:bool = True
+    layout:Layout = None
+    min_size:SVEC2 = Field(default_factory=SVEC2(50,50).copy)
+    max_size:SVEC2 = Field(default_factory=SVEC2(0,0).copy)
+    bevel:VEC2 = Field(default_factory=VEC2(15,15).copy)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+class Window(ABC):
     """
     The `Window` class is an abstract base class that represents a window in a graphical user interface. It provides a set of properties and methods for managing the window's appearance, behavior, and layout.
 
@@ -19,7 +40,11 @@ class Window(ABC, BaseModel):
     - Abstract methods for drawing, initializing, and running the window, which must be implemented by concrete subclasses.
 
     The `Window` class is designed to be extended by specific window implementations, which can override the abstract methods and customize the window's behavior as needed.
+    Subclasses with more settings extend the `MODEL` of the window, the pydantic model that validates the keyword arguments.
+    A window can also be created from an instance of its `MODEL` validated beforehand, which is then used as is, without the keyword arguments.
     """
+    MODEL:type = WindowModel
+
     def generate_name(self)-> str:
         NAMES = [
             "WackyWindow",
@@ -40,22 +65,68 @@ class Window(ABC, BaseModel):
         ]
         return random.choice(NAMES)
 
-    name:str = Field(default_factory=generate_name)
-    parent: 'Window' = None
-    children: 'Window' = {}
-    size: SVEC2 = SVEC2(200,200)
-    position:VEC2 = VEC2(0,0)
-    anchor:str = 'north'
-    fixed:bool = True
-    layout:'Layout' = ComponentHorizontalStack()
-    min_size:SVEC2 = SVEC2(50,50)
-    max_size:SVEC2 = SVEC2(0,0)
-    bevel:VEC2 = VEC2(15,15)
-
-    def __init__(self, **data):
-        super().__init__(**data)
+    def __init__(self, model:WindowModel = None, **data):
+        # A model validated beforehand, e.g. a window of a saved workspace, is used as is instead of validating `data`.
+        # The model of a base class is completed with the defaults of the settings the subclass adds.
+        if model is not None and not isinstance(model, self.MODEL):
+            model = self.MODEL.model_construct(**model.__dict__)
+        self.__dict__.update((model if model is not None else self.MODEL(**data)).__dict__)
+        # The initial state is set without the change hooks of __setattr__, a new window is dirty anyway
+        self.__dict__.update(_layout=self.__dict__.pop('layout'), _dirty=True, _container=None, _names={}, _name_counters={})
+        if self.name is None:
+            self.name = self.generate_name()
         if self.parent is None:
-            self.parent = self
+            self.__dict__['parent'] = self
+
+    def __setattr__(self, name:str, value) -> None:
+        # The window is dirty when its rectangle changes, its container when its constraints change
+        if name in ('size', 'position'):
+            if getattr(self, name) != value:
+                super().__setattr__(name, value)
+                self.invalidate()
+        elif name in ('min_size', 'max_size'):
+            if getattr(self, name) != value:
+                super().__setattr__(name, value)
+                if self.container is not None:
+                    self.container.invalidate()
+        elif name == 'children':
+            super().__setattr__(name, value)
+            self.invalidate()
+            self.layout.invalidate()
+        else:
+            super().__setattr__(name, value)
+
+    @property
+    def layout(self) -> Layout:
+        """ The layout of the children of the window. Most windows have no children, so the default `ComponentHorizontalStack` is created when first used. """
+        if self._layout is None:
+            self._layout = ComponentHorizontalStack()
+        return self._layout
+
+    @layout.setter
+    def layout(self, layout:Layout) -> None:
+        self._layout = layout
+
+    @property
+    def container(self) -> Layout:
+        """ The layout that places the window, set by `Layout.add()`. """
+        return self._container
+
+    @container.setter
+    def container(self, layout:Layout) -> None:
+        self.__dict__['_container'] = layout
+
+    def invalidate(self) -> None:
+        """ Marks the window dirty, so it is redrawn on the next redraw. """
+        self._dirty = True
+
+    def is_dirty(self) -> bool:
+        """ Checks if the window has changed since it was last redrawn. """
+        return self._dirty
+
+    def mark_clean(self) -> None:
+        """ Marks the window as redrawn. """
+        self._dirty = False
 
     def get_min_size(self) -> SVEC2:
         return self.min_size
@@ -65,15 +136,27 @@ class Window(ABC, BaseModel):
 
     def get_manager(self) -> 'WindowsManager':
         """Returns the window manager to which the current window belongs."""
-        if self.is_windows_manager() or self.parent == self:
+        if self.is_windows_manager() or self.parent is self:
             return self
         else:
             return self.parent.get_manager()
 
+    def get_names(self) -> dict:
+        """ Returns the name index of the manager: every window below the manager by its name. """
+        return self.get_manager()._names
+
+    def walk(self):
+        """ Iterates over the window and all windows below it. """
+        __stack = [self]
+        while __stack:
+            __window = __stack.pop()
+            yield __window
+            __stack.extend(child['window'] for child in __window.children.values())
+
     def is_exist(self, window: 'Window') -> bool:
         """ Checks if the window exists in the current window. """
         if self.is_composite():
-            return window.name in self._children
+            return window.name in self.children
         else:
             return self
 
@@ -86,58 +169,113 @@ class Window(ABC, BaseModel):
         return False
     
     def set_nonexistant_name(self, window: 'Window', index = 1) -> 'Window':
-        """ Sets a unique name for the window if the current name already exists.
+        """ Sets a unique name for the window if the current name already exists in the manager.
+
+            The manager keeps the next free suffix of every base name, so `Panel`, `Panel_1`, `Panel_2`, ... 
+            are handed out without probing the suffixes already taken.
 
             :param window: The window for which the name is being set.
-            :param index: Index for name uniqueness.
+            :param index: The lowest suffix for name uniqueness.
             :return: The window with a unique name.
          """
-        if window.name in self.children:
-            _name = window.name.split('_')
-
-            if _name[-1].isdigit():
-                index = int(_name[-1])+1
-                _name = ''.join(_name[:-1]) + f'_{index}'
-            else:
-                _name = window.name + f'_{index}'
+        __manager = self.get_manager()
+        __names = __manager._names
+        if window.name not in __names and window.name != __manager.name:
+            return window
 
-            window.name = _name
-            self.set_nonexistant_name(window, index)
+        __base, __separator, __suffix = window.name.rpartition('_')
+        if __separator and __suffix.isdigit():
+            index = max(index, int(__suffix) + 1)
         else:
-            return window
+            __base = window.name
+
+        index = max(index, __manager._name_counters.get(__base, 1))
+        while f'{__base}_{index}' in __names:
+            index += 1
+        __manager._name_counters[__base] = index + 1
+
+        window.name = f'{__base}_{index}'
+        return window
+
+    def register(self, window: 'Window') -> None:
+        """ 
+        Adds a window and the windows below it to the name index of the manager. 
+        Windows below it whose names are taken in the manager are renamed.
+        """
+        __names = self.get_names()
+        for __window in window.walk():
+            if __window is not window and (__window.name in __names or __window.name == self.get_manager().name):
+                __children = __window.parent.children
+                del __children[__window.name]
+                self.set_nonexistant_name(__window)
+                __children[__window.name] = {'window': __window, 'name': __window.name}
+            __names[__window.name] = __window
+        # The window is no longer the root of its own index
+        if window._names:
+            window._names = {}
+            window._name_counters = {}
+
+    def unregister(self, window: 'Window') -> None:
+        """ Removes a window and the windows below it from the name index of the manager. """
+        __names = self.get_names()
+        for __window in window.walk():
+            if __names.get(__window.name) is __window:
+                del __names[__window.name]
     
     def add(self, window: 'Window') -> None:
         """
-        Adds a window to the collection, ensuring it has a unique name.
+        Adds a window to the collection, ensuring it has a unique name in the manager.
         Sets the parent of the added window to the current window.
         """
         self.set_nonexistant_name(window)
-        self.children = self.children | {window.name : { 'window': window, 'name': window.name}}
+        self.children[window.name] = { 'window': window, 'name': window.name}
+        self.invalidate()
+        self.layout.invalidate()
         self.layout.add(window)
         window.parent = self
+        self.register(window)
     
     def remove(self, window: 'Window') -> None:   
         """
         Removes a specified window from the collection.
-        If the window is found, it is deleted from the collection.
+        If the window is found, it is deleted from the collection, from the layouts that place it and from the name index of the manager.
         """     
-        if self.children[window.name]:
+        if window.name in self.children:
             del self.children[window.name]
+            self.invalidate()
+            self.layout.remove(window)
+            if window.container is not None:
+                window.container.remove(window)
+            self.unregister(window)
             window.parent = window
 
     def get(self, name:str) -> 'Window':
         """
-        Retrieves a window by its name from the collection.
-        If not found, the method attempts to retrieve it from child windows recursively.
+        Retrieves a window below the current window by its name or by its path, the names from the current window separated by `/`,
+        e.g. `'Viewer/Toolbar'`. Names are resolved with the name index of the manager, paths with one lookup per level.
+        Returns None if the window is not found.
         """
-        if len(self.children) == 0:
-            return None
-        
-        if self.children[name]:
-            return self.children[name]['window']
-        else:
-            for _child in self.children:
-                return _child.get(_child, name)
+        if '/' in name:
+            __window = self
+            for __name in name.strip('/').split('/'):
+                __child = __window.children.get(__name)
+                if __child is None:
+                    return None
+                __window = __child['window']
+            return __window
+
+        __manager = self.get_manager()
+        __window = __manager._names.get(name)
+        if __window is None or __manager is self:
+            return __window
+
+        # The index covers the whole manager, the window must be below the current one
+        __ancestor = __window.parent
+        while __ancestor is not self:
+            if __ancestor is __ancestor.parent:
+                return None
+            __ancestor = __ancestor.parent
+        return __window
 
     @abstractmethod
     def on_draw(self) -> None: ...
@@ -153,11 +291,19 @@ class Window(ABC, BaseModel):
     def run(self) -> None: ...
 
 
+class WindowsManagerModel(WindowModel):
+    """ The configuration of a `WindowsManager`. """
+    # A pyglet window, or any object with its interface such as a `HeadlessWindow`
+    window: Any = None
+    clock: Clock = None
+
+
 class WindowsManager(Window): 
     '''
     The `WindowsManager` class is responsible for managing a collection of windows. 
     It provides methods to add, remove, and retrieve windows by name, as well as handle events such as drawing, redrawing, and resizing. 
-    The class also includes utility methods like `generate_name()` to generate unique window names, and properties to store a `BaseModel` and a `Clock` instance.
+    The class also includes utility methods like `generate_name()` to generate unique window names, and properties to store a window and a `Clock` instance.
+    Its settings are validated by `WindowsManagerModel`.
     '''
     def generate_name(self):
         NAMES = [
@@ -176,11 +322,7 @@ class WindowsManager(Window):
         ]
         return random.choice(NAMES)
 
-    window: BaseModel = None
-    clock: Clock = None
-
-    class Config:
-        arbitrary_types_allowed = True
+    MODEL:type = WindowsManagerModel
 
     def is_windows_manager(self) -> bool:
         # This is element is window manager
@@ -194,4 +336,8 @@ class WindowsManager(Window):
     def create_window(self, name:str) -> Window: ...
 
     @abstractmethod
-    def destroy_window(self, name:str) -> None: ...
\ No newline at end of file
+    def destroy_window(self, name:str) -> None: ...
+
+
+WindowModel.model_rebuild()
+WindowsManagerModel.model_rebuild()
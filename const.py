@@ -23,5 +23,6 @@ class STYLES(Enum):
     
     FONT_SIZE = 12
     FONT = 'Arial'
+    FONT_MONO = 'Courier New'
     ICONS = _ICONS
     COLOR_BALANCE = _COLOR_BALANCE
\ No newline at end of file
@@ -1,23 +1,23 @@
-import random, pyglet
+import os, random, warnings, pyglet
+from pydantic import ValidationError
 from utils.components.window import ComponentWindowsManager
+from utils.components.workspace import ComponentWorkspace
+from utils.components.status import ComponentStatusWindow
+from utils.components.console import ComponentConsoleWindow
+from utils.components.files import ComponentFileManagerWindow
+from utils.components.inspector import ComponentInspectorWindow
 from utils.components.layout import ComponentBorderStack, ComponentVerticalStack, ComponentHorizontalStack
 from utils.types.t_vectors import SVEC2, VEC2
 from utils.types.t_colors import RGB
+from utils.types.t_utils import ICON_ATLAS
+from utils.metrics.profiler import Profiler
 from const import STYLES
 
-def window(b_maximize=True, icon='static/favicon.ico', *args, **kwargs):
+def default_workspace(windows_manager:ComponentWindowsManager) -> None:
     '''
-    
-    '''
-    
-    '''
-    Description:
+    Arranges the default windows of the shell in `windows_manager`.
     w_*** - windows objects.
     '''
-    
-    windows_manager = ComponentWindowsManager(*args, **kwargs)
-    windows_manager.window.set_minimum_size(800, 720)
-
     windows_manager.layout = ComponentBorderStack()
     windows_manager.layout.center.min_size = SVEC2(320,480)
     windows_manager.layout.east.min_size = SVEC2(0,0)
@@ -25,11 +25,11 @@ def window(b_maximize=True, icon='static/favicon.ico', *args, **kwargs):
 
 
     w_viewer = windows_manager.create_window(name='Viewer', anchor='center')
-    w_console = windows_manager.create_window(name='Console', anchor='center')
+    w_console = windows_manager.create_window(name='Console', anchor='center', window_class=ComponentConsoleWindow)
     w_tools = windows_manager.create_window(name='Tools',  anchor='north')
-    w_file_manager = windows_manager.create_window(name='File Manager', anchor='east')
-    w_status= windows_manager.create_window(name='Status aplet', anchor='south')
-    w_object_observer = windows_manager.create_window(name='Inspector', anchor='west')
+    w_file_manager = windows_manager.create_window(name='File Manager', anchor='east', window_class=ComponentFileManagerWindow)
+    w_status= windows_manager.create_window(name='Status aplet', anchor='south', window_class=ComponentStatusWindow)
+    w_object_observer = windows_manager.create_window(name='Inspector', anchor='west', window_class=ComponentInspectorWindow)
     
 
     w_object_observer.show_title = True
@@ -65,6 +65,37 @@ def window(b_maximize=True, icon='static/favicon.ico', *args, **kwargs):
     #w_object_observer.background_color = RGB(150,255,0)
     windows_manager.layout.on_init()
 
+
+def window(b_maximize=True, icon='static/favicon.ico', workspace='', profile='', *args, **kwargs):
+    '''
+    Creates the shell window and runs it.
+    If `workspace` is the path of a file, the windows are restored from it if it exists and saved to it when the shell is closed,
+    otherwise the default windows are used.
+    If `profile` is the path of a file, the layout passes, redraws and frames are profiled from the start, F12 turns the profiler off and on,
+    and the recorded spans are saved to it as a Chrome trace when the shell is closed.
+    '''
+    
+    # The icons are decoded while the window is being created
+    ICON_ATLAS.get_default().prefetch()
+
+    windows_manager = ComponentWindowsManager(*args, **kwargs)
+    windows_manager.window.set_minimum_size(800, 720)
+    if profile != '':
+        windows_manager.profiler = Profiler()
+        windows_manager.profiler.install()
+
+    c_workspace = ComponentWorkspace(windows_manager)
+    __restored = False
+    if workspace != '' and os.path.isfile(workspace):
+        # A damaged file is rejected when it is decoded, before any window is created
+        try:
+            c_workspace.load(workspace)
+            __restored = True
+        except (ValueError, EOFError, ValidationError) as error:
+            warnings.warn(f"The workspace {workspace} can not be read, the default windows are used: {error}")
+    if not __restored:
+        default_workspace(windows_manager)
+
     if (b_maximize):
         windows_manager.window.maximize()
 
@@ -72,7 +103,13 @@ def window(b_maximize=True, icon='static/favicon.ico', *args, **kwargs):
         windows_manager.window.set_icon(pyglet.resource.image(icon))
 
     windows_manager.on_init()
-    windows_manager.run()
+    windows_manager.run(mode='on_demand')
+
+    if workspace != '':
+        c_workspace.save(workspace)
+    if profile != '':
+        windows_manager.profiler.uninstall()
+        windows_manager.profiler.save(profile)
 
 
 if __name__ == "__main__":
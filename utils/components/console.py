@@ -0,0 +1,175 @@
+import threading
+from typing import Iterable
+from pydantic import Field
+from pyglet.event import EVENT_HANDLED
+from pyglet.window import key
+
+from utils.components.window import ComponentWindow, ComponentWindowModel
+from utils.components.rows import ComponentRowView
+from utils.types.t_buffers import LineRingBuffer
+from utils.types.t_colors import RGB, RGBA
+from const import STYLES
+
+
+class ComponentConsoleWindowModel(ComponentWindowModel):
+    '''
+    The settings of a `ComponentConsoleWindow`, validated when the window is created.
+    '''
+    max_lines:int = 100_000
+    max_bytes:int = 16 * 1024 * 1024
+    font_name:str = Field(default_factory=lambda: STYLES.FONT_MONO.value)
+    font_size:float = Field(default_factory=lambda: STYLES.FONT_SIZE.value - 3)
+    line_height:float = 14
+    padding:float = 4
+    tab_size:int = 4
+    text_color:RGB|RGBA = Field(default_factory=STYLES.COLOR_BALANCE.value.ON_BACKGROUND.value.copy)
+    follow:bool = True
+    scroll_lines:int = 3
+    # Runtime state, not a setting of a saved workspace
+    scrollback:LineRingBuffer = Field(default=None, exclude=True)
+    rows:ComponentRowView = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class ComponentConsoleWindow(ComponentWindow):
+    '''
+    The `ComponentConsoleWindow` class is a `ComponentWindow` that shows a stream of text lines, like the output of a build or a log.
+
+    - `write()` and `write_lines()` can be called from any thread, at any rate: the lines are queued, and the queue is moved into
+        `scrollback` once per frame, when the manager redraws the window. A text without a final line break is kept until the next write.
+    - `scrollback` is a `LineRingBuffer` of the last `max_lines` lines, whose UTF-8 bytes fit in `max_bytes`.
+    - `rows`: only the visible lines are drawn, by a `ComponentRowView`. A row that stays visible when lines are added
+        or the console scrolls is only moved, a row showing a new line updates the glyphs of its cells.
+    - `follow`: the last lines are shown as they arrive. Scrolling up, with the mouse wheel, PageUp or Home, stops following,
+        scrolling back to the end, or End, follows again.
+
+    The lines are cut to the visible columns, in a monospace font, `STYLES.FONT_MONO` by default, and tabs are expanded to `tab_size` columns.
+    '''
+    MODEL:type = ComponentConsoleWindowModel
+    RESOURCES:tuple = ComponentWindow.RESOURCES + ('rows',)
+
+    def __init__(self, model:ComponentConsoleWindowModel = None, **data):
+        super().__init__(model, **data)
+        if self.scrollback is None:
+            self.__dict__['scrollback'] = LineRingBuffer(self.max_lines, self.max_bytes)
+        self.__dict__.update(_lock=threading.Lock(), _pending=[], _partial='', _top=0)
+
+    def is_dirty(self) -> bool:
+        """ The console is redrawn when lines are queued. """
+        return super().is_dirty() or bool(self._pending)
+
+    def write(self, text:str) -> None:
+        """ Queues text. Its complete lines are shown on the next frame. """
+        with self._lock:
+            __lines = (self._partial + text).split('\n')
+            self._partial = __lines.pop()
+            self._queue(__lines)
+
+    def write_lines(self, lines:Iterable[str]) -> None:
+        """ Queues lines without line breaks, after the text of the last `write()` if it did not end with one. """
+        lines = list(lines)
+        with self._lock:
+            if self._partial and lines:
+                lines[0], self._partial = self._partial + lines[0], ''
+            self._queue(lines)
+
+    def flush(self) -> None:
+        """ Queues the text of the last `write()` even if it did not end with a line break. """
+        with self._lock:
+            if self._partial:
+                __partial, self._partial = self._partial, ''
+                self._queue([__partial])
+
+    def _queue(self, lines:list) -> None:
+        ''' Adds lines to the queue, called with the lock held. The first lines queued since the last frame ask for a frame. '''
+        if not lines:
+            return
+        __wake = not self._pending
+        self._pending.extend(lines)
+        # Lines that would be dropped by the scrollback anyway are not kept while the console is not drawn
+        if len(self._pending) > self.max_lines:
+            del self._pending[:-self.max_lines]
+        if __wake:
+            self.request_frame()
+
+    def clean_line(self, line:str) -> str:
+        ''' The text of a line as it is stored: without a final carriage return and with its tabs expanded. '''
+        if line.endswith('\r'):
+            line = line[:-1]
+        return line.expandtabs(self.tab_size) if '\t' in line else line
+
+    def flush_pending(self) -> int:
+        ''' Moves the queued lines into the scrollback. Returns their number. '''
+        with self._lock:
+            __lines, self._pending = self._pending, []
+        if __lines:
+            self.scrollback.extend(map(self.clean_line, __lines))
+        return len(__lines)
+
+    def clear(self) -> None:
+        """ Drops the scrollback and the queued lines. """
+        with self._lock:
+            self._pending, self._partial = [], ''
+        self.scrollback.clear()
+        self.follow = True
+        self.invalidate()
+
+    def get_top(self, rows:int) -> int:
+        """ The number of the line shown by the first of `rows` rows. """
+        __last = max(self.scrollback.first, self.scrollback.total - rows)
+        if self.follow:
+            return __last
+        return min(max(self._top, self.scrollback.first), __last)
+
+    def scroll(self, lines:int) -> None:
+        """ Scrolls down by a number of lines, up if it is negative. The console follows the new lines if it reaches the end. """
+        __rows = self.rows.count if self.rows is not None else 0
+        __last = max(self.scrollback.first, self.scrollback.total - __rows)
+        self._top = min(max(self.get_top(__rows) + lines, self.scrollback.first), __last)
+        self.follow = self._top >= __last
+        self.invalidate()
+
+    def on_mouse_scroll(self, x:int, y:int, scroll_x:float, scroll_y:float):
+        self.scroll(-round(scroll_y * self.scroll_lines))
+        return EVENT_HANDLED
+
+    def on_key_press(self, symbol:int, modifiers:int):
+        __page = max((self.rows.count if self.rows is not None else 0) - 1, 1)
+        __lines = {key.PAGEUP: -__page, key.PAGEDOWN: __page, key.UP: -1, key.DOWN: 1,
+                   key.HOME: -self.scrollback.total, key.END: self.scrollback.total}.get(symbol)
+        if __lines is None:
+            return None
+        self.scroll(__lines)
+        return EVENT_HANDLED
+
+    def get_shapes(self) -> list:
+        return super().get_shapes() + (list(self.rows.labels) if self.rows is not None else [])
+
+    def hide_shapes(self) -> None:
+        super().hide_shapes()
+        if self.rows is not None:
+            self.rows.hide()
+
+    def update_rows(self) -> int:
+        """ Shows the visible lines of the scrollback in the rows. Returns the number of rows that changed, see `ComponentRowView.update()`. """
+        if self.rows is None:
+            self.rows = ComponentRowView()
+        self.rows.font_name, self.rows.font_size, self.rows.line_height, self.rows.padding = self.font_name, self.font_size, self.line_height, self.padding
+        __rect = self.get_content_rect()
+        __top = self.get_top(self.rows.fit(__rect)[0])
+        __first = self.scrollback.first
+        return self.rows.update(self.content_batch, self.content_group, __rect, __top, self.scrollback.total,
+                                lambda line: self.scrollback[line - __first], color=self.text_color.__repr__())
+
+    def on_redraw(self) -> None:
+        """ Moves the queued lines into the scrollback and updates the rows. The rest of the window is placed again only if it changed. """
+        __dirty = self._dirty
+        self.flush_pending()
+        if __dirty:
+            super().on_redraw()
+        if self.background is None or self._culled:
+            return
+        if self.update_rows() and self.content_surface is not None:
+            self.content_surface.invalidate()
@@ -0,0 +1,314 @@
+import bisect, os
+from pydantic import Field
+from pyglet import clock
+from pyglet.event import EVENT_HANDLED
+from pyglet.window import key
+
+from utils.components.window import ComponentWindow, ComponentWindowModel
+from utils.components.rows import ComponentRowView
+from utils.components.scanner import ComponentDirectoryScanner, FileEntry
+from utils.types.t_colors import RGB, RGBA
+from const import STYLES
+
+
+class ComponentFileManagerWindowModel(ComponentWindowModel):
+    '''
+    The settings of a `ComponentFileManagerWindow`, validated when the window is created.
+    '''
+    path:str = Field(default_factory=os.getcwd)
+    show_hidden:bool = False
+    font_name:str = Field(default_factory=lambda: STYLES.FONT_MONO.value)
+    font_size:float = Field(default_factory=lambda: STYLES.FONT_SIZE.value - 3)
+    line_height:float = 14
+    padding:float = 4
+    text_color:RGB|RGBA = Field(default_factory=STYLES.COLOR_BALANCE.value.ON_BACKGROUND.value.copy)
+    directory_color:RGB|RGBA = Field(default_factory=STYLES.COLOR_BALANCE.value.SECONDARY.value.copy)
+    selection_color:RGB|RGBA = Field(default_factory=STYLES.COLOR_BALANCE.value.PRIMARY.value.copy)
+    scroll_lines:int = 3
+    prefetch:int = 16
+    workers:int = 1
+    entries_per_frame:int = 1024
+    watch_interval:float = 0.5
+    scanner:ComponentDirectoryScanner = None
+    rows:ComponentRowView = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class ComponentFileManagerWindow(ComponentWindow):
+    '''
+    The `ComponentFileManagerWindow` class is a `ComponentWindow` that lists the directory `path`, without blocking the event loop.
+
+    - `scanner`: a `ComponentDirectoryScanner` lists the directories on its worker thread. The entries of a directory are shown
+        as they are received, at most `entries_per_frame` per frame, unsorted, then sorted when the listing is complete.
+        The first `prefetch` subdirectories are then listed in the background, so opening them is immediate.
+        The sizes of the files are read when their rows are first shown, once the listing is complete.
+    - The listings are cached: a directory opened again is shown at once. On Linux the cached directories are watched with inotify,
+        whose events are read every `watch_interval` seconds: the listing shown is refreshed when its directory changed,
+        the old one being shown until the new one is complete.
+    - `rows`: only the visible entries are drawn, by a `ComponentRowView`. The first row shows the path, the second the parent.
+
+    A click on a directory opens it, Enter opens the selected one and Backspace the parent. Up and Down move the selection,
+    the mouse wheel, PageUp, PageDown, Home and End scroll. F5 lists the directory again. Hidden files are shown if `show_hidden` is True.
+    '''
+    MODEL:type = ComponentFileManagerWindowModel
+    RESOURCES:tuple = ComponentWindow.RESOURCES + ('rows', 'scanner')
+    # The rows before the entries: the path and the parent
+    HEADER_ROWS:int = 2
+
+    def __init__(self, model:ComponentFileManagerWindowModel = None, **data):
+        super().__init__(model, **data)
+        self.__dict__['path'] = os.path.abspath(self.path)
+        self.__dict__.update(_entries=[], _stats={}, _loading=False, _refreshing=False, _listing_changed=False, _top=0, _selected=None)
+
+    def __setattr__(self, name:str, value) -> None:
+        # A new path is opened, and the entries of the path are filtered again when `show_hidden` changes
+        if name == 'path':
+            self.open(value)
+            return
+        super().__setattr__(name, value)
+        if name == 'show_hidden':
+            self.open(self.path)
+
+    def is_dirty(self) -> bool:
+        """ The window is redrawn when entries were received. """
+        return super().is_dirty() or self._listing_changed or (self.scanner is not None and self.scanner.has_results())
+
+    @property
+    def entries(self) -> list:
+        """ The entries shown, hidden files excluded unless `show_hidden` is True. """
+        return self._entries
+
+    def filter_entries(self, entries, done:bool = False) -> list:
+        """
+        The entries without the hidden ones, unless `show_hidden` is True. The hidden entries of a complete listing are found by bisection:
+        they come first among the directories and among the files, see `ComponentDirectoryScanner.get_group()`.
+        """
+        if self.show_hidden:
+            return list(entries)
+        if not done:
+            return [entry for entry in entries if not entry.name.startswith('.')]
+        __get_group = ComponentDirectoryScanner.get_group
+        __directories = bisect.bisect_left(entries, (False, True), key=__get_group)
+        __hidden_files = bisect.bisect_left(entries, (True, False), key=__get_group)
+        __files = bisect.bisect_left(entries, (True, True), key=__get_group)
+        return list(entries[__directories:__hidden_files]) + list(entries[__files:])
+
+    def open(self, path:str) -> None:
+        """ Shows a directory: at once if its listing is cached, otherwise as its entries are received. """
+        __path = os.path.abspath(path)
+        if __path != self.path and self._loading and self.scanner is not None:
+            self.scanner.cancel(self.path)
+        self.__dict__.update(path=__path, _entries=[], _stats={}, _loading=True, _refreshing=False, _top=0, _selected=None)
+        if self.rows is not None:
+            self.rows.invalidate()
+        self._listing_changed = True
+        if self.scanner is not None:
+            self.scanner.scan(__path, self.on_entries)
+        self.request_frame()
+
+    def refresh(self) -> None:
+        """ Lists the directory again. The current entries are shown until the new listing is complete. """
+        if self.scanner is None:
+            return
+        self._loading = self._refreshing = True
+        self.scanner.invalidate(self.path)
+        self.scanner.scan(self.path, self.on_entries)
+        self._listing_changed = True
+        self.request_frame()
+
+    def on_entries(self, path:str, entries, done:bool) -> None:
+        ''' Receives entries from the scanner. '''
+        if path != self.path:
+            return
+        if done:
+            self._entries = self.filter_entries(entries, True)
+            self._stats = {}
+            self._loading = self._refreshing = False
+            if self._selected is not None and self._selected >= self.get_item_count():
+                self._selected = None
+            # The directories come first
+            __subdirectories = []
+            for entry in self._entries[:self.prefetch]:
+                if not entry.is_dir:
+                    break
+                __subdirectories.append(os.path.join(path, entry.name))
+            self.scanner.prefetch(__subdirectories)
+            # The sorted listing renumbers the entries, the header shows their number
+            if self.rows is not None:
+                self.rows.invalidate()
+        elif not self._refreshing:
+            # The entries received are added after those shown
+            self._entries.extend(self.filter_entries(entries))
+        else:
+            return
+        self._listing_changed = True
+        self.request_frame()
+
+    def update_listing(self, dt:float = 0.0) -> None:
+        """ Receives the entries of the scanner, and lists the directory again if it changed. Called by the redraws and every `watch_interval` seconds. """
+        if self.scanner is None:
+            return
+        if self.path in self.scanner.poll(self.entries_per_frame) and not self._loading:
+            self.refresh()
+
+    def get_item_count(self) -> int:
+        return self.HEADER_ROWS + len(self._entries)
+
+    @staticmethod
+    def format_size(size:int) -> str:
+        for unit in ('B', 'K', 'M', 'G'):
+            if size < 1024 or unit == 'G':
+                return f'{size}{unit}' if unit == 'B' else f'{size:.1f}{unit}'
+            size /= 1024
+        return ''
+
+    def get_item_text(self, index:int) -> str:
+        """ The text of a row: the path, the parent, then a directory name or a file name with its size. """
+        if index == 0:
+            __status = 'listing' if self._loading and not self._refreshing else f'{len(self._entries)} entries'
+            return f'{self.path}  ({__status})'
+        if index == 1:
+            return '../'
+        __entry:FileEntry = self._entries[index - self.HEADER_ROWS]
+        if __entry.is_dir:
+            return __entry.name + '/'
+        if __entry.size is None:
+            if self._loading and not self._refreshing:
+                # The sizes are read once the listing is complete, the `stat` calls would wait for the GIL held by the scanner
+                return __entry.name
+            __entry = self.get_stat(__entry)
+        __size = self.format_size(__entry.size)
+        __width = max((self.rows.columns if self.rows is not None else 0) - len(__size) - 1, len(__entry.name))
+        return __entry.name.ljust(__width) + ' ' + __size
+
+    def get_stat(self, entry:FileEntry) -> FileEntry:
+        """ The entry with its size, read once per listing when its row is shown: the scanner does not read the sizes. """
+        __stat = self._stats.get(entry.name)
+        if __stat is None:
+            __stat = self._stats[entry.name] = ComponentDirectoryScanner.stat_entry(self.path, entry)
+        return __stat
+
+    def get_item_color(self, index:int) -> tuple:
+        if index == self._selected:
+            return self.selection_color.__repr__()
+        if index == 0:
+            return self.title_color.__repr__()
+        if index == 1 or self._entries[index - self.HEADER_ROWS].is_dir:
+            return self.directory_color.__repr__()
+        return self.text_color.__repr__()
+
+    def open_item(self, index:int) -> None:
+        """ Opens the parent or a directory of the list. Other entries are only selected. """
+        if index == 1:
+            self.open(os.path.dirname(self.path))
+        elif index >= self.HEADER_ROWS and self._entries[index - self.HEADER_ROWS].is_dir:
+            self.open(os.path.join(self.path, self._entries[index - self.HEADER_ROWS].name))
+        else:
+            self.select(index)
+
+    def get_top(self, rows:int) -> int:
+        return min(max(self._top, 0), max(self.get_item_count() - rows, 0))
+
+    def scroll(self, lines:int) -> None:
+        __rows = self.rows.count if self.rows is not None else 0
+        self._top = min(max(self.get_top(__rows) + lines, 0), max(self.get_item_count() - __rows, 0))
+        self.invalidate()
+
+    def select(self, index:int) -> None:
+        """ Selects a row and scrolls to it. The path is not selectable. """
+        self._selected = min(max(index, 1), self.get_item_count() - 1)
+        __rows = self.rows.count if self.rows is not None else 0
+        __top = self.get_top(__rows)
+        if self._selected < __top:
+            self._top = self._selected
+        elif self._selected >= __top + __rows:
+            self._top = self._selected - __rows + 1
+        self.invalidate()
+
+    def on_mouse_scroll(self, x:int, y:int, scroll_x:float, scroll_y:float):
+        self.scroll(-round(scroll_y * self.scroll_lines))
+        return EVENT_HANDLED
+
+    def on_mouse_press(self, x:int, y:int, button:int, modifiers:int):
+        __index = self.rows.get_item(x, y) if self.rows is not None else None
+        if __index is not None and __index > 0:
+            self.open_item(__index)
+        return EVENT_HANDLED
+
+    def on_key_press(self, symbol:int, modifiers:int):
+        __page = max((self.rows.count if self.rows is not None else 0) - 1, 1)
+        __selected = self._selected if self._selected is not None else 0
+        if symbol in (key.UP, key.DOWN):
+            self.select(__selected + (1 if symbol == key.DOWN else -1))
+        elif symbol in (key.ENTER, key.RETURN) and self._selected is not None:
+            self.open_item(self._selected)
+        elif symbol == key.BACKSPACE:
+            self.open(os.path.dirname(self.path))
+        elif symbol == key.F5:
+            self.refresh()
+        elif symbol in (key.PAGEUP, key.PAGEDOWN, key.HOME, key.END):
+            self.scroll({key.PAGEUP: -__page, key.PAGEDOWN: __page, key.HOME: -self.get_item_count(), key.END: self.get_item_count()}[symbol])
+        else:
+            return None
+        return EVENT_HANDLED
+
+    def get_shapes(self) -> list:
+        return super().get_shapes() + (list(self.rows.labels) if self.rows is not None else [])
+
+    def hide_shapes(self) -> None:
+        super().hide_shapes()
+        if self.rows is not None:
+            self.rows.hide()
+
+    def delete(self) -> None:
+        clock.unschedule(self.update_listing)
+        if self.scanner is not None:
+            self.scanner.close()
+        super().delete()
+
+    def on_release(self) -> None:
+        """ A pooled window stops watching its directory, `on_init()` starts again. """
+        clock.unschedule(self.update_listing)
+        super().on_release()
+
+    def update_rows(self) -> int:
+        """ Shows the visible entries in the rows. Returns the number of rows that changed, see `ComponentRowView.update()`. """
+        if self.rows is None:
+            self.rows = ComponentRowView()
+        self.rows.font_name, self.rows.font_size, self.rows.line_height, self.rows.padding = self.font_name, self.font_size, self.line_height, self.padding
+        __rect = self.get_content_rect()
+        __top = self.get_top(self.rows.fit(__rect)[0])
+        return self.rows.update(self.content_batch, self.content_group, __rect, __top, self.get_item_count(), self.get_item_text,
+                                get_color=self.get_item_color)
+
+    def on_redraw(self) -> None:
+        """
+        Receives the entries of the scanner and updates the rows. The rest of the window is placed again only if it changed.
+        The workers of the scanner wait meanwhile, see `ComponentDirectoryScanner.pause()`.
+        """
+        if self.scanner is None:
+            return self.redraw()
+        with self.scanner.pause():
+            self.redraw()
+
+    def redraw(self) -> None:
+        self.update_listing()
+        self._listing_changed = False
+        if self._dirty:
+            super().on_redraw()
+        if self.background is None or self._culled:
+            return
+        if self.update_rows() and self.content_surface is not None:
+            self.content_surface.invalidate()
+
+    def on_init(self) -> None:
+        """ Creates the scanner, lists the directory if it was not, and starts watching it. """
+        if self.scanner is None:
+            self.scanner = ComponentDirectoryScanner(self.workers, notify=self.request_frame)
+        super().on_init()
+        if not self._entries:
+            self.open(self.path)
+        clock.unschedule(self.update_listing)
+        clock.schedule_interval(self.update_listing, self.watch_interval)
@@ -0,0 +1,250 @@
+from bisect import insort
+from pyglet.event import EVENT_HANDLED
+
+
+class ComponentSpatialGrid:
+    '''
+    A uniform grid of rectangles, to find the topmost rectangle under a point without testing all of them.
+
+    Every item is stored in the cells its rectangle overlaps, the items of a cell sorted from the topmost down, so a point is tested
+    against the few items of its cell only and the first one that contains it is the topmost. An item whose rectangle or depth
+    did not change is not moved, so updating the grid after a layout pass touches only the cells of the items that moved.
+    Below about ten items a scan of all of them is as fast, see `benchmarks/bench_input.py` for the crossover on a given machine.
+
+    Args:
+        cell_size (float): The side of the cells. Large items cover many cells, small cells hold few items each.
+    '''
+    def __init__(self, cell_size:float = 128):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._items = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def get(self, item) -> tuple:
+        ''' The rectangle and depth of an item, `(rect, depth)`, None if it is not in the grid. '''
+        __entry = self._items.get(item)
+        return __entry[:2] if __entry is not None else None
+
+    def items(self) -> list:
+        ''' The items of the grid, in the order they were added. '''
+        return list(self._items)
+
+    def get_cells(self, rect:tuple) -> list:
+        ''' The keys of the cells overlapped by a rectangle `(x0, y0, x1, y1)`. '''
+        __size = self.cell_size
+        x0, y0, x1, y1 = int(rect[0] // __size), int(rect[1] // __size), int((rect[2] - 1e-9) // __size), int((rect[3] - 1e-9) // __size)
+        return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+    def insert(self, item, rect:tuple, depth:int) -> None:
+        ''' Adds an item with its rectangle `(x0, y0, x1, y1)`. A higher `depth` is above a lower one. Empty rectangles are not stored. '''
+        if rect[2] <= rect[0] or rect[3] <= rect[1]:
+            self._items[item] = (rect, depth, ())
+            return
+        __cells = self.get_cells(rect)
+        __entry = (-depth, id(item), item, rect)
+        for key in __cells:
+            insort(self._cells.setdefault(key, []), __entry, key=lambda entry: entry[:2])
+        self._items[item] = (rect, depth, __cells)
+
+    def remove(self, item) -> None:
+        __rect, __depth, __cells = self._items.pop(item)
+        for key in __cells:
+            __cell = self._cells[key]
+            __cell[:] = [entry for entry in __cell if entry[2] is not item]
+            if not __cell:
+                del self._cells[key]
+
+    def update(self, item, rect:tuple, depth:int) -> bool:
+        ''' Moves an item to a new rectangle or depth, or adds it. Returns False if nothing changed. '''
+        __previous = self._items.get(item)
+        if __previous is not None:
+            if __previous[0] == rect and __previous[1] == depth:
+                return False
+            self.remove(item)
+        self.insert(item, rect, depth)
+        return True
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._items.clear()
+
+    def build(self, items:list) -> None:
+        ''' Replaces the items of the grid with `(item, rect, depth)` tuples, each cell sorted once. '''
+        self.clear()
+        for item, rect, depth in items:
+            if rect[2] <= rect[0] or rect[3] <= rect[1]:
+                self._items[item] = (rect, depth, ())
+                continue
+            __cells = self.get_cells(rect)
+            __entry = (-depth, id(item), item, rect)
+            for key in __cells:
+                self._cells.setdefault(key, []).append(__entry)
+            self._items[item] = (rect, depth, __cells)
+        for cell in self._cells.values():
+            cell.sort(key=lambda entry: entry[:2])
+
+    def hit(self, x:float, y:float, accept = None):
+        ''' The topmost item whose rectangle contains the point, and for which `accept(item)` is True if given. None if there is none. '''
+        __cell = self._cells.get((int(x // self.cell_size), int(y // self.cell_size)))
+        if __cell is None:
+            return None
+        for _, _, item, (x0, y0, x1, y1) in __cell:
+            if x0 <= x < x1 and y0 <= y < y1 and (accept is None or accept(item)):
+                return item
+        return None
+
+
+class ComponentInputDispatcher:
+    '''
+    Routes the mouse and keyboard events of the pyglet window of a `ComponentWindowsManager` to its windows.
+
+    - `on_mouse_motion`, `on_mouse_press` and `on_mouse_scroll` go to the topmost shown window under the pointer,
+        found in a `ComponentSpatialGrid` of the window rectangles. The hovered window receives `on_mouse_enter` and `on_mouse_leave`.
+    - `on_mouse_drag` and `on_mouse_release` go to the window that received the press, even if the pointer left it.
+    - `on_key_press`, `on_key_release` and `on_text` go to the focused window, the last one pressed.
+
+    A window handles an event with a method of the same name, as a pyglet event handler. If it has none, or the method does not
+    return `EVENT_HANDLED`, the event goes up to its parent, up to the manager which is not called.
+    Windows are stacked like they are drawn: the children of a window above it, the later children above the earlier ones.
+
+    The manager calls `invalidate()` after every layout pass and the grid is updated by the next hit test, so the bursts of layout
+    passes of a resize do not update it. Only the windows whose rectangle changed, that were added or removed are moved in the grid,
+    unless most of them moved: the grid is then built again.
+
+    Args:
+        manager (ComponentWindowsManager): The manager whose windows receive the events.
+        cell_size (float): The cell side of the grid.
+    '''
+    def __init__(self, manager, cell_size:float = 128):
+        self.manager = manager
+        self.grid = ComponentSpatialGrid(cell_size)
+        self.hovered = None
+        self.focused = None
+        self.captured = None
+        self.updates = 0
+        self._dirty = True
+
+    def get_windows(self) -> list:
+        ''' The windows of the manager from the bottom to the top. '''
+        __windows, __stack = [], list(reversed([child['window'] for child in self.manager.children.values()]))
+        while __stack:
+            __window = __stack.pop()
+            __windows.append(__window)
+            __stack.extend(reversed([child['window'] for child in __window.children.values()]))
+        return __windows
+
+    def invalidate(self) -> None:
+        ''' The windows may have moved, the grid is updated before the next hit test. '''
+        self._dirty = True
+
+    def refresh(self) -> None:
+        ''' Updates the grid if it was invalidated. '''
+        if self._dirty:
+            self.update()
+
+    def update(self) -> int:
+        ''' Moves the windows whose rectangle or depth changed in the grid, adds the new ones and removes the others. Returns the number of moves. '''
+        self._dirty = False
+        self.updates += 1
+        __windows = self.get_windows()
+        __items = [(window, (window.position.x, window.position.y, window.position.x + window.size.x, window.position.y + window.size.y), depth)
+                   for depth, window in enumerate(__windows)]
+        __changed = [item for item in __items if self.grid.get(item[0]) != item[1:]]
+        if len(__changed) > len(__items) // 2:
+            self.grid.build(__items)
+            self.forget(set(__windows))
+            return len(__changed)
+
+        __moved = 0
+        for window, rect, depth in __changed:
+            __moved += self.grid.update(window, rect, depth)
+        if len(self.grid) > len(__windows):
+            __present = set(__windows)
+            for window in [item for item in self.grid.items() if item not in __present]:
+                self.grid.remove(window)
+                __moved += 1
+            self.forget(__present)
+        return __moved
+
+    def forget(self, windows:set) -> None:
+        ''' Drops the hovered, focused and captured windows that are no longer in `windows`. '''
+        for name in ('hovered', 'focused', 'captured'):
+            if getattr(self, name) is not None and getattr(self, name) not in windows:
+                setattr(self, name, None)
+
+    def hit(self, x:float, y:float):
+        ''' The topmost shown window under the point, None if the point is over the manager only. '''
+        self.refresh()
+        return self.grid.hit(x, y, self.is_shown)
+
+    @staticmethod
+    def is_shown(window) -> bool:
+        return getattr(window, 'visible', True) and not getattr(window, '_culled', False)
+
+    def dispatch(self, window, event:str, *args) -> bool:
+        ''' Calls the handler of the event of the window, then of its parents until one handles it. Returns True if it was handled. '''
+        while window is not None and window is not self.manager:
+            __handler = getattr(window, event, None)
+            if __handler is not None and __handler(*args) == EVENT_HANDLED:
+                return True
+            window = window.parent if window.parent is not window else None
+        return False
+
+    def set_hovered(self, window, x:float, y:float) -> None:
+        if window is self.hovered:
+            return
+        if self.hovered is not None:
+            __handler = getattr(self.hovered, 'on_mouse_leave', None)
+            if __handler is not None:
+                __handler(x, y)
+        self.hovered = window
+        if window is not None:
+            __handler = getattr(window, 'on_mouse_enter', None)
+            if __handler is not None:
+                __handler(x, y)
+
+    # The handlers pushed on the pyglet window. They do not return EVENT_HANDLED, so the other handlers of the manager still run.
+
+    def on_mouse_motion(self, x:int, y:int, dx:int, dy:int) -> None:
+        __window = self.hit(x, y)
+        self.set_hovered(__window, x, y)
+        self.dispatch(__window, 'on_mouse_motion', x, y, dx, dy)
+
+    def on_mouse_press(self, x:int, y:int, button:int, modifiers:int) -> None:
+        __window = self.hit(x, y)
+        self.set_hovered(__window, x, y)
+        self.captured = self.focused = __window
+        self.dispatch(__window, 'on_mouse_press', x, y, button, modifiers)
+
+    def on_mouse_drag(self, x:int, y:int, dx:int, dy:int, buttons:int, modifiers:int) -> None:
+        self.refresh()
+        self.dispatch(self.captured if self.captured is not None else self.hit(x, y), 'on_mouse_drag', x, y, dx, dy, buttons, modifiers)
+
+    def on_mouse_release(self, x:int, y:int, button:int, modifiers:int) -> None:
+        self.refresh()
+        __window, self.captured = (self.captured if self.captured is not None else self.hit(x, y)), None
+        self.dispatch(__window, 'on_mouse_release', x, y, button, modifiers)
+        self.set_hovered(self.hit(x, y), x, y)
+
+    def on_mouse_scroll(self, x:int, y:int, scroll_x:float, scroll_y:float) -> None:
+        self.dispatch(self.hit(x, y), 'on_mouse_scroll', x, y, scroll_x, scroll_y)
+
+    def on_mouse_leave(self, x:int, y:int) -> None:
+        self.set_hovered(None, x, y)
+
+    def on_key_press(self, symbol:int, modifiers:int) -> None:
+        self.refresh()
+        self.dispatch(self.focused, 'on_key_press', symbol, modifiers)
+
+    def on_key_release(self, symbol:int, modifiers:int) -> None:
+        self.refresh()
+        self.dispatch(self.focused, 'on_key_release', symbol, modifiers)
+
+    def on_text(self, text:str) -> None:
+        self.refresh()
+        self.dispatch(self.focused, 'on_text', text)
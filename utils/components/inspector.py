@@ -0,0 +1,451 @@
+from collections import deque
+from enum import Enum
+from typing import Any
+from pydantic import BaseModel, Field
+from pyglet import clock
+from pyglet.event import EVENT_HANDLED
+from pyglet.window import key
+
+from utils.components.window import ComponentWindow, ComponentWindowModel, ComponentWindowsManager
+from utils.components.rows import ComponentRowView
+from utils.types.t_colors import RGB, RGBA
+from const import STYLES
+
+
+class InspectorNode:
+    '''
+    A row of a `ComponentInspectorWindow`: a field of the value of its `parent`, an attribute or an item depending on `is_item`.
+
+    The fields of a value are reflected when its node is first expanded, and a value is read only while its row is visible:
+    `value` and `signature` are those of the last read, `frame` the check that read them, see `ComponentInspectorWindow.update_values()`.
+    '''
+    __slots__ = ('parent', 'key', 'is_item', 'depth', 'expanded', 'children', 'value', 'signature', 'frame', 'text')
+    # Values shown as they are, without fields
+    ATOMS:tuple = (type(None), bool, int, float, complex, str, bytes, Enum)
+    CONTAINERS:tuple = (dict, list, tuple, deque)
+    # Objects with at most this many atom fields, such as `VEC2` or `RGB`, show the fields on their row
+    INLINE_FIELDS:int = 4
+    # The signature of a node whose value was never read
+    UNREAD:object = object()
+    _slots:dict = {}
+
+    def __init__(self, parent:'InspectorNode' = None, key:Any = None, is_item:bool = False, value:Any = None):
+        self.parent = parent
+        self.key = key
+        self.is_item = is_item
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.expanded = False
+        self.children = None
+        self.value = value
+        self.signature = self.UNREAD
+        self.frame = -1
+        self.text = None
+
+    @classmethod
+    def get_slots(cls, value_type:type) -> tuple:
+        """ The public slots of a class and of its bases, cached by class. """
+        __slots = cls._slots.get(value_type)
+        if __slots is None:
+            __slots = []
+            for base in reversed(value_type.__mro__):
+                __names = getattr(base, '__slots__', ())
+                __slots.extend(name for name in ((__names,) if isinstance(__names, str) else __names)
+                               if not name.startswith('_') and name not in __slots)
+            __slots = cls._slots[value_type] = tuple(__slots)
+        return __slots
+
+    @classmethod
+    def get_keys(cls, value:Any) -> list:
+        """
+        The fields of a value, `(key, is_item)` pairs: the items of a container, the fields of the `MODEL` of a window or of a pydantic model,
+        the slots of a slotted object such as `VEC2`, or else the public attributes of its `__dict__`.
+        """
+        if isinstance(value, cls.ATOMS):
+            return []
+        if isinstance(value, dict):
+            return [(key, True) for key in value]
+        if isinstance(value, cls.CONTAINERS):
+            return [(index, True) for index in range(len(value))]
+        __model = getattr(type(value), 'MODEL', None)
+        if isinstance(__model, type) and issubclass(__model, BaseModel):
+            return [(name, False) for name in __model.model_fields]
+        if isinstance(value, BaseModel):
+            return [(name, False) for name in type(value).model_fields]
+        __slots = cls.get_slots(type(value))
+        if __slots:
+            return [(slot, False) for slot in __slots]
+        return [(name, False) for name in getattr(value, '__dict__', {}) if not name.startswith('_')]
+
+    @classmethod
+    def get_inline_fields(cls, value:Any) -> list:
+        """ The names of the fields shown on the row of a small object, None if the object is not small or if a field is not an atom. """
+        __names = cls.get_slots(type(value)) or getattr(value, '__dict__', None)
+        if not __names or len(__names) > cls.INLINE_FIELDS:
+            return None
+        __names = list(__names)
+        if not all(isinstance(getattr(value, name, None), cls.ATOMS) for name in __names):
+            return None
+        return __names
+
+    @classmethod
+    def get_signature(cls, value:Any) -> Any:
+        """
+        What the row of a value shows, cheap to compare with the last one: the value itself for an atom, its identity and length for a container,
+        its identity and field values for a small object, its identity otherwise. The fields of a large object are rows of their own.
+        """
+        if isinstance(value, cls.ATOMS):
+            return value
+        if isinstance(value, cls.CONTAINERS):
+            return (id(value), len(value))
+        __fields = cls.get_inline_fields(value)
+        if __fields is not None:
+            return (id(value),) + tuple(getattr(value, name) for name in __fields)
+        return (id(value),)
+
+    @classmethod
+    def is_expandable(cls, value:Any) -> bool:
+        if isinstance(value, cls.ATOMS):
+            return False
+        if isinstance(value, cls.CONTAINERS):
+            return len(value) > 0
+        return bool(getattr(value, '__dict__', None)) or bool(cls.get_slots(type(value)))
+
+    @classmethod
+    def format_value(cls, value:Any, max_length:int = 256) -> str:
+        """ The text of a value: the repr of an atom, the type and length of a container, the type and fields of a small object, the type and name of a window. """
+        try:
+            if isinstance(value, str):
+                return repr(value[:max_length])
+            if isinstance(value, cls.ATOMS):
+                return repr(value)[:max_length]
+        except Exception:
+            pass
+        __type = type(value).__name__
+        if isinstance(value, cls.CONTAINERS):
+            return f'{__type}[{len(value)}]'
+        __fields = cls.get_inline_fields(value)
+        if __fields is not None:
+            return f"{__type}({', '.join(f'{name}={getattr(value, name)!r}' for name in __fields)})"
+        __name = getattr(value, 'name', None) if not isinstance(value, type) else value.__name__
+        return f'{__type} {__name!r}' if isinstance(__name, str) else __type
+
+    def get_label(self) -> str:
+        if self.parent is None:
+            return ''
+        return f'[{self.key!r}]' if self.is_item else str(self.key)
+
+    def read(self, frame:int) -> Any:
+        """ Reads the value of the node through its parents, once per check `frame`. A field that cannot be read is the exception raised. """
+        if self.frame == frame or self.parent is None:
+            return self.value
+        __parent = self.parent.read(frame)
+        try:
+            self.value = __parent[self.key] if self.is_item else getattr(__parent, self.key)
+        except Exception as exception:
+            self.value = exception
+        self.frame = frame
+        return self.value
+
+    def expand(self) -> list:
+        """ Reflects the fields of the value if they were not, and returns the nodes shown below it: its children and theirs if they are expanded. """
+        if self.children is None:
+            self.children = [InspectorNode(self, key, is_item) for key, is_item in self.get_keys(self.value)]
+        self.expanded = True
+        __nodes = []
+        for child in self.children:
+            __nodes.append(child)
+            if child.expanded:
+                __nodes.extend(child.expand())
+        return __nodes
+
+
+class ComponentInspectorWindowModel(ComponentWindowModel):
+    '''
+    The settings of a `ComponentInspectorWindow`, validated when the window is created.
+    '''
+    # Runtime state, not a setting of a saved workspace
+    target:Any = Field(default=None, exclude=True)
+    font_name:str = Field(default_factory=lambda: STYLES.FONT_MONO.value)
+    font_size:float = Field(default_factory=lambda: STYLES.FONT_SIZE.value - 3)
+    line_height:float = 14
+    padding:float = 4
+    indent:int = 2
+    max_length:int = 256
+    text_color:RGB|RGBA = Field(default_factory=STYLES.COLOR_BALANCE.value.ON_BACKGROUND.value.copy)
+    node_color:RGB|RGBA = Field(default_factory=STYLES.COLOR_BALANCE.value.SECONDARY.value.copy)
+    selection_color:RGB|RGBA = Field(default_factory=STYLES.COLOR_BALANCE.value.PRIMARY.value.copy)
+    scroll_lines:int = 3
+    update_interval:float = 0.25
+    rows:ComponentRowView = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class ComponentInspectorWindow(ComponentWindow):
+    '''
+    The `ComponentInspectorWindow` class is a `ComponentWindow` that shows the fields of `target` as a tree, the manager of the window by default.
+
+    - The fields of a value are reflected when its node is expanded, see `InspectorNode.get_keys()`: the fields of the `MODEL` of a window,
+        of a pydantic model, the items of a container or the slots of a `VEC2`. Collapsing a node keeps its children, expanding it again is immediate.
+    - `rows`: only the visible rows are drawn, by a `ComponentRowView`, and only their values are read.
+    - Every frame, `is_dirty()` compares the values of the visible rows with those of the last frame by their signature
+        (see `InspectorNode.get_signature()`), and only the rows whose value changed are formatted again. The cost of a frame depends
+        on the visible rows, not on the size of the tree. When the manager only draws the frames asked for, the values are also
+        checked every `update_interval` seconds, which asks for a frame if one changed.
+
+    A click on a row selects it and expands or collapses it. Up and Down move the selection, Right expands the selected row,
+    Left collapses it or selects its parent, Enter toggles it. The mouse wheel, PageUp, PageDown, Home and End scroll.
+    '''
+    MODEL:type = ComponentInspectorWindowModel
+    RESOURCES:tuple = ComponentWindow.RESOURCES + ('rows',)
+
+    def __init__(self, model:ComponentInspectorWindowModel = None, **data):
+        super().__init__(model, **data)
+        # `_visible`: the nodes of the rows in order, `_changed`: the rows whose value changed since the last redraw
+        self.__dict__.update(_root=None, _visible=[], _changed=set(), _structure_changed=False, _frame=0, _top=0, _selected=None)
+        if self.target is not None:
+            self.inspect(self.target)
+
+    def __setattr__(self, name:str, value) -> None:
+        super().__setattr__(name, value)
+        if name == 'target':
+            self.inspect(value)
+
+    def is_dirty(self) -> bool:
+        """ The window is redrawn when the value of a visible row changed. """
+        return super().is_dirty() or self.update_values() or self._structure_changed
+
+    def inspect(self, target:Any) -> None:
+        """ Shows a new tree, of the fields of `target`, the root expanded. """
+        self.__dict__.update(target=target, _root=InspectorNode(value=target), _top=0, _selected=None)
+        self._visible = [self._root] + self._root.expand()
+        self.set_structure_changed()
+
+    def set_structure_changed(self) -> None:
+        ''' The rows were renumbered. '''
+        self._structure_changed = True
+        if self.rows is not None:
+            self.rows.invalidate()
+        self.request_frame()
+
+    def get_item_count(self) -> int:
+        return len(self._visible)
+
+    def get_visible_nodes(self) -> range:
+        """ The numbers of the visible rows. """
+        __rows = self.rows.count if self.rows is not None else 0
+        __top = self.get_top(__rows)
+        return range(__top, min(__top + __rows, len(self._visible)))
+
+    def update_values(self) -> bool:
+        """
+        Reads the values of the visible rows and compares their signatures with the last ones. The rows whose value changed
+        are formatted again on the next redraw. An expanded node whose value was replaced or resized reflects its fields again.
+        Returns True if a row changed since the last redraw.
+        """
+        if self._root is None:
+            return False
+        self._frame += 1
+        for index in self.get_visible_nodes():
+            __node = self._visible[index]
+            __signature = self.read_signature(__node)
+            try:
+                if __signature == __node.signature:
+                    continue
+            except Exception:
+                pass
+            __read = __node.signature is not InspectorNode.UNREAD
+            __node.signature, __node.text = __signature, None
+            self._changed.add(index)
+            if __read and __node.expanded:
+                # The rows below are renumbered, they are checked on the next frame
+                self.collapse(index)
+                __node.children = None
+                self.expand(index)
+                break
+        return bool(self._changed)
+
+    def read_signature(self, node:InspectorNode) -> Any:
+        ''' Reads the value of a node in the current check, and returns its signature. '''
+        try:
+            __value = node.read(self._frame)
+            # A field that cannot be read raises a new exception every time
+            return type(__value) if isinstance(__value, Exception) else InspectorNode.get_signature(__value)
+        except Exception as exception:
+            return type(exception)
+
+    def watch_values(self, dt:float = 0.0) -> None:
+        """ Asks for a frame if a visible value changed, called every `update_interval` seconds. """
+        if self.update_values():
+            self.request_frame()
+
+    def get_item_text(self, index:int) -> str:
+        """ The text of a row: its indent, a marker if it can be expanded, its field and the value, formatted when it changed. """
+        __node = self._visible[index]
+        if __node.text is None:
+            if __node.signature is InspectorNode.UNREAD:
+                __node.signature = self.read_signature(__node)
+            __value = __node.value
+            if isinstance(__value, Exception):
+                __text = f'<{type(__value).__name__}>'
+            else:
+                __text = InspectorNode.format_value(__value, self.max_length)
+            __marker = ('▾ ' if __node.expanded else '▸ ') if InspectorNode.is_expandable(__value) else '  '
+            __label = __node.get_label()
+            __node.text = ' ' * (self.indent * __node.depth) + __marker + (f'{__label}: ' if __label else '') + __text
+        return __node.text
+
+    def get_item_color(self, index:int) -> tuple:
+        if index == self._selected:
+            return self.selection_color.__repr__()
+        if self._visible[index].expanded:
+            return self.node_color.__repr__()
+        return self.text_color.__repr__()
+
+    def expand(self, index:int) -> None:
+        """ Expands a row, reflecting its fields the first time. """
+        __node = self._visible[index]
+        if __node.expanded or not InspectorNode.is_expandable(__node.read(self._frame)):
+            return
+        __nodes = __node.expand()
+        self._visible[index + 1:index + 1] = __nodes
+        if self._selected is not None and self._selected > index:
+            self._selected += len(__nodes)
+        __node.text = None
+        self.set_structure_changed()
+
+    def collapse(self, index:int) -> None:
+        """ Collapses a row. Its children are kept, with the rows they expanded. """
+        __node = self._visible[index]
+        if not __node.expanded:
+            return
+        __end = index + 1
+        while __end < len(self._visible) and self._visible[__end].depth > __node.depth:
+            __end += 1
+        del self._visible[index + 1:__end]
+        __node.expanded = False
+        if self._selected is not None and self._selected > index:
+            self._selected = index if self._selected < __end else self._selected - (__end - index - 1)
+        __node.text = None
+        self.set_structure_changed()
+
+    def toggle(self, index:int) -> None:
+        if self._visible[index].expanded:
+            self.collapse(index)
+        else:
+            self.expand(index)
+
+    def get_parent_index(self, index:int) -> int:
+        __depth = self._visible[index].depth
+        while index > 0 and self._visible[index].depth >= __depth:
+            index -= 1
+        return index
+
+    def get_top(self, rows:int) -> int:
+        return min(max(self._top, 0), max(len(self._visible) - rows, 0))
+
+    def scroll(self, lines:int) -> None:
+        __rows = self.rows.count if self.rows is not None else 0
+        self._top = min(max(self.get_top(__rows) + lines, 0), max(len(self._visible) - __rows, 0))
+        self.invalidate()
+
+    def select(self, index:int) -> None:
+        """ Selects a row and scrolls to it. """
+        if not self._visible:
+            return
+        self._selected = min(max(index, 0), len(self._visible) - 1)
+        __rows = self.rows.count if self.rows is not None else 0
+        __top = self.get_top(__rows)
+        if self._selected < __top:
+            self._top = self._selected
+        elif self._selected >= __top + __rows:
+            self._top = self._selected - __rows + 1
+        self.invalidate()
+
+    def on_mouse_scroll(self, x:int, y:int, scroll_x:float, scroll_y:float):
+        self.scroll(-round(scroll_y * self.scroll_lines))
+        return EVENT_HANDLED
+
+    def on_mouse_press(self, x:int, y:int, button:int, modifiers:int):
+        __index = self.rows.get_item(x, y) if self.rows is not None else None
+        if __index is not None:
+            self.select(__index)
+            self.toggle(__index)
+        return EVENT_HANDLED
+
+    def on_key_press(self, symbol:int, modifiers:int):
+        __page = max((self.rows.count if self.rows is not None else 0) - 1, 1)
+        __selected = self._selected if self._selected is not None else 0
+        if not self._visible:
+            return None
+        if symbol in (key.UP, key.DOWN):
+            self.select(__selected + (1 if symbol == key.DOWN else -1))
+        elif symbol == key.RIGHT:
+            if self._visible[__selected].expanded:
+                self.select(__selected + 1)
+            else:
+                self.expand(__selected)
+        elif symbol == key.LEFT:
+            if self._visible[__selected].expanded:
+                self.collapse(__selected)
+            else:
+                self.select(self.get_parent_index(__selected))
+        elif symbol in (key.ENTER, key.RETURN, key.SPACE):
+            self.toggle(__selected)
+        elif symbol in (key.PAGEUP, key.PAGEDOWN, key.HOME, key.END):
+            self.scroll({key.PAGEUP: -__page, key.PAGEDOWN: __page, key.HOME: -len(self._visible), key.END: len(self._visible)}[symbol])
+        else:
+            return None
+        return EVENT_HANDLED
+
+    def get_shapes(self) -> list:
+        return super().get_shapes() + (list(self.rows.labels) if self.rows is not None else [])
+
+    def hide_shapes(self) -> None:
+        super().hide_shapes()
+        if self.rows is not None:
+            self.rows.hide()
+
+    def delete(self) -> None:
+        clock.unschedule(self.watch_values)
+        super().delete()
+
+    def on_release(self) -> None:
+        """ A pooled window stops checking its values, `on_init()` starts again. """
+        clock.unschedule(self.watch_values)
+        super().on_release()
+
+    def update_rows(self) -> int:
+        """ Shows the visible nodes in the rows. Returns the number of rows that changed, see `ComponentRowView.update()`. """
+        if self.rows is None:
+            self.rows = ComponentRowView()
+        self.rows.font_name, self.rows.font_size, self.rows.line_height, self.rows.padding = self.font_name, self.font_size, self.line_height, self.padding
+        __rect = self.get_content_rect()
+        __top = self.get_top(self.rows.fit(__rect)[0])
+        if self._changed:
+            self.rows.invalidate_items(self._changed)
+        __changed = self.rows.update(self.content_batch, self.content_group, __rect, __top, len(self._visible), self.get_item_text,
+                                     get_color=self.get_item_color)
+        self._changed.clear()
+        self._structure_changed = False
+        return __changed
+
+    def on_redraw(self) -> None:
+        """ Updates the rows whose value changed. The rest of the window is placed again only if it changed. """
+        __dirty = self._dirty
+        if __dirty:
+            super().on_redraw()
+        if self.background is None or self._culled:
+            return
+        if self.update_rows() and self.content_surface is not None:
+            self.content_surface.invalidate()
+
+    def on_init(self) -> None:
+        """ Inspects the manager if there is no `target`, and starts checking the values. """
+        super().on_init()
+        if self._root is None:
+            __manager = self.get_manager()
+            self.inspect(__manager if isinstance(__manager, ComponentWindowsManager) else self)
+        clock.unschedule(self.watch_values)
+        clock.schedule_interval(self.watch_values, self.update_interval)
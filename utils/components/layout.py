@@ -1,4 +1,5 @@
 from classes.windows.c_layout import Layout
+from utils.components.solver import Solver, Variable, Expression, Constraint, Strength
 from utils.types.t_vectors import VEC2, SVEC2, GRID4
 
 class ComponentHorizontalStack(Layout):
@@ -40,6 +41,10 @@ class ComponentHorizontalStack(Layout):
                 self.position = VEC2(0, 0)
                 self.size = manager.size
 
+            # Skip the pass if nothing this layout depends on has changed
+            if not self.begin_layout():
+                return
+
             self.max_size = self.get_max_size()
             __len_children = len(self.children)
 
@@ -78,6 +83,8 @@ class ComponentHorizontalStack(Layout):
                 __current_x += __child_width
                 __current_x += self._margin.x
 
+            self.end_layout()
+
 
 class ComponentVerticalStack(Layout):
     '''
@@ -118,6 +125,10 @@ class ComponentVerticalStack(Layout):
                 self.position = VEC2(0, 0)
                 self.size = manager.size
 
+            # Skip the pass if nothing this layout depends on has changed
+            if not self.begin_layout():
+                return
+
             self.max_size = self.get_max_size()
             __len_children = len(self.children)
 
@@ -155,6 +166,8 @@ class ComponentVerticalStack(Layout):
                     
                 __current_y -= self._margin.y
 
+            self.end_layout()
+
 
 class ComponentBorderStack(Layout):
     '''
@@ -181,11 +194,12 @@ class ComponentBorderStack(Layout):
         self._north.parent = self
         self._center.parent = self
         self._south.parent = self
-        self._west.parent = self.center
-        self._east.parent = self.center
+        self._west.parent = self
+        self._east.parent = self
         self._grid = grid
         self._bevel = bevel
         self._margin = margin
+        self._regions_ready = False
 
     @property
     def grid(self) -> GRID4:
@@ -194,6 +208,7 @@ class ComponentBorderStack(Layout):
     @grid.setter
     def grid(self, grid:GRID4):
         self._grid = grid
+        self.invalidate()
                 
     @property
     def north(self) -> ComponentVerticalStack:
@@ -223,6 +238,24 @@ class ComponentBorderStack(Layout):
         self._max_size = self.size
         return SVEC2(self.max_size.x, self.max_size.y)
 
+    def get_region(self, anchor:str) -> ComponentVerticalStack:
+        ''' The region of an anchor, None for an unknown anchor. '''
+        return {'north': self.north, 'center': self.center, 'west': self.west, 'east': self.east, 'south': self.south}.get(anchor)
+
+    def add(self, element) -> None:
+        ''' Adds the element to the border and, once `on_init()` has filled the regions, to the region of its anchor. '''
+        super().add(element)
+        __region = self.get_region(getattr(element, 'anchor', None)) if self._regions_ready else None
+        if __region is not None:
+            __region.add(element)
+
+    def remove(self, element) -> None:
+        ''' Removes the element from the border and from its region. '''
+        super().remove(element)
+        for region in (self.north, self.center, self.south, self.west, self.east):
+            if element in region.children:
+                region.remove(element)
+
     def on_init(self) -> None: 
 
         for child in self.children:
@@ -237,6 +270,7 @@ class ComponentBorderStack(Layout):
                     self.east.add(child)
                 case 'south':
                     self.south.add(child)
+        self._regions_ready = True
 
 
     def do_layout(self) -> None:
@@ -245,6 +279,10 @@ class ComponentBorderStack(Layout):
             self.position = VEC2(0, 0)
             self.size = manager.size
 
+        # Skip the pass if neither the border nor any of its regions has changed
+        if not self.begin_layout():
+            return
+
         # Calculate grid sizes for each region
         __grid_size = GRID4(
             max(self.west.get_min_size().x, self.grid.west) if len(self.west.children) > 0 else self._bevel.x,
@@ -290,10 +328,228 @@ class ComponentBorderStack(Layout):
             self.center.position = VEC2(self.position.x + __grid_size.west, self.position.y + __grid_size.south)
             self.center.size = SVEC2(__total_horizontal_space, __total_vertical_space - (self._bevel.y * 2 if len(self.north.children) > 0 else 0))
 
-        # Layout all regions
+        # Layout all regions, regions whose rectangle did not change are skipped
         self.north.do_layout()
         self.center.do_layout()
         self.south.do_layout()
         self.west.do_layout()
         self.east.do_layout()
 
+        self.end_layout()
+
+
+
+class _ConstraintItem:
+    ''' The variables, settings and constraints of a child of a `ComponentConstraintStack`. '''
+    __slots__ = ('length', 'low', 'cut', 'weight', 'priority', 'min', 'max', 'constraints')
+
+    def __init__(self, weight:float, priority:float):
+        self.length = Variable('length')
+        self.low = Variable('low')
+        self.cut = Variable('cut')
+        self.weight = weight
+        self.priority = priority
+        self.min = None
+        self.max = None
+        self.constraints = {}
+
+
+class ComponentConstraintStack(Layout):
+    '''
+        The `ComponentConstraintStack` class arranges child components in a horizontal or vertical stack, like `ComponentHorizontalStack` 
+        and `ComponentVerticalStack`, with the lengths of the children along the stack found by a constraint `Solver`.
+
+        - Every child gets at least its `min_size` and at most its `max_size`, if it is set. The free space is shared by the children
+          in proportion to their weights: a child of weight 2 gets twice the extra length of a child of weight 1, a child of weight 0 keeps its minimum.
+          Space a child can not take because of its `max_size` goes to the other children.
+        - If the stack is too small for the minimum sizes, the children of the lowest priority are shrunk first, all by the same length.
+          The children always stay inside the stack.
+        - The constraints are kept in the solver between layout passes. The length of the stack and the minimum lengths of the children
+          are edit variables of the solver: a resize or a new `min_size` only suggests a new value, and the solver repairs its current solution.
+          A new `max_size`, weight or priority replaces the constraint of that child only. The system is never solved again from scratch.
+
+        Args:
+            orientation (str, optional): `horizontal` places the children from the left, `vertical` from the top. Defaults to `horizontal`.
+            bevel (VEC2, optional): The bevel size for the layout. Defaults to VEC2(15, 15).
+            margin (VEC2, optional): The margin size for the layout. Defaults to VEC2(25, 25).
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+    '''
+    # The length of the stack and the minimum lengths of the children are facts the layout follows, stronger than any priority
+    EDIT_STRENGTH:float = Strength.create(1000, 0, 0)
+
+    def __init__(self, orientation:str = 'horizontal', bevel:VEC2 = VEC2(15,15), margin:VEC2 = VEC2(25,25), *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if orientation not in ('horizontal', 'vertical'):
+            raise ValueError(f"Unknown orientation: {orientation}")
+        self._orientation:str = orientation
+        self._bevel:VEC2 = bevel
+        self._margin:VEC2 = margin
+        self.reset()
+
+    @property
+    def orientation(self) -> str:
+        return self._orientation
+
+    @property
+    def solver(self) -> Solver:
+        return self._solver
+
+    def reset(self) -> None:
+        """ Creates a new solver with the constraints of the current children. """
+        self._solver = Solver()
+        self._items = {}
+        self._order = []
+        self._tail = []
+        self._tail_count = 0
+        self._extent = Variable('extent')
+        self._share = Variable('share')
+        self._shrink = Variable('shrink')
+        self._solver.add_edit_variable(self._extent, self.EDIT_STRENGTH)
+        # The free length per unit of weight and the length the children lose when the stack is too small, both as small as possible
+        for variable in (self._share, self._shrink):
+            self._solver.add_constraint(variable.ge(0))
+            self._solver.add_constraint(variable.eq(0, Strength.WEAK))
+        for child in self.children:
+            self._append(child, 1.0, Strength.STRONG)
+
+    def on_init(self) -> None: ...
+
+    def get_min_size(self) -> SVEC2:
+        return self.min_size
+
+    def get_max_size(self) -> SVEC2:
+        # The inner size is not stored in `max_size`, a parent layout would take it for a limit of this one
+        return self.size - SVEC2(self._bevel.x*2, self._bevel.y*2)
+
+    def add(self, element, weight:float = 1.0, priority:float = Strength.STRONG) -> None:
+        '''
+        Adds the element at the end of the stack.
+
+        Parameters:
+            element (Any): The element to add as a child of this layout.
+            weight (float): The share of the free space the element gets, relative to the weights of the other children.
+            priority (float): The strength of the minimum size of the element, see `Strength`.
+        '''
+        __count = len(self.children)
+        super().add(element)
+        if len(self.children) > __count:
+            self._append(element, weight, priority)
+
+    def remove(self, element) -> None:
+        """ Removes the element, only its constraints and the constraints of the total length are removed from the solver. """
+        super().remove(element)
+        __item = self._items.pop(element, None)
+        if __item is None:
+            return
+        for constraint in __item.constraints.values():
+            self._solver.remove_constraint(constraint)
+        self._solver.remove_edit_variable(__item.low)
+        self._order.remove(element)
+        self._update_tail()
+
+    def set_weight(self, element, weight:float) -> None:
+        """ Changes the weight of a child, only the constraint of its share of the free space is replaced. """
+        __item = self._items[element]
+        __item.weight = weight
+        self._replace(__item, 'share', __item.length.eq(__item.low + self._share * weight - __item.cut))
+        self.invalidate()
+
+    def set_priority(self, element, priority:float) -> None:
+        """ Changes the priority of the minimum size of a child, only the constraint of its minimum size is replaced. """
+        __item = self._items[element]
+        __item.priority = priority
+        self._replace(__item, 'min', __item.length.ge(__item.low, priority))
+        self.invalidate()
+
+    def _axis(self, vector:VEC2) -> float:
+        return vector.x if self._orientation == 'horizontal' else vector.y
+
+    def _replace(self, item:_ConstraintItem, key:str, constraint:Constraint) -> None:
+        __old = item.constraints.pop(key, None)
+        if __old is not None:
+            self._solver.remove_constraint(__old)
+        if constraint is not None:
+            self._solver.add_constraint(constraint)
+            item.constraints[key] = constraint
+
+    def _set_limits(self, item:_ConstraintItem, child) -> None:
+        """ Passes the minimum and maximum length of a child to the solver if they changed. """
+        __min = self._axis(child.min_size)
+        __max = self._axis(child.max_size)
+        if __min != item.min:
+            item.min = __min
+            self._solver.suggest_value(item.low, __min)
+        if __max != item.max:
+            item.max = __max
+            self._replace(item, 'max', item.length.le(__max, Strength.STRONG) if __max > 0 else None)
+
+    def _append(self, child, weight:float, priority:float) -> None:
+        """ Adds the constraints of a child placed after the last one. The constraints of the total length are updated by the next layout pass. """
+        __item = _ConstraintItem(weight, priority)
+        self._solver.add_edit_variable(__item.low, self.EDIT_STRENGTH)
+        # The length is the minimum and the share of the child, less the cut of its maximum size. 
+        # All lengths follow the share, so filling the stack moves them together with a single pivot of the solver.
+        for key, constraint in (('share', __item.length.eq(__item.low + self._share * weight - __item.cut)),
+                                ('cut', __item.cut.ge(0)),
+                                ('no_cut', __item.cut.eq(0, Strength.WEAK)),
+                                ('min', __item.length.ge(__item.low, priority)),
+                                ('floor', __item.length.ge(__item.low - self._shrink)),
+                                ('positive', __item.length.ge(0))):
+            self._replace(__item, key, constraint)
+        self._set_limits(__item, child)
+        self._items[child] = __item
+        self._order.append(child)
+
+    def _update_tail(self) -> None:
+        """ Replaces the constraints of the total length of the children, after children were added. """
+        for constraint in self._tail:
+            self._solver.remove_constraint(constraint)
+        __end = Expression({self._items[child].length: 1.0 for child in self._order}, 
+                           self._axis(self._bevel) * 2 + self._axis(self._margin) * (len(self._order) - 1))
+        # The children stay inside the stack and fill it if they can
+        self._tail = [__end.le(self._extent), __end.eq(self._extent, Strength.MEDIUM)]
+        for constraint in self._tail:
+            self._solver.add_constraint(constraint)
+        self._tail_count = len(self._order)
+
+    def do_layout(self) -> None:
+        if len(self.children) > 0:
+            if not self.parent:
+                manager = self.children[0].get_manager()
+                self.position = VEC2(0, 0)
+                self.size = manager.size
+
+            # Skip the pass if nothing this layout depends on has changed
+            if not self.begin_layout():
+                return
+
+            __inner = self.get_max_size()
+
+            # Children changed other than by add() are added to a new solver
+            if self._order != self.children[:len(self._order)]:
+                self.reset()
+            for child in self.children[len(self._order):]:
+                self._append(child, 1.0, Strength.STRONG)
+            for child in self.children:
+                self._set_limits(self._items[child], child)
+            # The length is suggested before the total length is constrained, new children are then placed in the current length at once
+            self._solver.suggest_value(self._extent, self._axis(self.size))
+            if self._tail_count != len(self._order):
+                self._update_tail()
+
+            __get_value = self._solver.get_value
+            __start = self._axis(self._bevel)
+            for child in self.children:
+                __length = __get_value(self._items[child].length)
+                if self._orientation == 'horizontal':
+                    __cross = __inner.y if child.max_size.y <= 0 else min(__inner.y, child.max_size.y)
+                    child.size = SVEC2(__length, __cross)
+                    child.position = VEC2(self.position.x + __start, self.position.y + self._bevel.y)
+                else:
+                    __cross = __inner.x if child.max_size.x <= 0 else min(__inner.x, child.max_size.x)
+                    child.size = SVEC2(__cross, __length)
+                    child.position = VEC2(self.position.x + self._bevel.x, self.position.y + self.size.y - __start - __length)
+                __start += __length + self._axis(self._margin)
+
+            self.end_layout()
@@ -0,0 +1,154 @@
+from typing import Callable
+from pyglet.graphics import Batch, Group
+
+from utils.components.text import ComponentNumericLabel
+from utils.types.t_utils import GLYPH_CACHE
+from const import STYLES
+
+
+class ComponentRowView:
+    '''
+    Rows of text for long lists, such as the lines of a console or the entries of a directory: only the rows that fit in a rectangle exist.
+
+    Each row is a `ComponentNumericLabel` with one left aligned field of a cell per column, in a monospace font, `STYLES.FONT_MONO`
+    by default. The items of the list are numbered, `update()` shows those from `top` cut to the columns:
+
+    - A row that still shows a visible item is only moved, the others show the items that were not visible by updating the glyphs
+        of their cells, without laying their text out. Scrolling by a few items costs a few rows.
+    - The labels are created again only when the rectangle gets more columns than their cells, which grow by `CELL_STEP`.
+    - `invalidate()` makes the rows show their items again, after the items changed without being renumbered,
+        `invalidate_items()` only the rows of some items.
+
+    Args:
+        font_name (str): The name of the font.
+        font_size (float): The size of the font.
+        line_height (float): The height of a row.
+        padding (float): The space between the rows and the sides of the rectangle.
+    '''
+    CELL_STEP:int = 32
+
+    def __init__(self, font_name:str = None, font_size:float = None, line_height:float = 14, padding:float = 4):
+        self.font_name = font_name if font_name is not None else STYLES.FONT_MONO.value
+        self.font_size = font_size if font_size is not None else STYLES.FONT_SIZE.value - 3
+        self.line_height = line_height
+        self.padding = padding
+        self.labels = []
+        self.count = 0
+        self.columns = 0
+        self.top = 0
+        self.rect = (0, 0, 0, 0)
+        # The labels show the items `_items` at the heights `_heights` in `_colors`, None for a hidden label
+        self._items = []
+        self._heights = []
+        self._colors = []
+        self._style = None
+
+    def get_cell_width(self) -> float:
+        """ The advance of a character of the font, the width of a column. """
+        return GLYPH_CACHE.get_default().get_glyphs(self.font_name, self.font_size, '0')[0].advance or self.font_size
+
+    def fit(self, rect:tuple) -> tuple:
+        """ The number of rows and columns that fit in a rectangle `(x, y, width, height)`. """
+        __rows = max(int((rect[3] - 2 * self.padding) // self.line_height), 0)
+        __columns = max(int((rect[2] - 2 * self.padding) // self.get_cell_width()), 0)
+        return __rows, __columns
+
+    def create(self, batch:Batch, group:Group, count:int, columns:int) -> None:
+        ''' Creates labels up to `count`, of at least `columns` cells. The labels are created again if their cells, font or batch do not fit. '''
+        __style = (self.font_name, self.font_size, batch, group)
+        __cells = self._style[4] if self._style is not None else 0
+        if self._style is None or self._style[:4] != __style or __cells < columns:
+            self.delete()
+            __cells = -(-max(columns, 1) // self.CELL_STEP) * self.CELL_STEP
+        self._style = __style + (__cells,)
+        for _ in range(count - len(self.labels)):
+            __label = ComponentNumericLabel('{}', digits=__cells, align='left', font_name=self.font_name, font_size=self.font_size,
+                                            anchor_y='bottom', batch=batch, group=group)
+            __label.visible = False
+            self.labels.append(__label)
+            self._items.append(None)
+            self._heights.append(None)
+            self._colors.append(None)
+
+    def invalidate(self) -> None:
+        """ The items changed: the rows show them again on the next update. """
+        self._items = [None] * len(self.labels)
+
+    def invalidate_items(self, items:set) -> None:
+        """ Some items changed: the rows showing them show them again on the next update, the other rows are kept. """
+        for index, item in enumerate(self._items):
+            if item in items:
+                self._items[index] = None
+
+    def update(self, batch:Batch, group:Group, rect:tuple, top:int, total:int, get_text:Callable[[int], str],
+               color:tuple = (255, 255, 255, 255), get_color:Callable[[int], tuple] = None) -> int:
+        """
+        Shows the items from `top` to `total` that fit in the rectangle `(x, y, width, height)`, from its top.
+        `get_text(index)` is called for the items that were not shown, `get_color(index)`, if given, for all the shown items.
+        Returns the number of rows whose text, place, color or visibility changed.
+        """
+        x, y, width, height = rect
+        __count, __columns = self.fit(rect)
+        self.create(batch, group, __count, __columns)
+        if __columns != self.columns:
+            # The rows show the items cut to the previous width
+            self.columns = __columns
+            self.invalidate()
+        self.count, self.top, self.rect = __count, top, rect
+
+        __stop = min(top + __count, total)
+        __free, __shown = [], {}
+        for index, item in enumerate(self._items):
+            if item is not None and top <= item < __stop and self._heights[index] is not None:
+                __shown[item] = index
+            else:
+                __free.append(index)
+
+        __changed = 0
+        for item in range(max(top, 0), __stop):
+            __index = __shown.get(item)
+            if __index is None:
+                __index = __free.pop()
+                self.labels[__index].set_values(get_text(item)[:__columns])
+                self._items[__index] = item
+                __changed += 1
+            __label = self.labels[__index]
+            __color = tuple(get_color(item)) if get_color is not None else tuple(color)
+            if self._colors[__index] != __color:
+                __label.color = __color
+                self._colors[__index] = __color
+                __changed += 1
+            # The glyphs are placed on whole pixels, between two pixels they are blurred by the filtering of their texture
+            __height = round(y + height - self.padding - (item - top + 1) * self.line_height)
+            if self._heights[__index] != __height:
+                if self._heights[__index] is None:
+                    __label.visible = True
+                __label.position = (round(x + self.padding), __height, 0)
+                self._heights[__index] = __height
+                __changed += 1
+        for index in __free:
+            if self._heights[index] is not None:
+                self.labels[index].visible = False
+                self._items[index] = self._heights[index] = None
+                __changed += 1
+        return __changed
+
+    def get_item(self, x:float, y:float) -> int:
+        """ The item of the row under a point, None if there is none. """
+        for item, height in zip(self._items, self._heights):
+            if item is not None and height is not None and height <= y < height + self.line_height and self.rect[0] <= x < self.rect[0] + self.rect[2]:
+                return item
+        return None
+
+    def hide(self) -> None:
+        """ Hides the rows, the next update shows them again. """
+        for label in self.labels:
+            label.visible = False
+        self._items = [None] * len(self.labels)
+        self._heights = [None] * len(self.labels)
+
+    def delete(self) -> None:
+        for label in self.labels:
+            label.delete()
+        self.labels, self._items, self._heights, self._colors, self._style = [], [], [], [], None
+        self.columns = 0
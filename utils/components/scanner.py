@@ -0,0 +1,388 @@
+import ctypes, ctypes.util, heapq, os, struct, sys, threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, NamedTuple
+
+
+class FileEntry(NamedTuple):
+    ''' An entry of a directory listing. The size and modification time are None until they are read, see `ComponentDirectoryScanner.stat_entry()`. '''
+    name:str
+    is_dir:bool
+    size:int = None
+    mtime_ns:int = None
+
+
+class ComponentInotifyWatcher:
+    '''
+    Watches directories with the inotify API of Linux, called through ctypes, to know when their listing changed without listing them again.
+
+    A watched directory is reported by `read()` when an entry is created, deleted, moved in or out, written or has its attributes changed,
+    and when the directory itself is deleted or moved. `read()` does not block: the events are read by the thread that asks for them.
+    If the kernel queue overflowed, all the watched directories are reported.
+
+    `available` is False on the other systems, or if inotify could not be initialized. A directory may also fail to be watched,
+    when the watches of the user are exhausted: `watch()` then returns False.
+    '''
+    IN_ATTRIB:int = 0x00000004
+    IN_CLOSE_WRITE:int = 0x00000008
+    IN_MOVED_FROM:int = 0x00000040
+    IN_MOVED_TO:int = 0x00000080
+    IN_CREATE:int = 0x00000100
+    IN_DELETE:int = 0x00000200
+    IN_DELETE_SELF:int = 0x00000400
+    IN_MOVE_SELF:int = 0x00000800
+    IN_Q_OVERFLOW:int = 0x00004000
+    IN_IGNORED:int = 0x00008000
+    IN_ONLYDIR:int = 0x01000000
+    IN_NONBLOCK:int = 0o4000
+    IN_CLOEXEC:int = 0o2000000
+    MASK:int = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    EVENT:struct.Struct = struct.Struct('iIII')
+
+    def __init__(self):
+        self._fd = -1
+        self._libc = None
+        self._lock = threading.Lock()
+        self._paths = {}
+        self._watches = {}
+        if not sys.platform.startswith('linux'):
+            return
+        try:
+            self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        except (OSError, AttributeError):
+            self._fd = -1
+
+    @property
+    def available(self) -> bool:
+        return self._fd >= 0
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def is_watched(self, path:str) -> bool:
+        return path in self._watches
+
+    def watch(self, path:str) -> bool:
+        ''' Watches a directory. Returns False if it cannot be watched. Can be called from any thread. '''
+        if not self.available:
+            return False
+        with self._lock:
+            if path in self._watches:
+                return True
+            __wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.MASK)
+            if __wd < 0:
+                return False
+            self._watches[path], self._paths[__wd] = __wd, path
+        return True
+
+    def unwatch(self, path:str) -> None:
+        with self._lock:
+            __wd = self._watches.pop(path, None)
+            if __wd is None:
+                return
+            self._paths.pop(__wd, None)
+            self._libc.inotify_rm_watch(self._fd, __wd)
+
+    def read(self) -> set:
+        ''' The watched directories that changed since the last call. A directory that was deleted or moved is not watched anymore. '''
+        if not self.available:
+            return set()
+        __changed = set()
+        while True:
+            try:
+                __data = os.read(self._fd, 64 * 1024)
+            except (BlockingIOError, InterruptedError):
+                break
+            __offset = 0
+            with self._lock:
+                while __offset + self.EVENT.size <= len(__data):
+                    __wd, __mask, _, __length = self.EVENT.unpack_from(__data, __offset)
+                    __offset += self.EVENT.size + __length
+                    if __mask & self.IN_Q_OVERFLOW:
+                        __changed.update(self._watches)
+                        continue
+                    __path = self._paths.get(__wd)
+                    if __path is None:
+                        continue
+                    __changed.add(__path)
+                    if __mask & self.IN_IGNORED:
+                        self._paths.pop(__wd, None)
+                        if self._watches.get(__path) == __wd:
+                            del self._watches[__path]
+        return __changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._paths.clear()
+        self._watches.clear()
+
+
+class ScanRequest:
+    ''' A listing being made by a worker of a `ComponentDirectoryScanner`: the entries received so far and the callbacks waiting for them. '''
+    __slots__ = ('path', 'callbacks', 'entries', 'cancelled', 'stale', 'finished', 'future')
+
+    def __init__(self, path:str):
+        self.path = path
+        self.callbacks = []
+        self.entries = []
+        self.cancelled = False
+        self.stale = False
+        self.finished = False
+        self.future = None
+
+
+class ComponentDirectoryScanner:
+    '''
+    Lists directories on a pool of worker threads, and caches the listings by path and modification time.
+
+    `scan()` returns at once. A worker lists the directory with `os.scandir` and sends its entries in chunks, the first ones small,
+    so the first entries of a large directory are received after a few hundred entries were read, then the whole listing sorted,
+    see `get_sort_key()`. The chunks are sorted as they are read and merged at the end: a single sort of a large listing would hold
+    the GIL, and block the frames, for as long. The thread that calls `poll()`, the main thread of a window, receives the entries
+    and calls the callbacks, up to a number of entries per call.
+    The workers compete with that thread for the GIL, so they do as little as they can in Python: the type of an entry is read from the directory
+    itself, by `DirEntry.is_dir()`, without a `stat` call. The sizes and modification times are read by `stat_entry()`, for the entries shown.
+    A single worker is used by default. The workers also wait, between two batches of `BATCH` entries, while the thread of the callbacks
+    holds the lock of `pause()`: otherwise a worker takes the GIL from that thread at every call that releases it, such as an OpenGL call,
+    and keeps it for the switch interval of Python.
+    `notify`, if given, is called by the workers when they send entries and none were waiting, to wake that thread up.
+
+    The listings are cached by path with the modification time of the directory, up to `max_entries` entries in all, the least
+    recently used dropped first. A cached listing is used instead of listing the directory again:
+
+    - if the directory is watched by the `ComponentInotifyWatcher`, until `poll()` reads an event of the directory, without a system call;
+    - otherwise, while the modification time of the directory did not change, which costs a `stat`.
+
+    Args:
+        workers (int): The number of worker threads, 1 by default.
+        max_entries (int): The entries kept by the cache.
+        watcher (ComponentInotifyWatcher): The inotify watcher, created if None. The mtime is checked if it is not `available`.
+        notify (Callable): Called from the workers when entries are sent.
+    '''
+    FIRST_CHUNK:int = 256
+    MAX_CHUNK:int = 8192
+    BATCH:int = 256
+
+    def __init__(self, workers:int = 1, max_entries:int = 1_000_000, watcher:ComponentInotifyWatcher = None, notify:Callable[[], None] = None):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ComponentDirectoryScanner')
+        self.max_entries = max_entries
+        self.watcher = watcher if watcher is not None else ComponentInotifyWatcher()
+        self.notify = notify
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._cached_entries = 0
+        self._requests = {}
+        self._results = deque()
+        self._pause = threading.Lock()
+
+    @staticmethod
+    def get_group(entry:FileEntry) -> tuple:
+        """ The group of an entry in a sorted listing: the hidden directories, the directories, the hidden files, then the files. """
+        return (not entry.is_dir, not entry.name.startswith('.'))
+
+    @staticmethod
+    def get_sort_key(entry:FileEntry) -> str:
+        """
+        Sorts the entries by group, see `get_group()`, then by name ignoring the case. The key is a string rather than a tuple:
+        strings are not tracked by the garbage collector, whose full collections would scan every key while a large listing is sorted.
+        """
+        return f"{'1' if not entry.is_dir else '0'}{'0' if entry.name.startswith('.') else '1'}{entry.name.casefold()}\0{entry.name}"
+
+    @staticmethod
+    def stat_entry(directory:str, entry:FileEntry) -> FileEntry:
+        """ The entry of a directory with its size, 0 for a directory, and modification time, both 0 if it can not be read. Symbolic links are followed. """
+        try:
+            __stat = os.stat(os.path.join(directory, entry.name))
+        except OSError:
+            return entry._replace(size=0, mtime_ns=0)
+        return entry._replace(size=0 if entry.is_dir else __stat.st_size, mtime_ns=__stat.st_mtime_ns)
+
+    def pause(self) -> threading.Lock:
+        """ The lock the workers wait for between two batches of entries, held by the thread of the callbacks while it draws a frame. """
+        return self._pause
+
+    def _wait(self) -> None:
+        with self._pause:
+            pass
+
+    def has_results(self) -> bool:
+        """ Checks if entries were sent since the last `poll()`. """
+        return bool(self._results)
+
+    def get(self, path:str) -> tuple:
+        """ The cached listing of a directory if it is still valid, None otherwise. """
+        __cached = self.cache.get(path)
+        if __cached is None:
+            return None
+        if not self.watcher.is_watched(path):
+            try:
+                __mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                __mtime = None
+            if __mtime != __cached[0]:
+                self.invalidate(path)
+                return None
+        self.cache.move_to_end(path)
+        return __cached[1]
+
+    def invalidate(self, path:str) -> None:
+        """ Drops the cached listing of a directory. """
+        __cached = self.cache.pop(path, None)
+        if __cached is not None:
+            self._cached_entries -= len(__cached[1])
+
+    def scan(self, path:str, callback:Callable[[str, list, bool], None] = None) -> bool:
+        """
+        Lists a directory. `callback(path, entries, done)` receives the entries in chunks while `done` is False, then the whole sorted
+        listing with `done` True. A valid cached listing is given at once. Returns True if the listing was cached.
+        """
+        __cached = self.get(path)
+        if __cached is not None:
+            self.hits += 1
+            if callback is not None:
+                callback(path, __cached, True)
+            return True
+
+        __request = self._requests.get(path)
+        if __request is None:
+            self.misses += 1
+            __request = self._requests[path] = ScanRequest(path)
+            __request.future = self.executor.submit(self._scan, __request)
+        if callback is not None:
+            # A callback added to a running listing first receives the entries sent before
+            if __request.entries:
+                callback(path, list(__request.entries), False)
+            if callback not in __request.callbacks:
+                __request.callbacks.append(callback)
+        return False
+
+    def prefetch(self, paths:Iterable[str]) -> int:
+        """ Lists the directories that are not cached, in the background. Returns the number of listings started. """
+        __started = 0
+        for path in paths:
+            if path not in self._requests and self.get(path) is None:
+                self.scan(path)
+                __started += 1
+        return __started
+
+    def cancel(self, path:str) -> None:
+        """ Stops listing a directory. The callbacks are not called anymore. """
+        __request = self._requests.pop(path, None)
+        if __request is not None:
+            __request.cancelled = True
+            __request.future.cancel()
+
+    def _send(self, request:ScanRequest, entries, done:bool) -> None:
+        __wake = not self._results
+        self._results.append((request, entries, done))
+        if __wake and self.notify is not None:
+            self.notify()
+
+    def _sort(self, entries:list) -> list:
+        ''' Sorts a chunk by batches merged together, waiting for `pause()` between them. '''
+        __runs = []
+        for start in range(0, len(entries), self.BATCH):
+            self._wait()
+            __runs.append(sorted(entries[start:start + self.BATCH], key=self.get_sort_key))
+        return list(heapq.merge(*__runs, key=self.get_sort_key)) if len(__runs) > 1 else (__runs[0] if __runs else [])
+
+    def _scan(self, request:ScanRequest) -> None:
+        ''' Lists a directory on a worker thread. The directory is watched before it is listed, so a change made while listing is not missed. '''
+        if request.cancelled:
+            return
+        self.watcher.watch(request.path)
+        __runs, __chunk, __size = [], [], self.FIRST_CHUNK
+        try:
+            __mtime = os.stat(request.path).st_mtime_ns
+            with os.scandir(request.path) as iterator:
+                for entry in iterator:
+                    # The type comes with the name on most file systems, only a symbolic link costs a `stat`
+                    try:
+                        __is_dir = entry.is_dir()
+                    except OSError:
+                        __is_dir = False
+                    __chunk.append(FileEntry(entry.name, __is_dir))
+                    if len(__chunk) % self.BATCH == 0:
+                        self._wait()
+                    if len(__chunk) >= __size:
+                        if request.cancelled:
+                            return
+                        self._send(request, __chunk, False)
+                        __runs.append(self._sort(__chunk))
+                        __chunk, __size = [], min(__size * 2, self.MAX_CHUNK)
+        except OSError:
+            __mtime = None
+        if __chunk:
+            self._send(request, __chunk, False)
+            __runs.append(self._sort(__chunk))
+        __entries = []
+        for entry in heapq.merge(*__runs, key=self.get_sort_key) if len(__runs) > 1 else (__runs[0] if __runs else ()):
+            __entries.append(entry)
+            if len(__entries) % self.BATCH == 0:
+                self._wait()
+        __entries = tuple(__entries)
+        if not request.cancelled:
+            # The chunks not received yet are skipped, the whole listing follows them
+            request.finished = True
+            self._send(request, (__mtime, __entries), True)
+
+    def poll(self, max_entries:int = None) -> set:
+        """
+        Calls the callbacks with the entries sent by the workers, caches the finished listings and drops the cached listings
+        of the directories that changed, which it returns. Called by the thread of the callbacks, usually once per frame.
+        If `max_entries` is given, the callbacks receive at most about as many entries, the others are kept for the next calls:
+        `has_results()` stays True. A finished listing counts as one entry, the chunks of its entries that were not received are skipped.
+        A listing that was being made when its directory changed may have missed the change: it is not cached, and its directory
+        is returned when it is finished, to be listed again.
+        """
+        __changed = self.watcher.read()
+        for path in __changed:
+            self.invalidate(path)
+            if path in self._requests:
+                self._requests[path].stale = True
+        __changed = {path for path in __changed if path not in self._requests}
+
+        __budget = max_entries if max_entries is not None else -1
+        while self._results and __budget != 0:
+            __request, __entries, __done = self._results.popleft()
+            if __request.cancelled or (__request.finished and not __done):
+                continue
+            if not __done and 0 < __budget < len(__entries):
+                # The rest of the chunk is received first by the next call
+                self._results.appendleft((__request, __entries[__budget:], False))
+                __entries = __entries[:__budget]
+            if __budget > 0:
+                __budget -= 1 if __done else len(__entries)
+            if __done:
+                __mtime, __entries = __entries
+                self._requests.pop(__request.path, None)
+                if __request.stale:
+                    __changed.add(__request.path)
+                elif __mtime is not None:
+                    self.store(__request.path, __mtime, __entries)
+            else:
+                __request.entries.extend(__entries)
+            for callback in __request.callbacks:
+                callback(__request.path, __entries, __done)
+        return __changed
+
+    def store(self, path:str, mtime_ns:int, entries:tuple) -> None:
+        ''' Caches a listing, then drops the least recently used ones beyond `max_entries`, and stops watching them. '''
+        self.invalidate(path)
+        self.cache[path] = (mtime_ns, entries)
+        self._cached_entries += len(entries)
+        while self._cached_entries > self.max_entries and len(self.cache) > 1:
+            __path, (_, __entries) = self.cache.popitem(last=False)
+            self._cached_entries -= len(__entries)
+            self.watcher.unwatch(__path)
+
+    def close(self) -> None:
+        """ Stops the workers and the watcher. """
+        for path in list(self._requests):
+            self.cancel(path)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.watcher.close()
@@ -0,0 +1,212 @@
+import numpy as np
+from utils.types.t_vectors import VEC3
+from utils.types.t_matrix import MAT4, QUAT
+
+class ComponentSceneNode:
+    '''
+    The `ComponentSceneNode` class is a node of a `ComponentScene`: an object with a local transform and a parent.
+
+    The node is a handle: its position, rotation and scale are stored in the arrays of the scene.
+    Setting any of them marks the node dirty, and its world matrix and the world matrices of its descendants
+    are recomputed by the next `ComponentScene.update()`. Nodes are created with `ComponentScene.create_node()`.
+    '''
+    __slots__ = ('_scene', '_index', 'name')
+
+    def __init__(self, scene:'ComponentScene', index:int, name:str):
+        self._scene = scene
+        self._index = index
+        self.name = name
+
+    def __repr__(self):
+        return f"ComponentSceneNode(name={self.name!r}, index={self._index})"
+
+    @property
+    def scene(self) -> 'ComponentScene':
+        return self._scene
+
+    @property
+    def index(self) -> int:
+        ''' The index of the node in the arrays of the scene. '''
+        return self._index
+
+    @property
+    def parent(self) -> 'ComponentSceneNode':
+        __parent = self._scene.parents[self._index]
+        return self._scene.nodes[__parent] if __parent >= 0 else None
+
+    @parent.setter
+    def parent(self, parent:'ComponentSceneNode') -> None:
+        self._scene.set_parent(self, parent)
+
+    @property
+    def children(self) -> list:
+        return [self._scene.nodes[index] for index in self._scene.children[self._index]]
+
+    @property
+    def position(self) -> VEC3:
+        return VEC3(*self._scene.positions[self._index].tolist())
+
+    @position.setter
+    def position(self, position:VEC3) -> None:
+        self._scene.positions[self._index] = tuple(position)
+        self._scene.invalidate(self._index)
+
+    @property
+    def rotation(self) -> QUAT:
+        return QUAT(*self._scene.rotations[self._index].tolist())
+
+    @rotation.setter
+    def rotation(self, rotation:QUAT) -> None:
+        self._scene.rotations[self._index] = tuple(rotation)
+        self._scene.invalidate(self._index)
+
+    @property
+    def scale(self) -> VEC3:
+        return VEC3(*self._scene.scales[self._index].tolist())
+
+    @scale.setter
+    def scale(self, scale:VEC3) -> None:
+        self._scene.scales[self._index] = tuple(scale)
+        self._scene.invalidate(self._index)
+
+    @property
+    def local_matrix(self) -> MAT4:
+        self._scene.update()
+        return MAT4(self._scene.local_matrices[self._index])
+
+    @property
+    def world_matrix(self) -> MAT4:
+        ''' The matrix from the node space to the scene space, recomputed only if the node or one of its ancestors changed. '''
+        self._scene.update()
+        return MAT4(self._scene.world_matrices[self._index])
+
+
+class ComponentScene:
+    '''
+    The `ComponentScene` class is a hierarchy of `ComponentSceneNode` objects with cached world matrices.
+
+    The transforms of all nodes are stored in contiguous NumPy arrays. `update()` recomposes the local matrices of the dirty nodes
+    and recomputes the world matrices level by level, with one batched matrix product per depth of the hierarchy,
+    and only for the nodes that are dirty or have a dirty ancestor. Clean subtrees keep their cached matrices.
+
+    Args:
+        capacity (int, optional): The initial number of nodes the arrays can hold. The arrays grow as needed. Defaults to 64.
+    '''
+
+    def __init__(self, capacity:int = 64):
+        self.nodes = []
+        self.children = []
+        self.updates = 0
+        self._levels = None
+        self._allocate(capacity)
+
+    def _allocate(self, capacity:int) -> None:
+        __count = len(self.nodes)
+        __arrays = {
+            'positions': np.zeros((capacity, 3), dtype=np.float32),
+            'rotations': np.tile(np.array((0, 0, 0, 1), dtype=np.float32), (capacity, 1)),
+            'scales': np.ones((capacity, 3), dtype=np.float32),
+            'local_matrices': np.tile(np.identity(4, dtype=np.float32), (capacity, 1, 1)),
+            'world_matrices': np.tile(np.identity(4, dtype=np.float32), (capacity, 1, 1)),
+            'parents': np.full(capacity, -1, dtype=np.int32),
+            'depths': np.zeros(capacity, dtype=np.int32),
+            'dirty': np.zeros(capacity, dtype=bool),
+        }
+        for name, array in __arrays.items():
+            if __count > 0:
+                array[:__count] = getattr(self, name)[:__count]
+            setattr(self, name, array)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def create_node(self, name:str = 'Node', parent:ComponentSceneNode = None, position:VEC3 = None, rotation:QUAT = None, scale:VEC3 = None) -> ComponentSceneNode:
+        __index = len(self.nodes)
+        if __index == len(self.parents):
+            self._allocate(len(self.parents) * 2)
+
+        node = ComponentSceneNode(self, __index, name)
+        self.nodes.append(node)
+        self.children.append([])
+
+        if position is not None:
+            self.positions[__index] = tuple(position)
+        if rotation is not None:
+            self.rotations[__index] = tuple(rotation)
+        if scale is not None:
+            self.scales[__index] = tuple(scale)
+
+        self.dirty[__index] = True
+        self.set_parent(node, parent)
+        return node
+
+    def set_parent(self, node:ComponentSceneNode, parent:ComponentSceneNode) -> None:
+        '''
+        Moves the node and its subtree under `parent`, or to the root of the scene if `parent` is None.
+        '''
+        __parent = parent.index if parent is not None else -1
+        __ancestor = __parent
+        while __ancestor >= 0:
+            if __ancestor == node.index:
+                raise ValueError(f"{parent} is a descendant of {node}")
+            __ancestor = self.parents[__ancestor]
+
+        __old_parent = self.parents[node.index]
+        if __old_parent >= 0 and node.index in self.children[__old_parent]:
+            self.children[__old_parent].remove(node.index)
+        if __parent >= 0:
+            self.children[__parent].append(node.index)
+        self.parents[node.index] = __parent
+
+        # The depths of the whole subtree change with the parent
+        __stack = [node.index]
+        while __stack:
+            __index = __stack.pop()
+            self.depths[__index] = self.depths[self.parents[__index]] + 1 if self.parents[__index] >= 0 else 0
+            __stack.extend(self.children[__index])
+
+        self._levels = None
+        self.invalidate(node.index)
+
+    def invalidate(self, index:int) -> None:
+        ''' Marks a node dirty, its local matrix and the world matrices of its subtree are recomputed by the next update. '''
+        self.dirty[index] = True
+
+    def get_levels(self) -> list:
+        ''' The node indices grouped by depth, parents before children. Cached until the hierarchy changes. '''
+        if self._levels is None:
+            __count = len(self.nodes)
+            __order = np.argsort(self.depths[:__count], kind='stable').astype(np.int32)
+            __bounds = np.flatnonzero(np.diff(self.depths[__order])) + 1
+            self._levels = np.split(__order, __bounds) if __count > 0 else []
+        return self._levels
+
+    def update(self) -> int:
+        '''
+        Recomputes the matrices of the dirty nodes and of their descendants. Returns the number of recomputed world matrices.
+        '''
+        __count = len(self.nodes)
+        __dirty = self.dirty[:__count]
+        if not __dirty.any():
+            return 0
+
+        __changed = np.flatnonzero(__dirty)
+        self.local_matrices[__changed] = MAT4.compose_array(self.positions[__changed], self.rotations[__changed], self.scales[__changed])
+
+        __updated = 0
+        for level in self.get_levels():
+            __parents = self.parents[level]
+            if __parents[0] < 0:
+                __nodes = level[__dirty[level]]
+                self.world_matrices[__nodes] = self.local_matrices[__nodes]
+            else:
+                # A node is dirty if it changed or if its parent was recomputed
+                __mask = __dirty[level] | __dirty[__parents]
+                __dirty[level] = __mask
+                __nodes = level[__mask]
+                self.world_matrices[__nodes] = self.world_matrices[__parents[__mask]] @ self.local_matrices[__nodes]
+            __updated += len(__nodes)
+
+        __dirty[:] = False
+        self.updates += 1
+        return __updated
@@ -0,0 +1,523 @@
+"""
+This module implements an incremental linear constraint solver, after the Cassowary algorithm as it is implemented by Kiwi.
+
+Constraints are linear equations and inequalities over `Variable` objects, built with the `eq()`, `le()` and `ge()` methods of variables and expressions,
+e.g. `(x + width).le(right)`. Every constraint has a `Strength`: required constraints must hold, the others are satisfied as well as their strengths allow,
+a stronger constraint always wins over any number of weaker ones.
+
+The `Solver` keeps the constraints in a simplex tableau. Adding or removing a constraint only pivots the rows it touches,
+and the values of edit variables, e.g. the size of a window, are changed with `suggest_value()`, which only repairs the rows made infeasible
+by the change with the dual simplex method. Neither rebuilds the tableau.
+"""
+import math
+
+_EPSILON = 1.0e-8
+
+
+class Strength:
+    '''
+    The strengths of constraints. `create()` combines a strong, a medium and a weak part, each part is worth more than any amount of the weaker ones.
+    '''
+    @staticmethod
+    def create(strong:float, medium:float, weak:float, weight:float = 1.0) -> float:
+        __value = max(0.0, min(1000.0, strong * weight)) * 1000000.0
+        __value += max(0.0, min(1000.0, medium * weight)) * 1000.0
+        __value += max(0.0, min(1000.0, weak * weight))
+        return __value
+
+    @staticmethod
+    def clip(value:float) -> float:
+        return max(0.0, min(Strength.REQUIRED, value))
+
+Strength.REQUIRED = Strength.create(1000.0, 1000.0, 1000.0)
+Strength.STRONG = Strength.create(1.0, 0.0, 0.0)
+Strength.MEDIUM = Strength.create(0.0, 1.0, 0.0)
+Strength.WEAK = Strength.create(0.0, 0.0, 1.0)
+
+
+class UnsatisfiableConstraint(ValueError):
+    ''' A required constraint conflicts with the required constraints of the solver. '''
+
+class DuplicateConstraint(ValueError):
+    ''' The constraint is already in the solver. '''
+
+class UnknownConstraint(KeyError):
+    ''' The constraint is not in the solver. '''
+
+class DuplicateEditVariable(ValueError):
+    ''' The variable is already an edit variable of the solver. '''
+
+class UnknownEditVariable(KeyError):
+    ''' The variable is not an edit variable of the solver. '''
+
+
+class _Operand:
+    ''' The arithmetic shared by variables and expressions. Comparison operators are not overloaded, variables are used as dict keys. '''
+    __slots__ = ()
+
+    def __add__(self, other) -> 'Expression':
+        return Expression.of(self).combine(other, 1.0)
+
+    def __radd__(self, other) -> 'Expression':
+        return Expression.of(self).combine(other, 1.0)
+
+    def __sub__(self, other) -> 'Expression':
+        return Expression.of(self).combine(other, -1.0)
+
+    def __rsub__(self, other) -> 'Expression':
+        return Expression.of(other).combine(self, -1.0)
+
+    def __mul__(self, scalar:float) -> 'Expression':
+        __expression = Expression.of(self)
+        return Expression({variable: coefficient * scalar for variable, coefficient in __expression.terms.items()}, __expression.constant * scalar)
+
+    def __rmul__(self, scalar:float) -> 'Expression':
+        return self.__mul__(scalar)
+
+    def __truediv__(self, scalar:float) -> 'Expression':
+        return self.__mul__(1.0 / scalar)
+
+    def __neg__(self) -> 'Expression':
+        return self.__mul__(-1.0)
+
+    def eq(self, other = 0.0, strength:float = Strength.REQUIRED) -> 'Constraint':
+        return Constraint(self - other, '==', strength)
+
+    def le(self, other = 0.0, strength:float = Strength.REQUIRED) -> 'Constraint':
+        return Constraint(self - other, '<=', strength)
+
+    def ge(self, other = 0.0, strength:float = Strength.REQUIRED) -> 'Constraint':
+        return Constraint(self - other, '>=', strength)
+
+
+class Variable(_Operand):
+    '''
+    A variable of the solver. Its `value` is set by `Solver.update_variables()`.
+
+    Args:
+        name (str, optional): The name of the variable, used in representations.
+    '''
+    __slots__ = ('name', 'value')
+
+    def __init__(self, name:str = ''):
+        self.name = name
+        self.value = 0.0
+
+    def __repr__(self):
+        return f"Variable(name={self.name!r}, value={self.value})"
+
+
+class Expression(_Operand):
+    '''
+    A linear expression: the sum of the `terms`, a dict of variables and their coefficients, and of a `constant`.
+    '''
+    __slots__ = ('terms', 'constant')
+
+    def __init__(self, terms:dict = None, constant:float = 0.0):
+        self.terms = terms if terms is not None else {}
+        self.constant = constant
+
+    @staticmethod
+    def of(value) -> 'Expression':
+        ''' Converts a number, a variable or an expression to an expression. '''
+        if isinstance(value, Expression):
+            return value
+        if isinstance(value, Variable):
+            return Expression({value: 1.0})
+        return Expression(constant=float(value))
+
+    def combine(self, other, factor:float) -> 'Expression':
+        ''' Returns `self + factor * other`. '''
+        __other = Expression.of(other)
+        __terms = dict(self.terms)
+        for variable, coefficient in __other.terms.items():
+            __terms[variable] = __terms.get(variable, 0.0) + coefficient * factor
+        return Expression(__terms, self.constant + __other.constant * factor)
+
+    def value(self) -> float:
+        return sum(variable.value * coefficient for variable, coefficient in self.terms.items()) + self.constant
+
+    def __repr__(self):
+        return ' + '.join([f"{coefficient} * {variable.name}" for variable, coefficient in self.terms.items()] + [str(self.constant)])
+
+
+class Constraint:
+    '''
+    The constraint `expression op 0`, where `op` is `==`, `<=` or `>=`, with a strength.
+    '''
+    __slots__ = ('expression', 'op', 'strength')
+
+    def __init__(self, expression:Expression, op:str, strength:float = Strength.REQUIRED):
+        if op not in ('==', '<=', '>='):
+            raise ValueError(f"Unknown constraint operator: {op}")
+        self.expression = Expression.of(expression)
+        self.op = op
+        self.strength = Strength.clip(strength)
+
+    def __repr__(self):
+        return f"Constraint({self.expression} {self.op} 0, strength={self.strength})"
+
+
+_EXTERNAL, _SLACK, _ERROR, _DUMMY = range(4)
+
+
+class _Symbol:
+    ''' A column of the tableau: an external variable, a slack or error variable, or a dummy marker of a required equality. '''
+    __slots__ = ('kind',)
+
+    def __init__(self, kind:int):
+        self.kind = kind
+
+
+class _Tag:
+    ''' The symbols a constraint added to the tableau, `marker` identifies its row, `other` is the second error symbol of a non-required constraint. '''
+    __slots__ = ('marker', 'other')
+
+    def __init__(self):
+        self.marker = None
+        self.other = None
+
+
+class _Row:
+    ''' A row of the tableau: `constant + sum(coefficient * symbol)`, the symbols with their coefficients in `cells`. '''
+    __slots__ = ('cells', 'constant')
+
+    def __init__(self, constant:float = 0.0, cells:dict = None):
+        self.constant = constant
+        self.cells = cells if cells is not None else {}
+
+    def copy(self) -> '_Row':
+        return _Row(self.constant, dict(self.cells))
+
+    def add(self, value:float) -> float:
+        self.constant += value
+        return self.constant
+
+    def insert_symbol(self, symbol:_Symbol, coefficient:float = 1.0) -> None:
+        __coefficient = self.cells.get(symbol, 0.0) + coefficient
+        if abs(__coefficient) < _EPSILON:
+            self.cells.pop(symbol, None)
+        else:
+            self.cells[symbol] = __coefficient
+
+    def insert_row(self, row:'_Row', coefficient:float = 1.0) -> None:
+        self.constant += row.constant * coefficient
+        __cells = self.cells
+        for symbol, value in row.cells.items():
+            __coefficient = __cells.get(symbol, 0.0) + value * coefficient
+            if abs(__coefficient) < _EPSILON:
+                __cells.pop(symbol, None)
+            else:
+                __cells[symbol] = __coefficient
+
+    def reverse_sign(self) -> None:
+        self.constant = -self.constant
+        self.cells = {symbol: -value for symbol, value in self.cells.items()}
+
+    def solve_for(self, symbol:_Symbol) -> None:
+        ''' Rewrites the row `0 = row` as `symbol = row'`. '''
+        __coefficient = -1.0 / self.cells.pop(symbol)
+        self.constant *= __coefficient
+        self.cells = {key: value * __coefficient for key, value in self.cells.items()}
+
+    def solve_for_pair(self, lhs:_Symbol, rhs:_Symbol) -> None:
+        ''' Rewrites the row `lhs = row` as `rhs = row'`. '''
+        self.insert_symbol(lhs, -1.0)
+        self.solve_for(rhs)
+
+    def substitute(self, symbol:_Symbol, row:'_Row') -> None:
+        __coefficient = self.cells.pop(symbol, None)
+        if __coefficient is not None:
+            self.insert_row(row, __coefficient)
+
+
+class Solver:
+    '''
+    The `Solver` class finds values of variables that satisfy the required constraints and minimize the weighted errors of the others.
+
+    - `add_constraint()` and `remove_constraint()` change the constraints.
+    - `add_edit_variable()` makes a variable editable, `suggest_value()` then asks for a new value of it.
+    - `update_variables()` writes the solution to the `value` of the variables, `get_value()` reads the value of a single variable.
+
+    The tableau is kept between calls, every change updates the current solution instead of solving the system again.
+    '''
+
+    def __init__(self):
+        self._constraints = {}
+        self._rows = {}
+        self._variables = {}
+        self._edits = {}
+        self._infeasible = []
+        self._objective = _Row()
+        self._artificial = None
+
+    def has_constraint(self, constraint:Constraint) -> bool:
+        return constraint in self._constraints
+
+    def add_constraint(self, constraint:Constraint) -> None:
+        if constraint in self._constraints:
+            raise DuplicateConstraint(constraint)
+
+        __tag = _Tag()
+        __row = self._create_row(constraint, __tag)
+        __subject = self._choose_subject(__row, __tag)
+
+        # A row of dummies only is satisfied if its constant is 0, the constraint is then redundant
+        if __subject is None and all(symbol.kind == _DUMMY for symbol in __row.cells):
+            if abs(__row.constant) >= _EPSILON:
+                raise UnsatisfiableConstraint(constraint)
+            __subject = __tag.marker
+
+        if __subject is None:
+            if not self._add_with_artificial_variable(__row):
+                raise UnsatisfiableConstraint(constraint)
+        else:
+            __row.solve_for(__subject)
+            self._substitute(__subject, __row)
+            self._rows[__subject] = __row
+
+        self._constraints[constraint] = __tag
+        self._optimize(self._objective)
+
+    def remove_constraint(self, constraint:Constraint) -> None:
+        __tag = self._constraints.pop(constraint, None)
+        if __tag is None:
+            raise UnknownConstraint(constraint)
+
+        # The errors of the constraint no longer count in the objective
+        for symbol in (__tag.marker, __tag.other):
+            if symbol is not None and symbol.kind == _ERROR:
+                __row = self._rows.get(symbol)
+                if __row is not None:
+                    self._objective.insert_row(__row, -constraint.strength)
+                else:
+                    self._objective.insert_symbol(symbol, -constraint.strength)
+
+        if self._rows.pop(__tag.marker, None) is None:
+            __leaving = self._get_marker_leaving_symbol(__tag.marker)
+            if __leaving is None:
+                raise RuntimeError("Failed to find the leaving row of a removed constraint")
+            __row = self._rows.pop(__leaving)
+            __row.solve_for_pair(__leaving, __tag.marker)
+            self._substitute(__tag.marker, __row)
+
+        self._optimize(self._objective)
+
+    def add_edit_variable(self, variable:Variable, strength:float = Strength.STRONG) -> None:
+        ''' Makes `variable` editable with `suggest_value()`. The strength of an edit variable can not be required. '''
+        if variable in self._edits:
+            raise DuplicateEditVariable(variable)
+        __strength = Strength.clip(strength)
+        if __strength == Strength.REQUIRED:
+            raise ValueError("An edit variable can not be required")
+        __constraint = Constraint(Expression({variable: 1.0}), '==', __strength)
+        self.add_constraint(__constraint)
+        self._edits[variable] = [__constraint, self._constraints[__constraint], 0.0]
+
+    def remove_edit_variable(self, variable:Variable) -> None:
+        __edit = self._edits.pop(variable, None)
+        if __edit is None:
+            raise UnknownEditVariable(variable)
+        self.remove_constraint(__edit[0])
+
+    def has_edit_variable(self, variable:Variable) -> bool:
+        return variable in self._edits
+
+    def suggest_value(self, variable:Variable, value:float) -> None:
+        '''
+        Asks for `value` as the value of the edit variable. Only the rows that depend on the variable are updated,
+        and only the rows that became infeasible are pivoted again.
+        '''
+        __edit = self._edits.get(variable)
+        if __edit is None:
+            raise UnknownEditVariable(variable)
+
+        __delta = value - __edit[2]
+        if __delta == 0:
+            return
+        __edit[2] = value
+        __tag = __edit[1]
+
+        __row = self._rows.get(__tag.marker)
+        if __row is not None:
+            if __row.add(-__delta) < 0.0:
+                self._infeasible.append(__tag.marker)
+        else:
+            __row = self._rows.get(__tag.other)
+            if __row is not None:
+                if __row.add(__delta) < 0.0:
+                    self._infeasible.append(__tag.other)
+            else:
+                for symbol, row in self._rows.items():
+                    __coefficient = row.cells.get(__tag.marker)
+                    if __coefficient is not None and row.add(__delta * __coefficient) < 0.0 and symbol.kind != _EXTERNAL:
+                        self._infeasible.append(symbol)
+
+        self._dual_optimize()
+
+    def update_variables(self) -> None:
+        for variable, symbol in self._variables.items():
+            __row = self._rows.get(symbol)
+            variable.value = __row.constant if __row is not None else 0.0
+
+    def get_value(self, variable:Variable) -> float:
+        ''' The current value of a variable, without updating the other variables. '''
+        __row = self._rows.get(self._variables.get(variable))
+        return __row.constant if __row is not None else 0.0
+
+    def _get_variable_symbol(self, variable:Variable) -> _Symbol:
+        __symbol = self._variables.get(variable)
+        if __symbol is None:
+            __symbol = self._variables[variable] = _Symbol(_EXTERNAL)
+        return __symbol
+
+    def _create_row(self, constraint:Constraint, tag:_Tag) -> _Row:
+        ''' Creates the row of a constraint, with the variables already in the tableau replaced by their rows. '''
+        __expression = constraint.expression
+        __row = _Row(__expression.constant)
+        for variable, coefficient in __expression.terms.items():
+            if abs(coefficient) < _EPSILON:
+                continue
+            __symbol = self._get_variable_symbol(variable)
+            __basic = self._rows.get(__symbol)
+            if __basic is not None:
+                __row.insert_row(__basic, coefficient)
+            else:
+                __row.insert_symbol(__symbol, coefficient)
+
+        if constraint.op != '==':
+            __coefficient = 1.0 if constraint.op == '<=' else -1.0
+            __slack = _Symbol(_SLACK)
+            tag.marker = __slack
+            __row.insert_symbol(__slack, __coefficient)
+            if constraint.strength < Strength.REQUIRED:
+                __error = _Symbol(_ERROR)
+                tag.other = __error
+                __row.insert_symbol(__error, -__coefficient)
+                self._objective.insert_symbol(__error, constraint.strength)
+        elif constraint.strength < Strength.REQUIRED:
+            __plus, __minus = _Symbol(_ERROR), _Symbol(_ERROR)
+            tag.marker = __plus
+            tag.other = __minus
+            __row.insert_symbol(__plus, -1.0)
+            __row.insert_symbol(__minus, 1.0)
+            self._objective.insert_symbol(__plus, constraint.strength)
+            self._objective.insert_symbol(__minus, constraint.strength)
+        else:
+            __dummy = _Symbol(_DUMMY)
+            tag.marker = __dummy
+            __row.insert_symbol(__dummy)
+
+        if __row.constant < 0.0:
+            __row.reverse_sign()
+        return __row
+
+    @staticmethod
+    def _choose_subject(row:_Row, tag:_Tag) -> _Symbol:
+        ''' The symbol the new row is solved for: an external variable, or a slack or error symbol of the constraint with a negative coefficient. '''
+        for symbol in row.cells:
+            if symbol.kind == _EXTERNAL:
+                return symbol
+        for symbol in (tag.marker, tag.other):
+            if symbol is not None and symbol.kind in (_SLACK, _ERROR) and row.cells.get(symbol, 0.0) < 0.0:
+                return symbol
+        return None
+
+    def _add_with_artificial_variable(self, row:_Row) -> bool:
+        ''' Adds a row that has no subject with an artificial variable, which is then driven out of the basis. Returns False if the row is infeasible. '''
+        __artificial = _Symbol(_SLACK)
+        self._rows[__artificial] = row.copy()
+        self._artificial = row.copy()
+        self._optimize(self._artificial)
+        __success = abs(self._artificial.constant) < _EPSILON
+        self._artificial = None
+
+        __row = self._rows.pop(__artificial, None)
+        if __row is not None:
+            if not __row.cells:
+                return __success
+            __entering = next((symbol for symbol in __row.cells if symbol.kind in (_SLACK, _ERROR)), None)
+            if __entering is None:
+                return False
+            __row.solve_for_pair(__artificial, __entering)
+            self._substitute(__entering, __row)
+            self._rows[__entering] = __row
+
+        for row in self._rows.values():
+            row.cells.pop(__artificial, None)
+        self._objective.cells.pop(__artificial, None)
+        return __success
+
+    def _substitute(self, symbol:_Symbol, row:_Row) -> None:
+        ''' Replaces `symbol` by `row` in every row of the tableau and in the objectives. '''
+        for key, other in self._rows.items():
+            if symbol in other.cells:
+                other.substitute(symbol, row)
+                if key.kind != _EXTERNAL and other.constant < 0.0:
+                    self._infeasible.append(key)
+        self._objective.substitute(symbol, row)
+        if self._artificial is not None:
+            self._artificial.substitute(symbol, row)
+
+    def _optimize(self, objective:_Row) -> None:
+        ''' Pivots until no symbol of `objective` can decrease it, the primal simplex method. '''
+        while True:
+            __entering = next((symbol for symbol, coefficient in objective.cells.items() if symbol.kind != _DUMMY and coefficient < 0.0), None)
+            if __entering is None:
+                return
+
+            __ratio, __leaving = math.inf, None
+            for symbol, row in self._rows.items():
+                if symbol.kind != _EXTERNAL:
+                    __coefficient = row.cells.get(__entering, 0.0)
+                    if __coefficient < 0.0 and -row.constant / __coefficient < __ratio:
+                        __ratio, __leaving = -row.constant / __coefficient, symbol
+            if __leaving is None:
+                raise RuntimeError("The objective is unbounded")
+
+            __row = self._rows.pop(__leaving)
+            __row.solve_for_pair(__leaving, __entering)
+            self._substitute(__entering, __row)
+            self._rows[__entering] = __row
+
+    def _dual_optimize(self) -> None:
+        ''' Pivots the infeasible rows back to feasibility, the dual simplex method. '''
+        while self._infeasible:
+            __leaving = self._infeasible.pop()
+            __row = self._rows.get(__leaving)
+            if __row is None or __row.constant >= 0.0 or abs(__row.constant) < _EPSILON:
+                continue
+
+            __ratio, __entering = math.inf, None
+            for symbol, coefficient in __row.cells.items():
+                if coefficient > 0.0 and symbol.kind != _DUMMY:
+                    __value = self._objective.cells.get(symbol, 0.0) / coefficient
+                    if __value < __ratio:
+                        __ratio, __entering = __value, symbol
+            if __entering is None:
+                raise RuntimeError("The dual optimization failed")
+
+            del self._rows[__leaving]
+            __row.solve_for_pair(__leaving, __entering)
+            self._substitute(__entering, __row)
+            self._rows[__entering] = __row
+
+    def _get_marker_leaving_symbol(self, marker:_Symbol) -> _Symbol:
+        ''' The row to pivot out for `marker` when the constraint of the marker is removed. '''
+        __first_ratio = __second_ratio = math.inf
+        __first = __second = __third = None
+        for symbol, row in self._rows.items():
+            __coefficient = row.cells.get(marker, 0.0)
+            if __coefficient == 0.0:
+                continue
+            if symbol.kind == _EXTERNAL:
+                __third = symbol
+            elif __coefficient < 0.0:
+                __ratio = -row.constant / __coefficient
+                if __ratio < __first_ratio:
+                    __first_ratio, __first = __ratio, symbol
+            else:
+                __ratio = row.constant / __coefficient
+                if __ratio < __second_ratio:
+                    __second_ratio, __second = __ratio, symbol
+        return __first or __second or __third
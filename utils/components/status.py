@@ -0,0 +1,152 @@
+import gc, sys, time
+from typing import Dict
+from pydantic import Field
+from pyglet import clock
+from pyglet.text import Label
+
+from utils.components.window import ComponentWindow, ComponentWindowModel, ComponentWindowsManager
+from utils.metrics.draw_calls import DrawCallCounter
+from const import STYLES
+
+
+class ComponentStatusWindowModel(ComponentWindowModel):
+    '''
+    The settings of a `ComponentStatusWindow`, validated when the window is created.
+    '''
+    update_interval:float = 0.5
+    column_width:float = 250
+    count_draw_calls:bool = True
+    labels:Dict[str, Label] = Field(default_factory=dict)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class ComponentStatusWindow(ComponentWindow):
+    '''
+    The `ComponentStatusWindow` class is a `ComponentWindow` that shows the performance of its manager in a row of labels:
+
+    - `frame`: the 50th, 95th and 99th percentiles of the time of the last frames drawn by the manager.
+    - `draws`: the draw calls of the last frame and the windows culled by the manager. 
+        If the manager does not count the draw calls, the window installs a `DrawCallCounter`, unless `count_draw_calls` is False.
+        The counter wraps the draw functions of pyglet for the whole process: the window uninstalls it when it is deleted or released.
+    - `batches`: the batches the windows draw into, their vertex domains and the vertices allocated in them.
+        pyglet merges the neighbouring vertex lists of a domain, so the vertices are counted rather than the lists.
+    - `layout`: the layout passes of the manager per second.
+    - `heap`: the memory blocks allocated by Python.
+    - `gc`: the collections of each generation of the garbage collector.
+
+    The labels are created once in `on_init` and their text is updated every `update_interval` seconds, only if it changed,
+    so the window costs nothing in the frames between two updates. A label that does not fit in the window is hidden.
+    '''
+    MODEL:type = ComponentStatusWindowModel
+    METRICS:tuple = ('frame', 'draws', 'batches', 'layout', 'heap', 'gc')
+    RESOURCES:tuple = ComponentWindow.RESOURCES + ('labels',)
+
+    def __init__(self, model:ComponentStatusWindowModel = None, **data):
+        super().__init__(model, **data)
+        # The counter installed by this window and the manager it was given to
+        self.__dict__.update(_last_update=time.perf_counter(), _last_layout_passes=0, _draw_call_counter=None, _draw_call_manager=None)
+
+    def get_metrics(self) -> Dict[str, str]:
+        ''' The text of every label. '''
+        __manager = self.get_manager()
+        if not isinstance(__manager, ComponentWindowsManager):
+            return {metric: f'{metric} -' for metric in self.METRICS}
+
+        __now = time.perf_counter()
+        __elapsed, self._last_update = max(__now - self._last_update, 1e-6), __now
+        __passes, self._last_layout_passes = __manager.layout_passes - self._last_layout_passes, __manager.layout_passes
+
+        __frames = sorted(__manager.frame_times)
+        if __frames:
+            __percentiles = [__frames[min(int(len(__frames) * percent), len(__frames) - 1)] for percent in (0.5, 0.95, 0.99)]
+            __frame = 'frame {:.1f} / {:.1f} / {:.1f} ms'.format(*__percentiles)
+        else:
+            __frame = 'frame -'
+
+        __batches = {window.batch for window in __manager.walk() if getattr(window, 'batch', None) is not None}
+        __domains = [domain for batch in __batches for domains in batch.group_map.values() for domain in domains.values()]
+        __vertices = sum(sum(domain.allocator.get_allocated_regions()[1]) for domain in __domains)
+        __collections = '/'.join(str(generation['collections']) for generation in gc.get_stats())
+
+        return {
+            'frame': __frame,
+            'draws': (f'draws {__manager.draw_calls}' if __manager.draw_call_counter is not None else 'draws -') + f', culled {__manager.culled_windows}',
+            'batches': f'batches {len(__batches)}, domains {len(__domains)}, {__vertices} vertices',
+            'layout': f'layout {__passes / __elapsed:.1f}/s',
+            'heap': f'heap {sys.getallocatedblocks() / 1000:.1f}k blocks',
+            'gc': f'gc {__collections}',
+        }
+
+    def update_metrics(self, dt:float = 0.0) -> None:
+        '''
+        Updates the text of the labels, called every `update_interval` seconds. The content is invalidated only if a text changed.
+        '''
+        __changed = False
+        for metric, text in self.get_metrics().items():
+            __label = self.labels.get(metric)
+            if __label is not None and __label.text != text:
+                __label.text = text
+                __changed = True
+
+        if __changed:
+            self.invalidate_content()
+
+    def get_shapes(self) -> list:
+        return super().get_shapes() + list(self.labels.values())
+
+    def uninstall_draw_call_counter(self) -> None:
+        """ Uninstalls the `DrawCallCounter` this window installed, and takes it from its manager. """
+        if self._draw_call_counter is None:
+            return
+        self._draw_call_counter.uninstall()
+        if self._draw_call_manager.draw_call_counter is self._draw_call_counter:
+            self._draw_call_manager.draw_call_counter = None
+        self._draw_call_counter = self._draw_call_manager = None
+
+    def delete(self) -> None:
+        clock.unschedule(self.update_metrics)
+        self.uninstall_draw_call_counter()
+        super().delete()
+        self.labels = {}
+
+    def on_release(self) -> None:
+        """ A pooled window stops updating its labels and counting the draw calls, `on_init()` starts again. """
+        clock.unschedule(self.update_metrics)
+        self.uninstall_draw_call_counter()
+        super().on_release()
+
+    def on_redraw(self) -> None:
+        """ Places the labels in a row, in the middle of the window below its title. """
+        super().on_redraw()
+        __height = self.size.height - (self.title_height if self.show_title else 0)
+        for index, metric in enumerate(self.METRICS):
+            __label = self.labels.get(metric)
+            if __label is None:
+                continue
+            __x = self.position.x + 10 + index * self.column_width
+            __label.visible = __x + self.column_width <= self.position.x + self.size.width
+            __label.position = (__x, self.position.y + __height / 2, 0)
+
+    def on_init(self) -> None:
+        """ Creates the labels once and starts updating them. """
+        super().on_init()
+        __manager = self.get_manager()
+        if self.count_draw_calls and isinstance(__manager, ComponentWindowsManager) and __manager.draw_call_counter is None:
+            __manager.draw_call_counter = self._draw_call_counter = DrawCallCounter()
+            __manager.draw_call_counter.install()
+            self._draw_call_manager = __manager
+
+        if not self.labels:
+            self.labels = {metric: Label('',
+                                         font_name=STYLES.FONT.value,
+                                         color=self.title_color.__repr__(),
+                                         font_size=STYLES.FONT_SIZE.value - 2,
+                                         anchor_y='center',
+                                         batch=self.content_batch,
+                                         group=self.content_group) for metric in self.METRICS}
+        clock.unschedule(self.update_metrics)
+        clock.schedule_interval(self.update_metrics, self.update_interval)
+        self.update_metrics()
+        self.on_redraw()
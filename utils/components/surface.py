@@ -0,0 +1,155 @@
+from pyglet import gl
+from pyglet.graphics import Batch, Group
+from pyglet.image import Texture
+from pyglet.image.buffer import Framebuffer
+from pyglet.math import Mat4, Vec3
+from pyglet.sprite import Sprite
+
+
+class ScissorGroup(Group):
+    '''
+    A group that clips what its children draw to a rectangle of the framebuffer with the scissor test.
+
+    Every `ScissorGroup` is a distinct state: the groups of two windows are never merged by a batch, even with the same order and parent,
+    so each clipped window costs its own draw call for the shapes of its content.
+
+    Args:
+        x, y, width, height (float): The clipped rectangle, in the coordinates of the window.
+        scale (float): The ratio of the framebuffer pixels to the window coordinates, see `pyglet.window.Window.get_pixel_ratio()`.
+    '''
+    def __init__(self, x:float = 0, y:float = 0, width:float = 0, height:float = 0, scale:float = 1.0, order:int = 0, parent:Group = None):
+        super().__init__(order, parent)
+        self.scale = scale
+        self.area = (x, y, width, height)
+
+    def set_area(self, x:float, y:float, width:float, height:float, scale:float = None) -> None:
+        if scale is not None:
+            self.scale = scale
+        self.area = (x, y, width, height)
+
+    def set_state(self) -> None:
+        x, y, width, height = (int(value * self.scale) for value in self.area)
+        gl.glEnable(gl.GL_SCISSOR_TEST)
+        gl.glScissor(x, y, max(width, 0), max(height, 0))
+
+    def unset_state(self) -> None:
+        gl.glDisable(gl.GL_SCISSOR_TEST)
+
+    def __eq__(self, other:Group) -> bool:
+        return self is other
+
+    def __hash__(self) -> int:
+        return id(self)
+
+
+class ComponentContentSurface:
+    '''
+    An offscreen render target caching the content of a window.
+
+    The content is drawn into `batch`, which is not drawn by the manager. When the content was invalidated, `render()` draws the batch
+    once into a texture, through a framebuffer object, and `sprite` shows the texture in the batch of the manager in the following frames:
+    unchanged content costs a single textured quad per frame, whatever its number of shapes and glyphs.
+
+    The texture only grows, by steps of `GRANULARITY` pixels, so resizing the window does not allocate a texture on every frame.
+    The content keeps the coordinates of the window: while it is rendered, the view is translated to the origin of the content area.
+
+    Args:
+        batch (Batch): The batch of the manager, where the sprite is drawn.
+        group (Group): The group of the sprite.
+    '''
+    GRANULARITY:int = 256
+
+    def __init__(self, batch:Batch, group:Group = None):
+        self.batch = Batch()
+        self.sprite = None
+        self.renders = 0
+        self._sprite_batch = batch
+        self._sprite_group = group
+        self._texture = None
+        self._framebuffer = None
+        self._area = (0, 0, 0, 0)
+        self._clear_color = (0, 0, 0, 0)
+        self._dirty = True
+
+    def is_dirty(self) -> bool:
+        return self._dirty
+
+    def invalidate(self) -> None:
+        """ The content changed, it is rendered again before the next frame is drawn. """
+        self._dirty = True
+
+    def set_area(self, x:float, y:float, width:float, height:float, clear_color:tuple = None) -> None:
+        """ Places the cached content. A new area, or a new background color, invalidates the content. """
+        __area = (int(x), int(y), max(int(width), 0), max(int(height), 0))
+        if clear_color is not None and tuple(clear_color) != self._clear_color:
+            self._clear_color = tuple(clear_color)
+            self._dirty = True
+        if __area != self._area:
+            self._area = __area
+            self._dirty = True
+
+    def _allocate(self, width:int, height:int) -> None:
+        """ Creates a texture large enough for the area, and its framebuffer, if the current one is too small. """
+        if self._texture is not None and self._texture.width >= width and self._texture.height >= height:
+            return
+        __width = -(-max(width, 1) // self.GRANULARITY) * self.GRANULARITY
+        __height = -(-max(height, 1) // self.GRANULARITY) * self.GRANULARITY
+        if self._texture is not None:
+            __width, __height = max(__width, self._texture.width), max(__height, self._texture.height)
+            self._framebuffer.delete()
+            self._texture.delete()
+        self._texture = Texture.create(__width, __height, min_filter=gl.GL_NEAREST, mag_filter=gl.GL_NEAREST)
+        self._framebuffer = Framebuffer()
+        self._framebuffer.attach_texture(self._texture, attachment=gl.GL_COLOR_ATTACHMENT0)
+
+    def render(self, window) -> bool:
+        """
+        Draws the content into the texture if it was invalidated. `window` is the pyglet window of the manager, whose
+        projection and view are replaced while the content is drawn. Returns True if the content was rendered.
+        """
+        if not self._dirty:
+            return False
+        self._dirty = False
+        x, y, width, height = self._area
+        if width == 0 or height == 0:
+            if self.sprite is not None:
+                self.sprite.visible = False
+            return False
+
+        self._allocate(width, height)
+        __projection, __view = window.projection, window.view
+        __clear_color = (gl.GLfloat * 4)()
+        gl.glGetFloatv(gl.GL_COLOR_CLEAR_VALUE, __clear_color)
+        self._framebuffer.bind()
+        gl.glViewport(0, 0, width, height)
+        gl.glClearColor(*self._clear_color)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+        window.projection = Mat4.orthogonal_projection(0, width, 0, height, -255, 255)
+        window.view = Mat4.from_translation(Vec3(-x, -y, 0))
+        try:
+            self.batch.draw()
+        finally:
+            self._framebuffer.unbind()
+            window.projection, window.view = __projection, __view
+            window.viewport = window.viewport
+            gl.glClearColor(*__clear_color)
+        self.renders += 1
+
+        __region = self._texture.get_region(0, 0, width, height)
+        if self.sprite is None:
+            # The texture is opaque, cleared with the background: it is copied, blending it again would fade the blended edges
+            self.sprite = Sprite(__region, x, y, blend_src=gl.GL_ONE, blend_dest=gl.GL_ZERO, batch=self._sprite_batch, group=self._sprite_group)
+        else:
+            self.sprite.image = __region
+            self.sprite.position = (x, y, 0)
+        self.sprite.visible = True
+        return True
+
+    def delete(self) -> None:
+        if self.sprite is not None:
+            self.sprite.delete()
+            self.sprite = None
+        if self._texture is not None:
+            self._framebuffer.delete()
+            self._texture.delete()
+            self._texture = self._framebuffer = None
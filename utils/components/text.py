@@ -0,0 +1,197 @@
+import string
+import numpy as np
+from typing import Literal
+from pyglet.text import Label
+
+from utils.types.t_utils import GLYPH_CACHE
+
+
+class ComponentNumericLabel:
+    '''
+    A single line label made of a static text and numeric fields, whose values are updated without laying the text out again.
+
+    The label is laid out once from `template`, a format string whose `{}` fields get `digits` cells each.
+    The digits of most fonts have the same advance, so every cell has a fixed place: a new value only replaces the vertices and the
+    texture coordinates of the glyphs in the cells of its field. The values are right aligned, or left aligned with `align='left'`,
+    the blank cells are empty quads.
+    Setting a value costs a few assignments per changed cell, instead of the glyph lookup and the new vertex lists of `Label.text`.
+    The cells of wide fields, such as the lines of a console, are written with a few array operations per field.
+
+    A value longer than its cells, or a character whose glyph is in another texture than the cells, lays the label out again,
+    with wider fields if needed. The fields shrink back to `digits` cells once the values fit in them again. Numbers are rounded to integers. The glyphs of the values are looked up in `GLYPH_CACHE`.
+
+    Args:
+        template (str): The text of the label, with a `{}` for every numeric field.
+        values (tuple): The initial values of the fields.
+        digits (int): The number of cells of a field.
+        align (str): `right` or `left`, the side of its cells a value is aligned to.
+        The other keyword arguments are passed to the `Label`.
+    '''
+    # The fields of at least `ARRAY_CELLS` cells are updated with array operations, the others cell by cell
+    ARRAY_CELLS:int = 16
+
+    def __init__(self, template:str, values:tuple = (), digits:int = 4, font_name:str = None, font_size:float = None,
+                 bold:bool = False, italic:bool = False, align:Literal['left', 'right'] = 'right', **kwargs):
+        self._template = template
+        self._fields = len([field for _, field, _, _ in string.Formatter().parse(template) if field is not None])
+        self._digits = self._min_digits = digits
+        self._align = align
+        self._style = (font_name, font_size, bold, italic)
+        self._label = Label('', font_name=font_name, font_size=font_size, weight='bold' if bold else 'normal', italic=italic, **kwargs)
+        self._texts = [''] * self._fields
+        self._cells = self._runs = None
+        self.layouts = 0
+        self._layout()
+        if values:
+            self.set_values(*values)
+
+    @property
+    def label(self) -> Label:
+        return self._label
+
+    @property
+    def text(self) -> str:
+        ''' The text shown by the label. '''
+        return self._template.format(*(self.justify(text) for text in self._texts))
+
+    @property
+    def values(self) -> tuple:
+        return tuple(self._texts)
+
+    @property
+    def position(self) -> tuple:
+        return self._label.position
+
+    @position.setter
+    def position(self, position:tuple) -> None:
+        self._label.position = position
+
+    @property
+    def visible(self) -> bool:
+        return self._label.visible
+
+    @visible.setter
+    def visible(self, visible:bool) -> None:
+        self._label.visible = visible
+
+    @property
+    def color(self) -> tuple:
+        return self._label.color
+
+    @color.setter
+    def color(self, color:tuple) -> None:
+        if tuple(self._label.color) != tuple(color):
+            self._label.color = color
+
+    @property
+    def content_width(self) -> int:
+        return self._label.content_width
+
+    def justify(self, text:str) -> str:
+        ''' The text of a value padded to the cells of a field. '''
+        return text.ljust(self._digits) if self._align == 'left' else text.rjust(self._digits)
+
+    @staticmethod
+    def format_value(value) -> str:
+        ''' The text of a value: numbers rounded to integers, the fractional sizes of a layout would widen the fields. '''
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(round(value))
+        return str(value)
+
+    def _layout(self) -> None:
+        '''
+        Lays the label out with zeros in the cells, finds the vertices of the cells and shows the current values in them.
+        If the quads of the label do not match its glyphs one to one, the label shows its text laid out as usual and every update lays it out.
+        '''
+        self.layouts += 1
+        self._cells = self._runs = None
+        self._label.text = self._template.format(*(['0' * self._digits] * self._fields))
+
+        __glyphs = GLYPH_CACHE.get_default().get_glyphs(*self._style[:2], self._label.text, *self._style[2:])
+        __quads = [(vertex_list, index) for vertex_list in self._label._vertex_lists for index in range(vertex_list.count // 4)]
+        __cells, __runs, __start = [], [], 0
+        for literal, field, _, _ in string.Formatter().parse(self._template):
+            __start += len(literal)
+            if field is None:
+                continue
+            __field = []
+            for index in range(__start, __start + self._digits):
+                if len(__quads) != len(__glyphs) or list(__quads[index][0].tex_coords[__quads[index][1] * 12:__quads[index][1] * 12 + 12]) != list(__glyphs[index].tex_coords):
+                    self._label.text = self.text
+                    return
+                vertex_list, quad = __quads[index]
+                # The origin of the cell, the vertices of a glyph are relative to it
+                __position = vertex_list.position[quad * 12:quad * 12 + 2]
+                __field.append((vertex_list, quad, __position[0] - __glyphs[index].vertices[0], __position[1] - __glyphs[index].vertices[1], __glyphs[index].owner))
+            __cells.append(__field)
+            # The cells of a wide field are usually consecutive quads of one vertex list, written at once from the glyph arrays of `GLYPH_CACHE`
+            __consecutive = all(cell[0] is __field[0][0] and cell[1] == __field[0][1] + index for index, cell in enumerate(__field))
+            if len(__field) >= self.ARRAY_CELLS and __consecutive:
+                # The origins of the cells, added to the vertices of the glyphs
+                __origins = np.zeros((len(__field), 12), dtype=np.float32)
+                __origins[:, 0::3] = np.array([cell[2] for cell in __field], dtype=np.float32)[:, None]
+                __origins[:, 1::3] = np.array([cell[3] for cell in __field], dtype=np.float32)[:, None]
+                __runs.append((__field[0][0], __field[0][1], id(__field[0][4]), __origins))
+            else:
+                __runs.append(None)
+            __start += self._digits
+
+        self._cells, self._runs = __cells, __runs
+        for field in range(self._fields):
+            if not self._update_field(field):
+                self._cells = None
+                self._label.text = self.text
+                return
+
+    def _update_field(self, field:int) -> bool:
+        ''' Shows the text of a field in its cells. Returns False if a glyph is not in the texture of its cell. '''
+        __text = self.justify(self._texts[field])
+        if self._runs[field] is not None:
+            vertex_list, quad, owner, origins = self._runs[field]
+            __quads, __tex_coords, __owners = GLYPH_CACHE.get_default().get_quads(*self._style[:2], __text, *self._style[2:])
+            if ((__owners != owner) & (__owners != 0)).any():
+                return False
+            np.ctypeslib.as_array(vertex_list.position)[quad * 12:quad * 12 + __quads.size] = (__quads + origins).ravel()
+            np.ctypeslib.as_array(vertex_list.tex_coords)[quad * 12:quad * 12 + __tex_coords.size] = __tex_coords.ravel()
+            return True
+
+        __glyphs = GLYPH_CACHE.get_default().get_glyphs(*self._style[:2], __text, *self._style[2:])
+        __positions, __tex_coords = [], []
+        for (_, _, x, y, owner), character, glyph in zip(self._cells[field], __text, __glyphs):
+            if character == ' ':
+                __positions += (x, y, 0) * 4
+            elif glyph.owner is not owner:
+                return False
+            else:
+                v0, v1, v2, v3 = glyph.vertices
+                __positions += (v0 + x, v1 + y, 0, v2 + x, v1 + y, 0, v2 + x, v3 + y, 0, v0 + x, v3 + y, 0)
+            __tex_coords += glyph.tex_coords
+        for index, (vertex_list, quad, _, _, _) in enumerate(self._cells[field]):
+            vertex_list.position[quad * 12:quad * 12 + 12] = __positions[index * 12:index * 12 + 12]
+            vertex_list.tex_coords[quad * 12:quad * 12 + 12] = __tex_coords[index * 12:index * 12 + 12]
+        return True
+
+    def set_values(self, *values) -> None:
+        ''' Shows new values in the fields. Only the cells of the fields whose text changed are updated. '''
+        __texts = [self.format_value(value) for value in values] + [''] * (self._fields - len(values))
+        if __texts == self._texts:
+            return
+
+        __previous, self._texts = self._texts, __texts
+        __length = max((len(text) for text in __texts), default=0)
+        # The fields widen for a long value, and shrink back to `digits` cells when the values fit again
+        if __length > self._digits or (self._digits > self._min_digits and __length <= self._min_digits):
+            self._digits = max(__length, self._min_digits)
+            self._layout()
+            return
+        if self._cells is None:
+            self._label.text = self.text
+            return
+
+        for field, text in enumerate(__texts):
+            if text != __previous[field] and not self._update_field(field):
+                self._layout()
+                return
+
+    def delete(self) -> None:
+        self._label.delete()
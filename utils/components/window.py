@@ -1,129 +1,500 @@
-import os
-from pyglet import resource, window, app, clock
+import threading, time
+import numpy as np
+from collections import deque
+from pyglet import window, app, clock
 
-from pyglet.graphics import Batch
+from pyglet.graphics import Batch, Group
 from pyglet.shapes import Rectangle
 from pyglet.text import Label
 from pyglet.sprite import Sprite
 from pyglet.image import AbstractImage
 
-from classes.windows.c_window import Window, WindowsManager
+from classes.windows.c_window import Window, WindowsManager, WindowModel, WindowsManagerModel
 from utils.types.t_colors import RGB,RGBA
 from utils.types.t_vectors import SVEC2, VEC2
-
-from pydantic import field_validator
+from utils.types.t_utils import ICON_ATLAS, GLYPH_CACHE
+from utils.components.text import ComponentNumericLabel
+from utils.components.surface import ScissorGroup, ComponentContentSurface
+from utils.components.input import ComponentInputDispatcher
+from utils.metrics.draw_calls import DrawCallCounter
+from utils.metrics.profiler import Profiler
+
+from typing import Dict, Literal
+from pydantic import Field, field_validator, field_serializer
 from const import STYLES
 
-class ComponentWindow(Window): 
+class ComponentWindowModel(WindowModel):
     '''
-    The `ComponentWindow` class is a custom window implementation that extends the `Window` class. It provides a set of properties and methods to manage the appearance and behavior of a window, including:
-
-    - `batch`: A `Batch` object used for drawing the window's contents.
-    - `background`: A `Rectangle` object representing the window's background.
-    - `background_color`: The RGB color of the window's background.
-    - `title_background_color`: The RGB color of the window's title bar background.
-    - `title_color`: The RGB or RGBA color of the window's title text.
-    - `title`: The title of the window, or the name of the window if not set.
-    - `title_height`: The height of the window's title bar.
-    - `title_icon`: An `AbstractImage` object representing the icon to be displayed in the title bar.
-    - `show_title`: A boolean indicating whether the title bar should be displayed.
-
-    The class also includes methods for drawing the window's contents (`on_draw`), redrawing the window when it is resized (`on_redraw`), initializing the window (`on_init`), and handling window resizing events (`on_resize`). The `run` method is included but does not contain any implementation.
+    The settings of a `ComponentWindow`, validated when the window is created.
     '''
     batch:Batch = None
+    background_group:Group = None
+    title_group:Group = None
+    icon_group:Group = None
+    content_group:Group = None
     background:Rectangle = None
-    background_color:RGB = STYLES.COLOR_BALANCE.value.BACKGROUND.value
-    title_background_color:RGB = STYLES.COLOR_BALANCE.value.BACKGROUND.value + 5
-    title_color:RGB|RGBA = STYLES.COLOR_BALANCE.value.ON_BACKGROUND.value
+    background_color:RGB = Field(default_factory=STYLES.COLOR_BALANCE.value.BACKGROUND.value.copy)
+    title_background_color:RGB = Field(default_factory=(STYLES.COLOR_BALANCE.value.BACKGROUND.value + 5).copy)
+    title_color:RGB|RGBA = Field(default_factory=STYLES.COLOR_BALANCE.value.ON_BACKGROUND.value.copy)
     title:str = None
     title_height:float = 24
-    title_icon:AbstractImage = STYLES.ICONS.value.NOICON.value.icon
-    title_icon.width = STYLES.ICONS.value.NOICON.value.size.width
-    title_icon.height = STYLES.ICONS.value.NOICON.value.size.height 
+    title_icon:AbstractImage = None
     show_title:bool = False
+    visible:bool = True
+    title_mode:Literal['full', 'split', 'static'] = 'split'
+    clip_content:bool = True
+    cache_content:bool = False
+    content_surface:ComponentContentSurface = None
 
     title_background: Rectangle = None
     title_label: Label = None
+    title_info_label: ComponentNumericLabel = None
     title_label_icon: Sprite = None
 
     class Config:
         arbitrary_types_allowed = True
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        if self.title is None:
-            self.title = self.name
- 
     @field_validator('title_icon', mode='before')
-    def validate_title_icon(cls, value:str|AbstractImage) -> None:
+    def validate_title_icon(cls, value:str|dict|AbstractImage) -> None:
+        if isinstance(value, dict):
+            __icon = cls.validate_title_icon(value.get('path'))
+            __icon.width = value.get('width', __icon.width)
+            __icon.height = value.get('height', __icon.height)
+            return __icon
         if isinstance(value, str):
-            if os.path.isfile(value):
-                return resource.image(value)
+            if ICON_ATLAS.get_default().exists(value):
+                return ICON_ATLAS.get_default().get(value)
             else:
-                raise ValueError(f"File does not exist: {value}")
-        elif isinstance(value, AbstractImage):
+                raise ValueError(f"Icon not found: {value}, neither in {ICON_ATLAS.ROOT} nor in pyglet.resource.path")
+        elif isinstance(value, AbstractImage) or value is None:
             return value
         else:
-            raise TypeError("title_icon must be a string path or AbstractImage")
+            raise TypeError("title_icon must be a string path, a dict with a path, a width and a height, or AbstractImage")
+
+    @field_serializer('title_icon')
+    def serialize_title_icon(self, value:AbstractImage) -> str|dict|None:
+        """ Icons of the `ICON_ATLAS` are saved as their path, with their size if they were resized. Other images are not saved. """
+        __path = ICON_ATLAS.get_default().find(value) if value is not None else None
+        if __path is None:
+            return None
+        if ICON_ATLAS.get_default().get_size(__path) == SVEC2(value.width, value.height):
+            return __path
+        return {'path': __path, 'width': value.width, 'height': value.height}
+
+
+class ComponentWindow(Window): 
+    '''
+    The `ComponentWindow` class is a custom window implementation that extends the `Window` class. It provides a set of properties and methods to manage the appearance and behavior of a window, including:
+
+    - `batch`: A `Batch` object used for drawing the window's contents. By default the window shares the batch of its `ComponentWindowsManager`.
+    - `background_group`, `title_group`, `icon_group`, `content_group`: The `Group` layers the window draws into. By default these are the shared layers of the manager,
+        except `content_group`, a `ScissorGroup` of the content layer clipped to the content area when `clip_content` is True and the content is not cached.
+    - `background`: A `Rectangle` object representing the window's background.
+    - `background_color`: The RGB color of the window's background.
+    - `title_background_color`: The RGB color of the window's title bar background.
+    - `title_color`: The RGB or RGBA color of the window's title text.
+    - `title`: The title of the window, or the name of the window if not set.
+    - `title_height`: The height of the window's title bar.
+    - `title_icon`: An `AbstractImage` object representing the icon to be displayed in the title bar. Defaults to the `NOICON` icon, loaded when the window is created.
+    - `show_title`: A boolean indicating whether the title bar should be displayed.
+    - `visible`: False hides the window. Its manager does not draw nor redraw it, like the windows it culls (see `ComponentWindowsManager.update_culling()`).
+    - `title_mode`: How the size and position of the window are shown after the title. 
+        `full` lays the whole title out again when they change, `split` lays the title out once and updates only the digits
+        of a `ComponentNumericLabel`, `static` shows the title alone.
+    - `clip_content`: Whether the content is clipped to the content area, the window below its title bar (see `get_content_rect()`).
+    - `cache_content`: Whether the content is drawn once into a `ComponentContentSurface`, and shown from its texture until it changes.
+        Read in `on_init`. The content is then drawn into `content_batch` and the window calls `invalidate_content()` when it changes.
+        It needs the pyglet window of a manager, whose projection is replaced while the content is rendered.
+
+    Panels draw their content in `content_batch` and `content_group`, in the coordinates of the manager like the rest of the window.
+    They receive the input routed by the `ComponentInputDispatcher` of the manager by defining the pyglet event handlers they need,
+    `on_mouse_press`, `on_mouse_scroll`, `on_key_press`, ... and `on_mouse_enter` and `on_mouse_leave` for the hover.
+
+    The class also includes methods for drawing the window's contents (`on_draw`), redrawing the window when it is resized (`on_redraw`), initializing the window (`on_init`), and handling window resizing events (`on_resize`). The `run` method is included but does not contain any implementation.
+    '''
+    MODEL:type = ComponentWindowModel
+
+    def __init__(self, model:ComponentWindowModel = None, **data):
+        super().__init__(model, **data)
+        if self.title is None:
+            self.__dict__['title'] = self.name
+        if self.title_icon is None:
+            self.__dict__['title_icon'] = STYLES.ICONS.value.NOICON.value.icon
+        self.__dict__['_culled'] = False
+
+    def __setattr__(self, name:str, value) -> None:
+        super().__setattr__(name, value)
+        # Properties that change the look of the window
+        if name in ('title', 'title_icon', 'title_height', 'show_title', 'title_mode', 'background_color', 'title_background_color', 'title_color', 'min_size', 'max_size'):
+            self.invalidate()
+        elif name == 'visible':
+            __manager = self.get_manager()
+            if isinstance(__manager, ComponentWindowsManager):
+                __manager.invalidate_culling()
+
+    def invalidate(self) -> None:
+        """ Marks the window dirty and asks the manager to draw a new frame. """
+        super().invalidate()
+        __manager = self.get_manager()
+        if isinstance(__manager, ComponentWindowsManager):
+            __manager.request_redraw()
+ 
+    def is_shared_batch(self) -> bool:
+        """ Checks if the window draws into the batch of its manager. """
+        __manager = self.get_manager()
+        return isinstance(__manager, ComponentWindowsManager) and self.batch is __manager.batch
 
     def on_draw(self) -> None: 
-        self.batch.draw()
+        # The shared batch is drawn once by the manager for all windows.
+        if not self._culled and not self.is_shared_batch():
+            self.batch.draw()
+
+    @property
+    def content_batch(self) -> Batch:
+        """ The batch of the content: the batch of the content surface if the content is cached, the batch of the window otherwise. """
+        return self.content_surface.batch if self.content_surface is not None else self.batch
+
+    def get_content_rect(self) -> tuple:
+        """ The rectangle of the content, the window below its title bar, as `(x, y, width, height)`. """
+        __height = self.size.height - (self.title_height if self.show_title else 0)
+        return (self.position.x, self.position.y, self.size.width, max(__height, 0))
+
+    def invalidate_content(self) -> None:
+        """ Asks for the content to be drawn again: the cached content is rendered again before the next frame. """
+        if self.content_surface is not None:
+            self.content_surface.invalidate()
+        __manager = self.get_manager()
+        if isinstance(__manager, ComponentWindowsManager):
+            __manager.request_redraw()
+
+    def request_frame(self) -> None:
+        """
+        Asks the manager for a frame, from any thread. Another thread wakes the event loop of the manager up with an `on_expose` event,
+        whose handler asks for the frame: the work of a thread is then picked up by the next redraw of the window, see `is_dirty()`.
+        """
+        __manager = self.get_manager()
+        if not isinstance(__manager, ComponentWindowsManager):
+            return
+        if threading.current_thread() is threading.main_thread():
+            __manager.request_redraw()
+        else:
+            app.platform_event_loop.post_event(__manager.window, 'on_expose')
+
+    # The runtime objects of the window that a recycled window keeps
+    RESOURCES:tuple = ('batch', 'background_group', 'title_group', 'icon_group', 'content_group', 'background', 'title_background',
+                       'title_label', 'title_info_label', 'title_label_icon', 'content_surface')
+
+    def delete(self) -> None:
+        """
+        Deletes the shapes, labels and content surface of the window, which frees their vertex lists and textures.
+        The window is not drawn anymore, `on_init()` would create them again.
+        """
+        if self.content_surface is not None:
+            self.content_surface.delete()
+        for shape in self.get_shapes():
+            if shape is not None:
+                shape.delete()
+        for name in self.RESOURCES:
+            self.__dict__[name] = None
+
+    def on_release(self) -> None:
+        """ Called when the window is kept in a `ComponentWindowPool`: its shapes are hidden until it is recycled. """
+        self.hide_shapes()
+
+    def recycle(self, model:ComponentWindowModel = None, **data) -> None:
+        """
+        Gives a released window new settings, as if it was created with them, but keeps its `RESOURCES`:
+        `on_init()` then places the shapes it already has instead of creating them.
+        """
+        __resources = {name: self.__dict__[name] for name in self.RESOURCES}
+        self.__init__(model, **data)
+        # A content surface or clipping the new settings do not ask for is replaced by on_init()
+        if (__resources['content_surface'] is not None) != bool(self.cache_content):
+            if __resources['content_surface'] is not None:
+                __resources['content_surface'].delete()
+            __resources['content_surface'] = __resources['content_group'] = None
+        if isinstance(__resources['content_group'], ScissorGroup) != (self.clip_content and __resources['content_surface'] is None):
+            __resources['content_group'] = None
+        for name, value in __resources.items():
+            if not self.__dict__.get(name):
+                self.__dict__[name] = value
+
+        if self.background is not None:
+            self.background.visible = True
+        if self.content_surface is not None:
+            self.content_surface.invalidate()
+
+    def get_shapes(self) -> list:
+        """ The shapes and labels drawn by the window, hidden while it is culled. """
+        return [self.background, self.title_background, self.title_label, self.title_info_label, self.title_label_icon,
+                self.content_surface.sprite if self.content_surface is not None else None]
+
+    def is_culled(self) -> bool:
+        return self._culled
+
+    def set_culled(self, culled:bool) -> None:
+        """
+        Hides the shapes of a window that is not drawn, without redrawing it. 
+        A window that is shown again is redrawn, its rectangle may have changed while it was culled.
+        """
+        if culled == self._culled:
+            return
+        self._culled = culled
+        if self.background is None:
+            return
+        if culled:
+            self.hide_shapes()
+        else:
+            self.background.visible = True
+            if self.content_surface is not None:
+                self.content_surface.invalidate()
+            self.on_redraw()
+
+    def hide_shapes(self) -> None:
+        for shape in self.get_shapes():
+            if shape is not None:
+                shape.visible = False
+
+    TITLE_INFO:str = 'Size: ({}, {}) Position: ({}, {})'
+
+    def get_title_text(self) -> str:
+        """ The text of the title label: the title, followed by the size and the position of the window in the `full` mode. """
+        if self.title_mode != 'full':
+            return self.title
+        return self.title + ' Size: ' +str((self.size.x, self.size.y)) + ' Position: ' + str((self.position.x, self.position.y))
 
     def on_redraw(self) -> None:
-        self.background = Rectangle(self.position.x, 
-                                    self.position.y, 
-                                    self.size.width, 
-                                    self.size.height, 
-                                    color=self.background_color.__repr__(), 
-                                    batch=self.batch)
+        """
+        Moves and resizes the retained shapes created in `on_init` to the current size and position of the window.
+        Nothing is allocated here, so calling it on every resize event is cheap.
+        """
+        if self.background is None:
+            return
+
+        self.background.color = self.background_color.__repr__()
+        self.title_background.color = self.title_background_color.__repr__()
+        self.title_label.color = self.title_color.__repr__()
+
+        self.background.position = (self.position.x, self.position.y)
+        self.background.width = self.size.width
+        self.background.height = self.size.height
+
+        __content = self.get_content_rect()
+        if isinstance(self.content_group, ScissorGroup):
+            __manager = self.get_manager()
+            __scale = __manager.window.get_pixel_ratio() if isinstance(__manager, ComponentWindowsManager) else 1.0
+            self.content_group.set_area(*__content, scale=__scale)
+        if self.content_surface is not None:
+            self.content_surface.set_area(*__content, clear_color=tuple(value / 255 for value in self.background_color.__repr__()[:3]) + (1.0,))
+
+        self.title_background.visible = self.show_title
+        self.title_label.visible = self.show_title
+        self.title_info_label.visible = self.show_title and self.title_mode == 'split'
+        self.title_label_icon.visible = self.show_title
+
         if self.show_title:
-            self.title_background = Rectangle(self.position.x, 
-                        self.position.y + self.size.height - self.title_height, 
-                        self.size.width, self.title_height, 
-                        color=self.title_background_color.__repr__(), 
-                        batch=self.batch)
-                
-            self.title_label = Label(self.title + ' Size: ' +str((self.size.x, self.size.y)) + ' Position: ' + str((self.position.x, self.position.y)), 
-                    font_name=STYLES.FONT.value, 
-                    color=self.title_color.__repr__(), 
-                    font_size=STYLES.FONT_SIZE.value, 
-                    x=self.position.x + 10 + self.title_icon.width, 
-                    y=self.position.y + self.size.height - self.title_height + (self.title_height - STYLES.FONT_SIZE.value + 3) / 2,
-                    batch=self.batch)
-                
-            self.title_label_icon = Sprite(img=self.title_icon, 
-                    x=self.position.x + 3, 
-                    y=self.position.y + self.size.height - self.title_height + (self.title_height - self.title_icon.width) / 2, 
-                    batch=self.batch)
+            self.title_background.position = (self.position.x, self.position.y + self.size.height - self.title_height)
+            self.title_background.width = self.size.width
+            self.title_background.height = self.title_height
+
+            __title_text = self.get_title_text()
+            if self.title_label.text != __title_text:
+                self.title_label.text = __title_text
+            self.title_label.position = (self.position.x + 10 + self.title_icon.width, 
+                                         self.position.y + self.size.height - self.title_height + (self.title_height - STYLES.FONT_SIZE.value + 3) / 2, 
+                                         0)
+
+            if self.title_mode == 'split':
+                self.title_info_label.color = self.title_color.__repr__()
+                self.title_info_label.set_values(self.size.x, self.size.y, self.position.x, self.position.y)
+                self.title_info_label.position = (self.title_label.x + self.title_label.content_width + GLYPH_CACHE.get_default().get_width(STYLES.FONT.value, STYLES.FONT_SIZE.value, ' '),
+                                                  self.title_label.y, 
+                                                  0)
+
+            if self.title_label_icon.image is not self.title_icon:
+                self.title_label_icon.image = self.title_icon
+            self.title_label_icon.position = (self.position.x + 3, 
+                                              self.position.y + self.size.height - self.title_height + (self.title_height - self.title_icon.width) / 2, 
+                                              0)
+
+        self.mark_clean()
 
     def on_init(self) -> None: 
+        """
+        Creates the batch and the retained shapes of the window once, then places them with `on_redraw`.
+        If the window belongs to a `ComponentWindowsManager`, the batch and the layer groups of the manager are used.
+        """
+        __manager = self.get_manager()
+        __shared = isinstance(__manager, ComponentWindowsManager)
+        __layers = __manager.layers if __shared else ComponentWindowsManager.create_layers()
+
         if self.batch == None:
-            self.batch = Batch()
-        self.on_redraw()
+            self.batch = __manager.batch if __shared else Batch()
+        if self.background_group is None:
+            self.background_group = __layers['background']
+        if self.title_group is None:
+            self.title_group = __layers['title']
+        if self.icon_group is None:
+            self.icon_group = __layers['icon']
+        if self.cache_content and self.content_surface is None and __shared and hasattr(__manager.window, 'projection'):
+            self.content_surface = ComponentContentSurface(self.batch, __layers['content'])
+        # The viewport of the surface clips the cached content
+        if self.content_group is None:
+            self.content_group = ScissorGroup(parent=__layers['content']) if self.clip_content and self.content_surface is None else __layers['content']
+
+        if self.background is None:
+            self.background = Rectangle(0, 0, 0, 0, 
+                                        color=self.background_color.__repr__(), 
+                                        batch=self.batch,
+                                        group=self.background_group)
+            self.title_background = Rectangle(0, 0, 0, 0, 
+                                              color=self.title_background_color.__repr__(), 
+                                              batch=self.batch,
+                                              group=self.title_group)
+            self.title_label = Label(self.title, 
+                                     font_name=STYLES.FONT.value, 
+                                     color=self.title_color.__repr__(), 
+                                     font_size=STYLES.FONT_SIZE.value, 
+                                     batch=self.batch,
+                                     group=self.title_group)
+            self.title_info_label = ComponentNumericLabel(self.TITLE_INFO, 
+                                                          font_name=STYLES.FONT.value, 
+                                                          color=self.title_color.__repr__(), 
+                                                          font_size=STYLES.FONT_SIZE.value, 
+                                                          batch=self.batch,
+                                                          group=self.title_group)
+            self.title_label_icon = Sprite(img=self.title_icon, batch=self.batch, group=self.icon_group)
+
+        if self._culled:
+            self.hide_shapes()
+        else:
+            self.on_redraw()
 
     def on_resize(self, width:int = 0, height:int = 0) -> None:
-        self.on_redraw()
+        # Windows whose rectangle did not change in the layout pass keep their shapes, culled windows are redrawn when they are shown
+        if self.is_dirty() and not self._culled:
+            self.on_redraw()
 
     def run(self) -> None:
         pass
 
 
+class ComponentWindowPool:
+    '''
+    Windows destroyed by a `ComponentWindowsManager` kept to be reused by its `create_window()`, at most `capacity` of each class.
+
+    A pooled window keeps its shapes, hidden, and its labels in the batch of the manager. Creating it again recycles it with
+    its new settings and only places its shapes, so panels that are opened and closed often do not allocate new vertex lists, 
+    glyph layouts and groups every time. The windows beyond the capacity are deleted.
+
+    Args:
+        capacity (int): The number of windows of a class kept.
+    '''
+    def __init__(self, capacity:int = 16):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._windows = {}
+
+    def __len__(self) -> int:
+        return sum(len(windows) for windows in self._windows.values())
+
+    def acquire(self, window_class:type, *args, **kwargs) -> ComponentWindow:
+        """ A pooled window of `window_class` recycled with the arguments, None if there is none. """
+        __windows = self._windows.get(window_class)
+        if not __windows:
+            self.misses += 1
+            return None
+        self.hits += 1
+        __window = __windows.pop()
+        __window.recycle(*args, **kwargs)
+        return __window
+
+    def release(self, window:ComponentWindow) -> bool:
+        """ Keeps a window for reuse. Returns False if the pool of its class is full, the window is then to be deleted. """
+        __windows = self._windows.setdefault(type(window), [])
+        if len(__windows) >= self.capacity:
+            return False
+        window.on_release()
+        __windows.append(window)
+        return True
+
+    def clear(self) -> None:
+        """ Deletes the pooled windows. """
+        for windows in self._windows.values():
+            for window in windows:
+                window.delete()
+        self._windows.clear()
+
+
+class ComponentWindowsManagerModel(WindowsManagerModel):
+    '''
+    The settings of a `ComponentWindowsManager`, validated when the manager is created.
+    '''
+    size:SVEC2 = Field(default_factory=SVEC2(0,0).copy)
+    event_loop:app.EventLoop = app.event_loop
+    batch:Batch = None
+    layers:Dict[str, Group] = {}
+    draw_call_counter:DrawCallCounter = None
+    draw_calls:int = 0
+    culled_windows:int = 0
+    profiler:Profiler = None
+    input_dispatcher:ComponentInputDispatcher = None
+    window_pool:ComponentWindowPool = None
+    resize_events:int = 0
+    layout_passes:int = 0
+    redraw_mode:str = 'fixed'
+    redraw_interval:float = 1 / 60
+    idle_interval:float = 1 / 4
+    idle_delay:float = 1.0
+    frames:int = 0
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
 class ComponentWindowsManager(WindowsManager):    
     '''
         The `ComponentWindowsManager` class is responsible for managing a collection of `ComponentWindow` instances. 
         It provides methods for creating, updating, and destroying windows, as well as handling events such as drawing and resizing. 
         The class also manages the overall event loop and clock for the application.
+        The mouse and keyboard events of its pyglet window are routed to the windows by `input_dispatcher`.
     '''
+    MODEL:type = ComponentWindowsManagerModel
+    PROFILER_KEY:int = window.key.F12
+    FRAME_HISTORY:int = 240
+    CULLING_BLOCK:int = 256
+
     def __init__(self, **data):
         super().__init__(**data)
+        self.__dict__.update(_pending_size=None, _redraw_pending=False, _idle=False, _last_frame=0.0, _last_invalidation=0.0,
+                             _frame_times=deque(maxlen=self.FRAME_HISTORY), _culling_dirty=True, _initialized=False)
         if self.window == None:
             self.window = window.Window(**data)
-        
-    class Config:
-        arbitrary_types_allowed = True
+        if self.batch == None:
+            self.batch = Batch()
+        if len(self.layers) == 0:
+            self.layers = self.create_layers()
+        if self.input_dispatcher is None:
+            self.input_dispatcher = ComponentInputDispatcher(self)
 
-    size:SVEC2 = SVEC2(0,0)
-    event_loop:app.EventLoop = app.event_loop
+    @staticmethod
+    def create_layers() -> Dict[str, Group]:
+        """
+        Creates the ordered layer groups windows draw into: background, title, icon and content.
+        The layers are shared by all windows of a manager, so the same kind of shapes of every window is drawn by a single draw call.
+        """
+        return {
+            'background': Group(order=0),
+            'title': Group(order=1),
+            'icon': Group(order=2),
+            'content': Group(order=3),
+        }
+
+    @property
+    def frame_times(self) -> deque:
+        """ The durations of the last `FRAME_HISTORY` calls of `on_draw()` in milliseconds, oldest first. """
+        return self._frame_times
 
     def update_size(self) -> None:
         self.size = SVEC2(self.window.display.get_screens()[0].width, self.window.display.get_screens()[0].height)
@@ -131,40 +502,223 @@ class ComponentWindowsManager(WindowsManager):
     def on_draw(self):
         """
         The Window dispatches an on_draw() event whenever it's readt to redraw its contents.
+        Resizes received since the last frame are applied first, then the shared batch is drawn once 
+        and the children draw the batches they own.
         """
+        __start = time.perf_counter()
+        if self.draw_call_counter is not None:
+            self.draw_call_counter.reset()
+
+        self.update_layout()
+        self.update_windows()
+        self.update_surfaces()
+
         self.window.clear()
+        self.batch.draw()
         for child in self.children.values():
             child['window'].on_draw() # Draw all children of the Window
 
+        if self.draw_call_counter is not None:
+            self.draw_calls = self.draw_call_counter.calls
+        self._frame_times.append((time.perf_counter() - __start) * 1000)
+
+    def update_windows(self) -> None:
+        """
+        Redraws the children that were invalidated by a property change since the last frame, except the culled ones.
+        """
+        if self._culling_dirty:
+            self.update_culling()
+        for child in self.children.values():
+            if child['window'].is_dirty() and not child['window']._culled:
+                child['window'].on_redraw()
+
+    def update_surfaces(self) -> int:
+        """ Renders the cached content of the shown children that changed since the last frame. Returns the number of rendered surfaces. """
+        __rendered = 0
+        for child in self.children.values():
+            __surface = getattr(child['window'], 'content_surface', None)
+            if __surface is not None and __surface.is_dirty() and not child['window']._culled:
+                __rendered += __surface.render(self.window)
+        return __rendered
+
+    def invalidate_culling(self) -> None:
+        """ Asks for the culled windows to be found again before the next frame is drawn. """
+        self._culling_dirty = True
+        self.request_redraw()
+
+    def update_culling(self) -> int:
+        """
+        Culls the children that would not be seen: the hidden ones, those whose rectangle is empty or outside of the manager, 
+        and those whose rectangle is inside the rectangle of a shown child added after them, which is drawn over them.
+        The culled windows are neither redrawn nor drawn until they are shown again.
+        Returns the number of culled windows, kept in `culled_windows` until the next layout pass or visibility change.
+        """
+        self._culling_dirty = False
+        __windows = [child['window'] for child in self.children.values()]
+        if not __windows:
+            self.culled_windows = 0
+            return 0
+
+        __rects = np.array([(window.position.x, window.position.y, window.position.x + window.size.x, window.position.y + window.size.y) 
+                            for window in __windows], dtype=float)
+        x0, y0, x1, y1 = __rects.T
+        __shown = np.array([window.visible for window in __windows], dtype=bool)
+        __shown &= (x1 > x0) & (y1 > y0) & (x1 > 0) & (y1 > 0) & (x0 < self.size.x) & (y0 < self.size.y)
+
+        # covers[i, j]: the shown window j comes after the window i and contains it. The rows are compared by blocks to bound the memory.
+        __indices = np.flatnonzero(__shown)
+        __shown_rects = __rects[__indices]
+        __covered = np.zeros(len(__indices), dtype=bool)
+        for start in range(0, len(__indices), self.CULLING_BLOCK):
+            __block = __shown_rects[start:start + self.CULLING_BLOCK, None, :]
+            __covers = ((__shown_rects[None, :, 0] <= __block[..., 0]) & (__shown_rects[None, :, 1] <= __block[..., 1]) &
+                        (__shown_rects[None, :, 2] >= __block[..., 2]) & (__shown_rects[None, :, 3] >= __block[..., 3]))
+            __covers &= __indices[None, :] > __indices[start:start + self.CULLING_BLOCK, None]
+            __covered[start:start + self.CULLING_BLOCK] = __covers.any(axis=1)
+        __shown[__indices[__covered]] = False
+
+        for window, shown in zip(__windows, __shown.tolist()):
+            if isinstance(window, ComponentWindow):
+                window.set_culled(not shown)
+        self.culled_windows = len(__windows) - int(__shown.sum())
+        return self.culled_windows
+
+    def invalidate(self) -> None:
+        super().invalidate()
+        self.request_redraw()
+
+    def request_redraw(self) -> None:
+        """
+        Asks for a new frame. In the `on_demand` mode a single frame is scheduled, no sooner than `redraw_interval` after the previous one.
+        In the `adaptive` mode the full `redraw_interval` rate is restored if the manager was idle. The `fixed` mode redraws anyway.
+        """
+        if self.clock is None:
+            return
+
+        self._last_invalidation = self.clock.time()
+
+        if self.redraw_mode == 'on_demand':
+            if not self._redraw_pending:
+                self._redraw_pending = True
+                self.clock.schedule_once(self._redraw, max(0.0, self._last_frame + self.redraw_interval - self._last_invalidation))
+        elif self.redraw_mode == 'adaptive' and self._idle:
+            self._idle = False
+            self.clock.unschedule(self._redraw)
+            self.clock.schedule_interval(self._redraw, self.redraw_interval)
+
+    def _redraw(self, dt:float) -> None:
+        __profiler = self.profiler if self.profiler is not None and self.profiler.enabled else None
+        __start = __profiler.clock() if __profiler is not None else 0
+
+        self._redraw_pending = False
+        self._last_frame = self.clock.time()
+        self.frames += 1
+        self.event_loop._redraw_windows(dt)
+
+        if __profiler is not None:
+            __profiler.record('frame', self.name, __start)
+
+        # Nothing was invalidated for a while, drop to the idle rate
+        if self.redraw_mode == 'adaptive' and not self._idle and self._last_frame - self._last_invalidation > self.idle_delay:
+            self._idle = True
+            self.clock.unschedule(self._redraw)
+            self.clock.schedule_interval(self._redraw, self.idle_interval)
+
+    def on_input(self, *args) -> None:
+        """
+        Handles the input and expose events of the window: any of them may change what is shown, so a new frame is requested.
+        """
+        self.request_redraw()
+
+    def on_profiler_key(self, symbol:int, modifiers:int) -> None:
+        """ Turns the profiler on and off with `PROFILER_KEY`. """
+        if symbol == self.PROFILER_KEY:
+            self.profiler.toggle()
+
     def on_init(self) -> None:
         self.update_size()
         self.layout.do_layout()
+        self.layout_passes += 1
 
         for child in self.children.values():
             child['window'].on_init() # Init all children of the Window
+        self.input_dispatcher.invalidate()
             
         # Set function on event
         self.window.event(self.on_draw) 
         self.window.event(self.on_resize)
+        self.window.push_handlers(on_expose=self.on_input,
+                                  on_show=self.on_input,
+                                  on_activate=self.on_input,
+                                  on_mouse_press=self.on_input,
+                                  on_mouse_release=self.on_input,
+                                  on_mouse_drag=self.on_input,
+                                  on_mouse_scroll=self.on_input,
+                                  on_key_press=self.on_input,
+                                  on_text=self.on_input)
+        self.window.push_handlers(self.input_dispatcher)
+        if self.profiler is not None:
+            self.window.push_handlers(on_key_press=self.on_profiler_key)
+        self._initialized = True
 
     def on_resize(self, width:int = 0, height:int = 0) -> None:
-        self.size = SVEC2(width, height)
+        """
+        Records the new size of the window. The layout is not run here: an interactive drag sends a burst of resize events, 
+        so only the latest size is kept and applied once per frame by `update_layout()`.
+        """
+        self.resize_events += 1
+        self._pending_size = SVEC2(width, height)
+        self.request_redraw()
+
+    def update_layout(self) -> None:
+        """
+        Applies the latest size received by `on_resize()`, runs the layout and resizes the children. 
+        Does nothing if no resize is pending and the layout is clean.
+        """
+        if self._pending_size is None and not self.layout.is_dirty():
+            return
+
+        if self._pending_size is not None:
+            self.size = self._pending_size
+            self._pending_size = None
         self.layout.do_layout()
+        self.layout_passes += 1
+        self.update_culling()
+        self.input_dispatcher.invalidate()
 
         for child in self.children.values():
-            child['window'].on_resize(width, height)
-
-    def run(self, interval: float | None = 1 / 60) -> None:
+            child['window'].on_resize(self.size.width, self.size.height)
 
+    def run(self, interval: float | None = 1 / 60, mode:str = 'fixed') -> None:
+        """
+        Runs the event loop of the manager.
+
+        Args:
+            interval (float | None): The interval between frames. 0 redraws on every loop step, None leaves drawing to the user.
+            mode (str): 
+                - `fixed` redraws every `interval` seconds. 
+                - `on_demand` redraws only when a window is invalidated (resize, property change, input), at most once per `interval`. 
+                    The loop sleeps until the next event, so an unchanged shell uses no CPU.
+                - `adaptive` redraws every `interval` seconds while windows are invalidated and drops to `idle_interval` 
+                    after `idle_delay` seconds without invalidation.
+        """
         self.clock = clock.get_default()
         self.event_loop._interval = interval
-        
+        self.redraw_mode = mode
+        if interval is not None:
+            self.redraw_interval = interval
+
         if interval is None:
             pass # User must call Window.draw() themselves.
-        if interval == 0:
-            self.clock.schedule(self.event_loop._redraw_windows)
+        elif mode == 'on_demand':
+            self.request_redraw()
+        elif mode == 'adaptive':
+            self._last_invalidation = self.clock.time()
+            self.clock.schedule_interval(self._redraw, interval)
+        elif interval == 0:
+            self.clock.schedule(self._redraw)
         else:
-            self.clock.schedule_interval(self.event_loop._redraw_windows, interval)
+            self.clock.schedule_interval(self._redraw, interval)
 
         self.event_loop.has_exit = False
 
@@ -192,9 +746,30 @@ class ComponentWindowsManager(WindowsManager):
         self.event_loop.dispatch_event('on_exit')
         platform_event_loop.stop()
 
-    def create_window(self, *args, **kwargs) -> ComponentWindow:
-        window = ComponentWindow( *args, **kwargs)
+    def create_window(self, *args, window_class:type = ComponentWindow, **kwargs) -> ComponentWindow:
+        """
+        Creates a window of `window_class`, a `ComponentWindow` by default, and adds it to the manager.
+        A window of the class released to the `window_pool` is recycled if there is one. A window created after `on_init()` is initialized at once.
+        """
+        window = self.window_pool.acquire(window_class, *args, **kwargs) if self.window_pool is not None else None
+        if window is None:
+            window = window_class(*args, **kwargs)
         self.add(window)
+        if self._initialized:
+            window.on_init()
         return window
 
-    def destroy_window(self, name:str) -> None: ...
\ No newline at end of file
+    def destroy_window(self, name:str) -> None:
+        """
+        Destroys a window and the windows below it. The window is removed from its parent, from the layouts that place it 
+        and from the name index, then the shapes of the windows are deleted, or hidden and kept by the `window_pool`.
+        Does nothing if there is no window of that name.
+        """
+        __window = self.get(name)
+        if __window is None or __window is self:
+            return
+        __window.parent.remove(__window)
+        for window in list(__window.walk()):
+            if isinstance(window, ComponentWindow) and (self.window_pool is None or not self.window_pool.release(window)):
+                window.delete()
+        self.input_dispatcher.invalidate()
\ No newline at end of file
@@ -0,0 +1,272 @@
+"""
+This module saves and restores the arrangement of the windows of a `ComponentWindowsManager`, the workspace of the editor.
+
+A workspace is described by `WorkspaceState`: the layout of the manager, with the minimum sizes of the regions of a `ComponentBorderStack`
+and its `GRID4` splits or the orientation of a `ComponentConstraintStack` and the weights and priorities of its children, the settings and styles of every window, the layouts of the windows that have children and the parent of every nested window.
+A window of another class than `ComponentWindow` is saved with the name of its class, looked up in `ComponentWorkspace.WINDOW_CLASSES`,
+and with the settings its `MODEL` adds, such as the `max_lines` of a console or the `path` of a file manager.
+It is stored either as JSON or, more compactly, in a binary format: a magic header and the version of the format followed by the same JSON document
+compressed with zlib. Only the values that differ from the defaults are written. A file is saved to a temporary file first, which then replaces it,
+so an interrupted save leaves the previous workspace in place.
+
+Reading a workspace validates the whole document with one call of pydantic, so a broken file is rejected before any window is created:
+a damaged file raises a `ValueError`, of which `pydantic.ValidationError` is a subclass.
+The validated window models are then used as is by `ComponentWindow`, the windows are not validated a second time,
+only the settings of the other classes are validated by their `MODEL` when their windows are created.
+"""
+import os, tempfile, zlib
+from typing import Any, Dict, List, Literal, Tuple
+from pydantic import BaseModel, Field
+
+from utils.components.window import ComponentWindow, ComponentWindowModel, ComponentWindowsManager
+from utils.components.console import ComponentConsoleWindow
+from utils.components.files import ComponentFileManagerWindow
+from utils.components.inspector import ComponentInspectorWindow
+from utils.components.status import ComponentStatusWindow
+from utils.components.layout import ComponentBorderStack, ComponentConstraintStack, ComponentHorizontalStack, ComponentVerticalStack
+from utils.types.t_vectors import VEC2, SVEC2, GRID4
+
+
+class LayoutState(BaseModel):
+    '''
+    The saved state of a layout: its type, its bevel and margin and, for a border layout, its grid and the minimum sizes of its regions.
+    For a constraint layout, its orientation and the `(weight, priority)` of its children by name.
+    '''
+    type:Literal['border', 'horizontal', 'vertical', 'constraint'] = 'border'
+    bevel:VEC2 = None
+    margin:VEC2 = None
+    grid:GRID4 = None
+    regions:Dict[Literal['north', 'center', 'south', 'west', 'east'], SVEC2] = {}
+    orientation:Literal['horizontal', 'vertical'] = 'horizontal'
+    items:Dict[str, Tuple[float, float]] = {}
+
+
+class WorkspaceState(BaseModel):
+    '''
+    The saved state of a workspace. `windows` lists the windows in the order they are added, parents before their children,
+    `parents` maps the name of every nested window to the name of its parent and `layouts` holds the layouts of the windows with children.
+    `classes` maps the name of every window that is not a plain `ComponentWindow` to the name of its class and `settings`
+    to the values of the settings its `MODEL` adds, encoded as JSON values, which differ from the defaults.
+    '''
+    version:int = 1
+    layout:LayoutState = Field(default_factory=LayoutState)
+    windows:List[ComponentWindowModel] = []
+    parents:Dict[str, str] = {}
+    layouts:Dict[str, LayoutState] = {}
+    classes:Dict[str, str] = {}
+    settings:Dict[str, Dict[str, Any]] = {}
+
+
+class ComponentWorkspace:
+    '''
+    The `ComponentWorkspace` class captures the windows of a `ComponentWindowsManager` as a `WorkspaceState` and restores them from one.
+
+    - `capture()` and `restore()` convert between the manager and a `WorkspaceState`.
+    - `dumps()` and `loads()` convert between the manager and the JSON or binary encoding of its state.
+    - `save()` and `load()` do the same with a file. The format of a file is recognized by its header when it is loaded.
+
+    The class of a window is saved by its name if it is in `WINDOW_CLASSES`, see `register_class()`. The windows of the other classes
+    are restored with the class given for their name in `window_classes`, or as plain `ComponentWindow`s.
+    The settings a class adds to `ComponentWindowModel` are saved, except its `RESOURCES` and the fields excluded from the dumps of its `MODEL`.
+
+    Args:
+        manager (ComponentWindowsManager): The manager whose windows are saved and restored.
+        window_classes (dict): The classes of the windows whose class is not saved, by name, used to restore them.
+    '''
+    # The settings of a window that are saved, the others are runtime state
+    WINDOW_FIELDS:tuple = ('name', 'anchor', 'fixed', 'min_size', 'max_size', 'bevel', 'title', 'title_height', 'title_icon', 'show_title', 'visible', 'title_mode',
+                           'clip_content', 'cache_content', 'background_color', 'title_background_color', 'title_color')
+    # The window classes whose name is saved
+    WINDOW_CLASSES:Dict[str, type] = {cls.__name__: cls for cls in (ComponentWindow, ComponentConsoleWindow, ComponentFileManagerWindow,
+                                                                     ComponentInspectorWindow, ComponentStatusWindow)}
+    BINARY_MAGIC:bytes = b'PGSW'
+    # The version of the binary format, the byte after the magic. Version 1 was encoded with `marshal` and is no longer read.
+    BINARY_FORMAT:int = 2
+    VERSION:int = 1
+
+    def __init__(self, manager:ComponentWindowsManager, window_classes:Dict[str, type] = None):
+        self.manager = manager
+        self.window_classes = window_classes if window_classes is not None else {}
+
+    @classmethod
+    def register_class(cls, window_class:type) -> type:
+        """ Adds a window class to `WINDOW_CLASSES`, so the windows of the class are saved with its name. Usable as a class decorator. """
+        cls.WINDOW_CLASSES[window_class.__name__] = window_class
+        return window_class
+
+    @classmethod
+    def get_include(cls) -> dict:
+        """ The fields of a `WorkspaceState` that are written, for the `include` argument of the pydantic dump methods. """
+        return {'version': True, 'layout': True, 'parents': True, 'layouts': True, 'classes': True, 'settings': True,
+                'windows': {'__all__': set(cls.WINDOW_FIELDS)}}
+
+    @staticmethod
+    def get_settings(window_class:type) -> tuple:
+        """ The names of the settings the `MODEL` of a window class adds to `ComponentWindowModel`, without its resources and runtime state. """
+        return tuple(name for name, field in window_class.MODEL.model_fields.items()
+                     if name not in ComponentWindowModel.model_fields and name not in window_class.RESOURCES and not field.exclude)
+
+    @staticmethod
+    def capture_layout(layout) -> LayoutState:
+        if isinstance(layout, ComponentBorderStack):
+            return LayoutState(type='border', bevel=layout._bevel.copy(), margin=layout._margin.copy(), grid=layout.grid.copy(),
+                               regions={region: getattr(layout, region).min_size.copy() for region in ('north', 'center', 'south', 'west', 'east')})
+        if isinstance(layout, ComponentVerticalStack):
+            return LayoutState(type='vertical', bevel=layout._bevel.copy(), margin=layout._margin.copy())
+        if isinstance(layout, ComponentHorizontalStack):
+            return LayoutState(type='horizontal', bevel=layout._bevel.copy(), margin=layout._margin.copy())
+        if isinstance(layout, ComponentConstraintStack):
+            return LayoutState(type='constraint', bevel=layout._bevel.copy(), margin=layout._margin.copy(), orientation=layout.orientation,
+                               items={child.name: (layout._items[child].weight, layout._items[child].priority) for child in layout._order})
+        raise TypeError(f"Layouts of type {type(layout).__name__} can not be saved")
+
+    @staticmethod
+    def create_layout(state:LayoutState):
+        """ Creates the layout described by `state`. Bevels, margins and grids that were not saved keep the defaults of the layout. """
+        __kwargs = {name: getattr(state, name) for name in ('bevel', 'margin', 'grid') if getattr(state, name) is not None}
+        match state.type:
+            case 'border':
+                __layout = ComponentBorderStack(**__kwargs)
+                for region, min_size in state.regions.items():
+                    getattr(__layout, region).min_size = min_size
+                return __layout
+            case 'vertical':
+                __kwargs.pop('grid', None)
+                return ComponentVerticalStack(**__kwargs)
+            case 'horizontal':
+                __kwargs.pop('grid', None)
+                return ComponentHorizontalStack(**__kwargs)
+            case 'constraint':
+                __kwargs.pop('grid', None)
+                return ComponentConstraintStack(orientation=state.orientation, **__kwargs)
+
+    @staticmethod
+    def restore_items(layout, state:LayoutState) -> None:
+        """ Gives the children of a constraint layout their saved weights and priorities, once they are added to it. """
+        if state.type != 'constraint':
+            return
+        for child in layout._order:
+            __weight, __priority = state.items.get(child.name, (layout._items[child].weight, layout._items[child].priority))
+            if __weight != layout._items[child].weight:
+                layout.set_weight(child, __weight)
+            if __priority != layout._items[child].priority:
+                layout.set_priority(child, __priority)
+
+    def capture(self) -> WorkspaceState:
+        """ Returns the state of the manager and of all its windows. """
+        __template = ComponentWindowModel()
+        __windows, __parents, __layouts, __classes, __settings = [], {}, {}, {}, {}
+        __names = {ComponentWindow: ()}
+
+        __stack = [self.manager]
+        while __stack:
+            __parent = __stack.pop()
+            __children = [child['window'] for child in __parent.children.values()]
+            for window in __children:
+                # The template is copied without validation, only the saved fields are taken from the window
+                __fields = {name: getattr(window, name) for name in self.WINDOW_FIELDS}
+                if __fields['title'] == window.name:
+                    __fields['title'] = None
+                __windows.append(__template.model_copy(update=__fields))
+                __class = type(window)
+                if __class not in __names:
+                    __names[__class] = self.get_settings(__class)
+                if self.WINDOW_CLASSES.get(__class.__name__) is __class and __class is not ComponentWindow:
+                    __classes[window.name] = __class.__name__
+                if __names[__class]:
+                    # The settings are encoded by the model of the class, only those that differ from the defaults
+                    __values = __class.MODEL.model_construct(**{name: getattr(window, name) for name in __names[__class]})
+                    __values = __values.model_dump(mode='json', include=set(__names[__class]), exclude_defaults=True)
+                    if __values:
+                        __settings[window.name] = __values
+                if __parent is not self.manager:
+                    __parents[window.name] = __parent.name
+                if window.children:
+                    __layouts[window.name] = self.capture_layout(window.layout)
+            __stack.extend(reversed(__children))
+
+        return WorkspaceState(version=self.VERSION, layout=self.capture_layout(self.manager.layout),
+                              windows=__windows, parents=__parents, layouts=__layouts, classes=__classes, settings=__settings)
+
+    def restore(self, state:WorkspaceState) -> None:
+        """
+        Creates the layout and the windows described by `state` in the manager, which must not have windows yet.
+        The window models of `state` are used by the windows, a state is restored once.
+        """
+        if self.manager.children:
+            raise ValueError("A workspace is restored into a manager without windows")
+        for __name, __class in state.classes.items():
+            if __class not in self.WINDOW_CLASSES:
+                raise ValueError(f"The window {__name} has the unknown class {__class}")
+
+        self.manager.layout = self.create_layout(state.layout)
+        __windows = {}
+        for model in state.windows:
+            __name = model.name
+            __class = self.WINDOW_CLASSES[state.classes[__name]] if __name in state.classes else self.window_classes.get(__name, ComponentWindow)
+            if __name in state.settings:
+                # Only the settings are validated, the saved fields of the window are copied over the validated model
+                model = __class.MODEL.model_validate(state.settings[__name]).model_copy(update=model.__dict__)
+            window = __class(model)
+            if __name in state.layouts:
+                window.layout = self.create_layout(state.layouts[__name])
+            __parent = __windows.get(state.parents.get(__name), self.manager)
+            __parent.add(window)
+            __windows[__name] = window
+
+        self.restore_items(self.manager.layout, state.layout)
+        for __name, layout in state.layouts.items():
+            if __name in __windows:
+                self.restore_items(__windows[__name].layout, layout)
+
+        self.manager.layout.on_init()
+        for window in __windows.values():
+            if window.children:
+                window.layout.on_init()
+
+    def dumps(self, binary:bool = False) -> bytes:
+        """ Encodes the state of the manager as JSON or, if `binary` is set, in the binary format. """
+        __state = self.capture()
+        __data = __state.model_dump_json(include=self.get_include(), exclude_defaults=True).encode()
+        if binary:
+            return self.BINARY_MAGIC + bytes((self.BINARY_FORMAT,)) + zlib.compress(__data)
+        return __data
+
+    @classmethod
+    def decode(cls, data:bytes) -> WorkspaceState:
+        """ Decodes and validates at once a state encoded by `dumps()`, in either format. Raises a `ValueError` if the data is damaged. """
+        if data.startswith(cls.BINARY_MAGIC):
+            __format = data[len(cls.BINARY_MAGIC):len(cls.BINARY_MAGIC) + 1]
+            if __format != bytes((cls.BINARY_FORMAT,)):
+                raise ValueError(f"Unsupported workspace format {__format[0] if __format else None}, expected {cls.BINARY_FORMAT}")
+            try:
+                data = zlib.decompress(data[len(cls.BINARY_MAGIC) + 1:])
+            except zlib.error as error:
+                raise ValueError(f"Damaged workspace: {error}") from error
+        return WorkspaceState.model_validate_json(data)
+
+    def loads(self, data:bytes) -> None:
+        """ Restores a state encoded by `dumps()`. """
+        self.restore(self.decode(data))
+
+    def save(self, path:str, binary:bool = None) -> None:
+        """ Saves the workspace to `path`, in the binary format unless the extension of the file is `.json` or `binary` is False. """
+        if binary is None:
+            binary = os.path.splitext(path)[1].lower() != '.json'
+        __data = self.dumps(binary)
+        # The file is replaced at once by a complete one, an interrupted save leaves the previous file
+        __fd, __temporary = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(__fd, 'wb') as file:
+                file.write(__data)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(__temporary, path)
+        except BaseException:
+            os.unlink(__temporary)
+            raise
+
+    def load(self, path:str) -> None:
+        """ Restores the workspace saved at `path`. """
+        with open(path, 'rb') as file:
+            self.loads(file.read())
@@ -0,0 +1,65 @@
+from pyglet.graphics import vertexdomain
+
+class DrawCallCounter:
+    '''
+    Counts the OpenGL draw calls issued by pyglet vertex domains.
+
+    While the counter is installed, the `glDraw*` functions used by `pyglet.graphics.vertexdomain` are wrapped, 
+    so every draw of a `Batch` is counted, whatever window or component issued it. 
+    Call `reset()` at the start of a frame and read `calls` at its end.
+
+    Example:
+        counter = DrawCallCounter()
+        counter.install()
+        ...
+        counter.uninstall()
+    '''
+
+    FUNCTIONS = (
+        'glDrawArrays',
+        'glDrawElements',
+        'glMultiDrawArrays',
+        'glMultiDrawElements',
+        'glDrawArraysInstanced',
+        'glDrawElementsInstanced',
+    )
+
+    def __init__(self):
+        self._calls = 0
+        self._originals = {}
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+    
+    @property
+    def installed(self) -> bool:
+        return len(self._originals) > 0
+
+    def reset(self) -> None:
+        self._calls = 0
+
+    def _wrap(self, function):
+        def counted(*args):
+            self._calls += 1
+            return function(*args)
+        return counted
+
+    def install(self) -> None:
+        if self.installed:
+            return
+        for name in self.FUNCTIONS:
+            self._originals[name] = getattr(vertexdomain, name)
+            setattr(vertexdomain, name, self._wrap(self._originals[name]))
+
+    def uninstall(self) -> None:
+        for name, function in self._originals.items():
+            setattr(vertexdomain, name, function)
+        self._originals = {}
+
+    def __enter__(self) -> 'DrawCallCounter':
+        self.install()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.uninstall()
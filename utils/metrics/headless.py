@@ -0,0 +1,83 @@
+from pyglet import gl
+from pyglet.event import EventDispatcher
+from pyglet.window import BaseWindow
+
+class HeadlessScreen:
+    def __init__(self, width:int, height:int):
+        self.width = width
+        self.height = height
+
+
+class HeadlessDisplay:
+    def __init__(self, width:int, height:int):
+        self._screens = [HeadlessScreen(width, height)]
+
+    def get_screens(self) -> list:
+        return self._screens
+
+
+class HeadlessWindow(EventDispatcher):
+    '''
+    A stand-in for the `pyglet.window.Window` of a `ComponentWindowsManager`, without a native window or a platform event loop.
+
+    It dispatches the events of a pyglet window to the handlers pushed by the manager, so input, resizes and frames can be replayed
+    with `dispatch_event()`, `set_size()` and `draw()`. It does not own a GL context: the shapes of the windows are created and drawn
+    in the current context, the shadow context of pyglet, which is offscreen with `pyglet.options['headless']`.
+
+    Example:
+        manager = ComponentWindowsManager(window=HeadlessWindow(1280, 720))
+        manager.on_init()
+        manager.window.set_size(1920, 1080)
+        manager.window.draw(1 / 60)
+    '''
+    def __init__(self, width:int = 1280, height:int = 720, screen_width:int = 1920, screen_height:int = 1080, clear:bool = True, **kwargs):
+        self.width = width
+        self.height = height
+        self.display = HeadlessDisplay(screen_width, screen_height)
+        self.clear_color = clear
+        self.has_exit = False
+
+    def get_size(self) -> tuple:
+        return self.width, self.height
+
+    def set_size(self, width:int, height:int) -> None:
+        ''' Resizes the window and dispatches `on_resize`, like a native window does. '''
+        self.width, self.height = width, height
+        self.dispatch_event('on_resize', width, height)
+
+    def get_pixel_ratio(self) -> float:
+        return 1.0
+
+    def set_minimum_size(self, width:int, height:int) -> None: ...
+
+    def set_maximum_size(self, width:int, height:int) -> None: ...
+
+    def set_icon(self, *images) -> None: ...
+
+    def set_caption(self, caption:str) -> None: ...
+
+    def maximize(self) -> None:
+        self.set_size(self.display.get_screens()[0].width, self.display.get_screens()[0].height)
+
+    def switch_to(self) -> None: ...
+
+    def flip(self) -> None: ...
+
+    def clear(self) -> None:
+        if self.clear_color:
+            gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+
+    def draw(self, dt:float = 0.0) -> None:
+        ''' Draws a frame, like `pyglet.window.Window.draw()`. '''
+        self.dispatch_event('on_draw')
+        self.dispatch_event('on_refresh', dt)
+
+    def dispatch_pending_events(self) -> None: ...
+
+    def close(self) -> None:
+        self.has_exit = True
+        self.dispatch_event('on_close')
+
+
+for event_type in BaseWindow.event_types:
+    HeadlessWindow.register_event_type(event_type)
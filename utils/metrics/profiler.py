@@ -0,0 +1,212 @@
+import json, os, threading, time
+from collections import deque
+from functools import wraps
+
+class Profiler:
+    '''
+    Records how long the layout passes, the redraws and draws of the windows and the frames of a manager take.
+
+    While the profiler is installed, `do_layout()` of every `Layout` class and `on_redraw()` and `on_draw()` of every `Window` class
+    are wrapped, like the draw functions wrapped by `DrawCallCounter`, and every call is recorded as a span in a ring buffer
+    of `capacity` spans. A method that calls the method it overrides is one span, not two nested ones.
+    The frames are recorded by a `ComponentWindowsManager` whose `profiler` is set, in a ring buffer of their own.
+    When the profiler is uninstalled the original methods are restored, so a disabled profiler costs nothing but a test per frame.
+    It can be installed and uninstalled at any time, `enabled` and `toggle()` do the same.
+
+    The methods are wrapped once for all the profilers: several profilers, e.g. of several managers, can be installed together
+    and uninstalled in any order. The wrappers record every span in all the installed profilers, the methods are wrapped
+    by the first profiler installed and restored when the last one is uninstalled.
+
+    The spans are exported as Chrome trace events, which can be opened in `chrome://tracing` or https://ui.perfetto.dev.
+    The spans of a layout pass are nested in the span of the frame that ran it.
+
+    Classes defined after `install()` are not wrapped before a profiler is installed again.
+
+    Example:
+        profiler = Profiler()
+        manager.profiler = profiler
+        profiler.install()
+        ...
+        profiler.uninstall()
+        profiler.save('trace.json')
+    '''
+    # The base class, method and category of the wrapped methods, the subclasses that override a method are wrapped too
+    TARGETS = (
+        ('classes.windows.c_layout', 'Layout', 'do_layout', 'layout'),
+        ('classes.windows.c_window', 'Window', 'on_redraw', 'redraw'),
+        ('classes.windows.c_window', 'Window', 'on_draw', 'draw'),
+        ('utils.components.window', 'ComponentWindowsManager', 'update_layout', 'update_layout'),
+        ('utils.components.window', 'ComponentWindowsManager', 'update_windows', 'update_windows'),
+    )
+
+    # The installed profilers, which the wrappers record the spans in, and the original methods, shared by all the profilers
+    _installed:tuple = ()
+    _originals:dict = {}
+    _lock:threading.Lock = threading.Lock()
+    # The spans being recorded by each thread, `(category, id(node))`
+    _active:threading.local = threading.local()
+
+    def __init__(self, capacity:int = 65536, frames:int = 600):
+        self._spans = deque(maxlen=capacity)
+        self._frames = deque(maxlen=frames)
+        self._epoch = time.perf_counter_ns()
+
+    @property
+    def installed(self) -> bool:
+        return self in Profiler._installed
+
+    @property
+    def enabled(self) -> bool:
+        return self.installed
+
+    @enabled.setter
+    def enabled(self, value:bool) -> None:
+        if value:
+            self.install()
+        else:
+            self.uninstall()
+
+    def toggle(self) -> bool:
+        ''' Installs the profiler if it is uninstalled and the opposite. Returns True if it is installed. '''
+        self.enabled = not self.enabled
+        return self.enabled
+
+    @property
+    def spans(self) -> list:
+        ''' The recorded spans, oldest first, as tuples `(category, name, start, duration, thread)` in nanoseconds. '''
+        return list(self._spans)
+
+    @property
+    def frames(self) -> list:
+        ''' The durations of the recorded frames in milliseconds, oldest first. '''
+        return [duration / 1e6 for _, duration in self._frames]
+
+    def reset(self) -> None:
+        self._spans.clear()
+        self._frames.clear()
+
+    @staticmethod
+    def clock() -> int:
+        return time.perf_counter_ns()
+
+    def record(self, category:str, name:str, start:int) -> None:
+        ''' Records a span that started at `start`, a value of `clock()`, and ends now. '''
+        __duration = time.perf_counter_ns() - start
+        self._spans.append((category, name, start, __duration, threading.get_ident()))
+        if category == 'frame':
+            self._frames.append((start, __duration))
+
+    @staticmethod
+    def get_node_name(node) -> str:
+        ''' The name of a span: the name of a window, the class of a layout. '''
+        __name = getattr(node, 'name', None)
+        return __name if isinstance(__name, str) else type(node).__name__
+
+    @staticmethod
+    def _get_active() -> set:
+        __active = getattr(Profiler._active, 'spans', None)
+        if __active is None:
+            __active = Profiler._active.spans = set()
+        return __active
+
+    @staticmethod
+    def _wrap(function, category:str):
+        '''
+        Wraps a method to record its calls in the installed profilers. A method that calls the method it overrides, e.g. `super().on_redraw()`,
+        is recorded once: only the outermost call of a category on a node is a span.
+        '''
+        __clock, __name, __thread, __get_active = time.perf_counter_ns, Profiler.get_node_name, threading.get_ident, Profiler._get_active
+        @wraps(function)
+        def profiled(node, *args, **kwargs):
+            __active, __key = __get_active(), (category, id(node))
+            if __key in __active:
+                return function(node, *args, **kwargs)
+            __active.add(__key)
+            __start = __clock()
+            try:
+                return function(node, *args, **kwargs)
+            finally:
+                __span = (category, __name(node), __start, __clock() - __start, __thread())
+                for profiler in Profiler._installed:
+                    profiler._spans.append(__span)
+                __active.discard(__key)
+        return profiled
+
+    @staticmethod
+    def _get_classes(base:type) -> list:
+        ''' The class `base` and all its subclasses. '''
+        __classes, __stack = {}, [base]
+        while __stack:
+            cls = __stack.pop()
+            if cls not in __classes:
+                __classes[cls] = None
+                __stack.extend(cls.__subclasses__())
+        return list(__classes)
+
+    @classmethod
+    def _wrap_targets(cls) -> None:
+        ''' Wraps the methods of `TARGETS` that are not wrapped yet. '''
+        # The modules are imported here, the windows import the metrics
+        import importlib
+        from classes.windows.c_window import WindowsManager
+        for module, base, method, category in cls.TARGETS:
+            for target in cls._get_classes(getattr(importlib.import_module(module), base)):
+                function = target.__dict__.get(method)
+                if function is None or getattr(function, '__isabstractmethod__', False) or (target, method) in Profiler._originals:
+                    continue
+                # The draw of a manager is the frame, its handler is bound to the pyglet window and is timed by the manager
+                if category in ('redraw', 'draw') and issubclass(target, WindowsManager):
+                    continue
+                Profiler._originals[(target, method)] = function
+                setattr(target, method, cls._wrap(function, category))
+
+    def install(self) -> None:
+        ''' Starts recording the spans. The methods are wrapped if no other profiler is installed, the classes defined since are wrapped too. '''
+        with Profiler._lock:
+            if self.installed:
+                return
+            self._wrap_targets()
+            Profiler._installed += (self,)
+
+    def uninstall(self) -> None:
+        ''' Stops recording the spans. The original methods are restored if no other profiler is installed. '''
+        with Profiler._lock:
+            if not self.installed:
+                return
+            Profiler._installed = tuple(profiler for profiler in Profiler._installed if profiler is not self)
+            if Profiler._installed:
+                return
+            for (cls, method), function in Profiler._originals.items():
+                setattr(cls, method, function)
+            Profiler._originals.clear()
+
+    def get_summary(self) -> dict:
+        ''' The number of calls, the total and the longest time in milliseconds of every category and name of the recorded spans. '''
+        __summary = {}
+        for category, name, _, duration, _ in self._spans:
+            __entry = __summary.setdefault((category, name), [0, 0.0, 0.0])
+            __entry[0] += 1
+            __entry[1] += duration / 1e6
+            __entry[2] = max(__entry[2], duration / 1e6)
+        return {key: tuple(value) for key, value in __summary.items()}
+
+    def get_trace_events(self) -> list:
+        ''' The recorded spans as complete events ('X') of the Chrome trace event format, timed in microseconds. '''
+        __pid = os.getpid()
+        return [{'name': name, 'cat': category, 'ph': 'X', 'ts': (start - self._epoch) / 1e3, 'dur': duration / 1e3, 'pid': __pid, 'tid': thread}
+                for category, name, start, duration, thread in self._spans]
+
+    def dumps(self) -> str:
+        return json.dumps({'traceEvents': self.get_trace_events(), 'displayTimeUnit': 'ms'})
+
+    def save(self, path:str) -> None:
+        ''' Saves the recorded spans to `path` as a Chrome trace. '''
+        with open(path, 'w') as file:
+            file.write(self.dumps())
+
+    def __enter__(self) -> 'Profiler':
+        self.install()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.uninstall()
@@ -0,0 +1,283 @@
+"""
+This module defines arrays of 2D and 3D vectors backed by contiguous NumPy buffers.
+
+The `VEC2Array` and `VEC3Array` classes store many vectors in a single `float32` array of shape `(n, 2)` or `(n, 3)`,
+so bulk geometry does not need one Python object per vector. Arithmetic, dot and cross products and normalization are vectorized.
+
+Indexing a single element returns a `VEC2View` or `VEC3View`: a `VEC2`/`VEC3` that reads and writes the array in place,
+so it can be passed to code that expects the scalar types without copying. Scalar vectors can be used as operands of the arrays,
+and `write_to()` copies the array into a pyglet vertex list attribute with a single buffer copy.
+
+This module requires NumPy.
+"""
+import numpy as np
+from utils.types.t_vectors import VEC2, VEC3
+
+
+class VEC2View(VEC2):
+    '''
+    A `VEC2` that is a view of one element of a `VEC2Array`. Reading and writing `x` and `y` accesses the array directly.
+    Arithmetic returns plain `VEC2` values.
+
+    Args:
+        array (np.ndarray): The `(n, 2)` buffer of the array.
+        index (int): The index of the element.
+    '''
+    __slots__ = ('_array', '_index')
+
+    def __init__(self, array:np.ndarray, index:int):
+        self._array = array
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return float(self._array[self._index, 0])
+
+    @x.setter
+    def x(self, x:float) -> None:
+        self._array[self._index, 0] = x
+
+    @property
+    def y(self) -> float:
+        return float(self._array[self._index, 1])
+
+    @y.setter
+    def y(self, y:float) -> None:
+        self._array[self._index, 1] = y
+
+    def copy(self) -> VEC2:
+        return VEC2(self.x, self.y)
+
+    def __add__(self, other):
+        return self.copy() + other
+
+    def __sub__(self, other):
+        return self.copy() - other
+
+    def __mul__(self, scalar: float):
+        return self.copy() * scalar
+
+
+class VEC3View(VEC3):
+    '''
+    A `VEC3` that is a view of one element of a `VEC3Array`. Reading and writing `x`, `y` and `z` accesses the array directly.
+    Arithmetic returns plain `VEC3` values.
+
+    Args:
+        array (np.ndarray): The `(n, 3)` buffer of the array.
+        index (int): The index of the element.
+    '''
+    __slots__ = ('_array', '_index')
+
+    def __init__(self, array:np.ndarray, index:int):
+        self._array = array
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return float(self._array[self._index, 0])
+
+    @x.setter
+    def x(self, x:float) -> None:
+        self._array[self._index, 0] = x
+
+    @property
+    def y(self) -> float:
+        return float(self._array[self._index, 1])
+
+    @y.setter
+    def y(self, y:float) -> None:
+        self._array[self._index, 1] = y
+
+    @property
+    def z(self) -> float:
+        return float(self._array[self._index, 2])
+
+    @z.setter
+    def z(self, z:float) -> None:
+        self._array[self._index, 2] = z
+
+    def copy(self) -> VEC3:
+        return VEC3(self.x, self.y, self.z)
+
+    def __add__(self, other):
+        return self.copy() + other
+
+    def __sub__(self, other):
+        return self.copy() - other
+
+    def __mul__(self, scalar: float):
+        return self.copy() * scalar
+
+    def cross(self, other):
+        return self.copy().cross(other)
+
+
+class _VECArray:
+    '''
+    Base class of the vector arrays. Subclasses set the number of components, the scalar vector type and its view type.
+    '''
+    __slots__ = ('_data',)
+
+    SIZE:int = 0
+    VECTOR:type = None
+    VIEW:type = None
+
+    def __init__(self, data:'int | np.ndarray | _VECArray | list' = 0):
+        if isinstance(data, int):
+            self._data = np.zeros((data, self.SIZE), dtype=np.float32)
+        elif isinstance(data, _VECArray):
+            self._data = data.data
+        elif isinstance(data, np.ndarray):
+            # No copy if the buffer already is a contiguous float32 array
+            self._data = np.ascontiguousarray(data, dtype=np.float32).reshape(-1, self.SIZE)
+        else:
+            self._data = np.array([tuple(vector) for vector in data], dtype=np.float32).reshape(-1, self.SIZE)
+
+    @property
+    def data(self) -> np.ndarray:
+        ''' The `(n, SIZE)` float32 buffer of the array. '''
+        return self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._data.tolist()})"
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self._data)
+            if not 0 <= index < len(self._data):
+                raise IndexError(f"{self.__class__.__name__} index out of range: {index}")
+            return self.VIEW(self._data, int(index))
+        # Slices and masks return arrays, contiguous slices share the buffer
+        return self.__class__(self._data[index])
+
+    def __setitem__(self, index, value) -> None:
+        self._data[index] = self._operand(value)
+
+    def __iter__(self):
+        for index in range(len(self._data)):
+            yield self.VIEW(self._data, index)
+
+    def _operand(self, other):
+        if isinstance(other, _VECArray):
+            return other.data
+        if isinstance(other, self.VECTOR):
+            return np.array(tuple(other), dtype=np.float32)
+        return other
+
+    def __add__(self, other):
+        return self.__class__(self._data + self._operand(other))
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        return self.__class__(self._data - self._operand(other))
+
+    def __rsub__(self, other):
+        return self.__class__(self._operand(other) - self._data)
+
+    def __mul__(self, scale):
+        '''
+        Scales by a scalar, per component by a vector or a `(SIZE,)` array, or per element by an `(n, 1)` or `(n, SIZE)` array,
+        following the broadcasting of NumPy. A 1-D array always scales the components: use `scale_each()` for one factor per element.
+        '''
+        return self.__class__(self._data * self._operand(scale))
+
+    def __rmul__(self, scale):
+        return self.__mul__(scale)
+
+    def scale_each(self, factors) -> '_VECArray':
+        ''' Scales every vector by its own factor, `factors` being a sequence or an `(n,)` array of one factor per element. '''
+        __factors = np.asarray(factors, dtype=np.float32)
+        if __factors.shape != (len(self._data),):
+            raise ValueError(f"{self.__class__.__name__} of {len(self._data)} vectors scaled by factors of shape {__factors.shape}")
+        return self.__class__(self._data * __factors[:, None])
+
+    def __truediv__(self, scale):
+        return self.__mul__(1 / np.asarray(scale, dtype=np.float32))
+
+    def __neg__(self):
+        return self.__class__(-self._data)
+
+    def copy(self) -> '_VECArray':
+        return self.__class__(self._data.copy())
+
+    def dot(self, other) -> np.ndarray:
+        ''' Dot products with another array of the same length or with one vector, as an `(n,)` array. '''
+        return np.einsum('ij,ij->i', self._data, np.broadcast_to(self._operand(other), self._data.shape))
+
+    def lengths(self) -> np.ndarray:
+        return np.sqrt(self.dot(self))
+
+    def normalize(self) -> '_VECArray':
+        ''' Returns the array of unit vectors. Zero vectors stay zero. '''
+        __lengths = self.lengths()
+        __lengths[__lengths == 0] = 1
+        return self.__class__(self._data / __lengths[:, None])
+
+    def to_vectors(self) -> list:
+        ''' Copies the array into a list of scalar vectors. '''
+        return [self.VECTOR(*row) for row in self._data.tolist()]
+
+    def write_to(self, vertex_list, attribute:str = 'position') -> None:
+        '''
+        Copies the array into an attribute of a pyglet vertex list in a single buffer copy.
+        If the attribute has more components per vertex than the array (e.g. a 3D position for a `VEC2Array`), only the first components are written.
+
+        Args:
+            vertex_list: A pyglet `VertexList` with one vertex per element of the array.
+            attribute (str): The name of the vertex attribute.
+
+        Raises:
+            ValueError: If the vertex list does not have one vertex per element, or the attribute has fewer than `SIZE` components.
+        '''
+        if vertex_list.count != len(self._data):
+            raise ValueError(f"{self.__class__.__name__} of {len(self._data)} vectors written to a vertex list of {vertex_list.count} vertices")
+        __buffer = np.ctypeslib.as_array(getattr(vertex_list, attribute))
+        if vertex_list.count and __buffer.size // vertex_list.count < self.SIZE:
+            raise ValueError(f"{self.__class__.__name__} written to the attribute {attribute!r} of {__buffer.size // vertex_list.count} components per vertex")
+        __region = __buffer.reshape(vertex_list.count, -1)
+        __region[:, :self.SIZE] = self._data
+
+
+class VEC2Array(_VECArray):
+    '''
+    An array of 2D vectors stored in a contiguous `(n, 2)` float32 NumPy buffer.
+
+    Args:
+        data (int | np.ndarray | VEC2Array | list): The number of zero vectors, a buffer of `n * 2` values,
+            another array (the buffer is shared) or a sequence of `VEC2` or `(x, y)` tuples.
+    '''
+    __slots__ = ()
+
+    SIZE = 2
+    VECTOR = VEC2
+    VIEW = VEC2View
+
+    def cross(self, other) -> np.ndarray:
+        ''' The z component of the cross products, as an `(n,)` array. '''
+        __other = np.broadcast_to(self._operand(other), self._data.shape)
+        return self._data[:, 0] * __other[:, 1] - self._data[:, 1] * __other[:, 0]
+
+
+class VEC3Array(_VECArray):
+    '''
+    An array of 3D vectors stored in a contiguous `(n, 3)` float32 NumPy buffer.
+
+    Args:
+        data (int | np.ndarray | VEC3Array | list): The number of zero vectors, a buffer of `n * 3` values,
+            another array (the buffer is shared) or a sequence of `VEC3` or `(x, y, z)` tuples.
+    '''
+    __slots__ = ()
+
+    SIZE = 3
+    VECTOR = VEC3
+    VIEW = VEC3View
+
+    def cross(self, other) -> 'VEC3Array':
+        return VEC3Array(np.cross(self._data, np.broadcast_to(self._operand(other), self._data.shape)))
@@ -0,0 +1,101 @@
+"""
+This module defines bounded buffers for large streams of data.
+
+The `LineRingBuffer` class keeps the last lines of a text stream, such as the output of a build or the log of a program,
+without one Python object per line: the UTF-8 bytes of the lines are stored one after the other in a single `bytearray`,
+and the start and length of every line in two arrays of integers. When the bytes or the slots are full, the oldest lines are dropped.
+A line is decoded to a `str` only when it is read, so a history of millions of lines costs its bytes and 12 bytes per line.
+"""
+from array import array
+from typing import Iterable, List
+
+
+class LineRingBuffer:
+    '''
+    A ring buffer of text lines, bounded by a number of lines and a number of bytes.
+
+    The bytes of the lines are written at increasing absolute offsets, whose remainder by `max_bytes` is their place in the buffer.
+    A line is never split: if it does not fit before the end of the buffer, it is written at the start, and the oldest lines
+    whose bytes are overwritten are dropped. Lines longer than `max_bytes` are truncated.
+
+    The lines are indexed from the oldest kept one. `total` counts all the lines ever appended, so `first`, the number of the
+    oldest kept line since the buffer was created, does not change when lines are appended, only when lines are dropped.
+
+    Args:
+        max_lines (int): The number of lines kept.
+        max_bytes (int): The size of the buffer of the UTF-8 bytes of the lines.
+    '''
+    def __init__(self, max_lines:int = 100_000, max_bytes:int = 16 * 1024 * 1024):
+        if max_lines <= 0 or max_bytes <= 0:
+            raise ValueError('max_lines and max_bytes must be positive')
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self._data = bytearray(max_bytes)
+        self._view = memoryview(self._data)
+        self._starts = array('q', bytes(8 * max_lines))
+        self._lengths = array('i', bytes(4 * max_lines))
+        self._head = 0
+        self._count = 0
+        self._end = 0
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def first(self) -> int:
+        ''' The number of the oldest kept line, counted from the first line appended. '''
+        return self.total - self._count
+
+    def extend(self, lines:Iterable[str]) -> int:
+        ''' Appends lines, without their line break. Returns the number of dropped lines. '''
+        __data, __view, __starts, __lengths = self._data, self._view, self._starts, self._lengths
+        __max_bytes, __max_lines = self.max_bytes, self.max_lines
+        __head, __count, __end = self._head, self._count, self._end
+        __dropped = 0
+        for line in lines:
+            __bytes = line.encode('utf-8', 'replace')
+            __length = len(__bytes)
+            if __length > __max_bytes:
+                __bytes, __length = __bytes[:__max_bytes], __max_bytes
+            __offset = __end % __max_bytes
+            if __offset + __length > __max_bytes:
+                __end += __max_bytes - __offset
+                __offset = 0
+
+            # Drops the oldest lines whose bytes the line overwrites, or whose slot it takes
+            __limit = __end + __length - __max_bytes
+            while __count and (__count == __max_lines or __starts[__head] < __limit):
+                __head = __head + 1 if __head + 1 < __max_lines else 0
+                __count -= 1
+                __dropped += 1
+
+            __slot = (__head + __count) % __max_lines
+            __data[__offset:__offset + __length] = __bytes
+            __starts[__slot] = __end
+            __lengths[__slot] = __length
+            __end += __length
+            __count += 1
+            self.total += 1
+
+        self._head, self._count, self._end = __head, __count, __end
+        return __dropped
+
+    def append(self, line:str) -> int:
+        return self.extend((line,))
+
+    def __getitem__(self, index:int) -> str:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('line index out of range')
+        __slot = (self._head + index) % self.max_lines
+        __offset = self._starts[__slot] % self.max_bytes
+        return str(self._view[__offset:__offset + self._lengths[__slot]], 'utf-8', 'replace')
+
+    def get_lines(self, start:int, stop:int) -> List[str]:
+        ''' The lines from `start` to `stop`, clamped to the kept lines. '''
+        return [self[index] for index in range(max(start, 0), min(stop, self._count))]
+
+    def clear(self) -> None:
+        self._head = self._count = self._end = 0
@@ -14,6 +14,12 @@ class RGB:
         self.g = g
         self.b = b
 
+    def copy(self) -> 'RGB':
+        return self.__class__(self.r, self.g, self.b)
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
     def __repr__(self):
         return (self.r, self.g, self.b)
 
@@ -67,12 +73,25 @@ class RGB:
             )
         raise TypeError("Addition only supported between RGB and RGB/RGBA/int instances")
     
-    def __get_pydantic_core_schema__(self, handler):
-        return core_schema.typed_dict_schema({
-                'r': core_schema.typed_dict_field(core_schema.int_schema()),
-                'g': core_schema.typed_dict_field(core_schema.int_schema()),
-                'b': core_schema.typed_dict_field(core_schema.int_schema()),
-            })
+    @classmethod
+    def validate(cls, value) -> 'RGB':
+        ''' Converts an RGB, a dict of its components or a sequence of them to this class. Used by pydantic. '''
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, RGB):
+            return cls(value.r, value.g, value.b)
+        if isinstance(value, dict) and all(key in value for key in ('r', 'g', 'b')):
+            return cls(int(value['r']), int(value['g']), int(value['b']))
+        if isinstance(value, (tuple, list)) and len(value) == 3:
+            return cls(*(int(component) for component in value))
+        raise ValueError(f"Cannot convert {value!r} to {cls.__name__}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda value: {'r': value.r, 'g': value.g, 'b': value.b})
+        )
 
 class RGBA:
     '''
@@ -95,6 +114,12 @@ class RGBA:
         self.b = b
         self.a = a
 
+    def copy(self) -> 'RGBA':
+        return self.__class__(self.r, self.g, self.b, self.a)
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
     def __repr__(self):
         return (self.r, self.g, self.b, self.a)
 
@@ -166,10 +191,22 @@ class RGBA:
             )
         raise TypeError("Addition only supported between RGBA and RGB/RGBA/int or (int:rgb/int:alpha) instances")
     
-    def __get_pydantic_core_schema__(self, handler):
-        return core_schema.typed_dict_schema({
-                'r': core_schema.typed_dict_field(core_schema.int_schema()),
-                'g': core_schema.typed_dict_field(core_schema.int_schema()),
-                'b': core_schema.typed_dict_field(core_schema.int_schema()),
-                'a': core_schema.typed_dict_field(core_schema.int_schema()),
-            })
\ No newline at end of file
+    @classmethod
+    def validate(cls, value) -> 'RGBA':
+        ''' Converts an RGBA, a dict of its components or a sequence of them to this class. Used by pydantic. '''
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, RGBA):
+            return cls(value.r, value.g, value.b, value.a)
+        if isinstance(value, dict) and all(key in value for key in ('r', 'g', 'b', 'a')):
+            return cls(int(value['r']), int(value['g']), int(value['b']), int(value['a']))
+        if isinstance(value, (tuple, list)) and len(value) == 4:
+            return cls(*(int(component) for component in value))
+        raise ValueError(f"Cannot convert {value!r} to {cls.__name__}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda value: {'r': value.r, 'g': value.g, 'b': value.b, 'a': value.a})
+        )
\ No newline at end of file
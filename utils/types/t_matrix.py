@@ -0,0 +1,256 @@
+"""
+This module defines the matrix, quaternion and transform types used for model, view and projection math.
+
+The `MAT4` class is a 4x4 float32 matrix for column vectors, as OpenGL expects: a point is transformed by `M @ p`,
+and `A @ B` applies `B` first. It provides the usual constructors (translation, scale, rotation, perspective, orthographic, look-at),
+products with other matrices, with `VEC3` points and with whole `VEC3Array` buffers, and conversion to `pyglet.math.Mat4` for shader uniforms.
+
+The `QUAT` class represents a rotation as a unit quaternion, and the `TRANSFORM` class combines a position, a rotation and a scale
+into the local matrix `T @ R @ S` of an object.
+
+This module requires NumPy.
+"""
+import math
+import numpy as np
+from pyglet.math import Mat4
+from utils.types.t_vectors import VEC3
+from utils.types.t_arrays import VEC3Array
+
+
+class QUAT:
+    '''
+    A rotation stored as a quaternion with the vector part `x`, `y`, `z` and the scalar part `w`.
+
+    Args:
+        x (float): The x component of the vector part.
+        y (float): The y component of the vector part.
+        z (float): The z component of the vector part.
+        w (float): The scalar part.
+    '''
+    __slots__ = ('x', 'y', 'z', 'w')
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0, w: float = 1.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.w = w
+
+    @classmethod
+    def from_axis_angle(cls, axis: VEC3, angle: float) -> 'QUAT':
+        ''' The rotation by `angle` radians around `axis`. '''
+        __length = math.sqrt(axis.dot(axis)) or 1.0
+        __sin = math.sin(angle / 2) / __length
+        return cls(axis.x * __sin, axis.y * __sin, axis.z * __sin, math.cos(angle / 2))
+
+    @classmethod
+    def from_euler(cls, pitch: float, yaw: float, roll: float) -> 'QUAT':
+        ''' The rotation by `roll` around z, then `pitch` around x, then `yaw` around y, in radians. '''
+        return (cls.from_axis_angle(VEC3(0, 1, 0), yaw)
+                * cls.from_axis_angle(VEC3(1, 0, 0), pitch)
+                * cls.from_axis_angle(VEC3(0, 0, 1), roll))
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+        yield self.z
+        yield self.w
+
+    def __repr__(self):
+        return f"QUAT(x={self.x}, y={self.y}, z={self.z}, w={self.w})"
+
+    def __eq__(self, other):
+        if isinstance(other, QUAT):
+            return self.x == other.x and self.y == other.y and self.z == other.z and self.w == other.w
+        return False
+
+    def __mul__(self, other):
+        ''' The rotation `other` followed by this rotation. '''
+        if isinstance(other, QUAT):
+            return QUAT(
+                self.w * other.x + self.x * other.w + self.y * other.z - self.z * other.y,
+                self.w * other.y - self.x * other.z + self.y * other.w + self.z * other.x,
+                self.w * other.z + self.x * other.y - self.y * other.x + self.z * other.w,
+                self.w * other.w - self.x * other.x - self.y * other.y - self.z * other.z
+            )
+        return NotImplemented
+
+    def conjugate(self) -> 'QUAT':
+        return QUAT(-self.x, -self.y, -self.z, self.w)
+
+    def normalize(self) -> 'QUAT':
+        __length = math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z + self.w * self.w) or 1.0
+        return QUAT(self.x / __length, self.y / __length, self.z / __length, self.w / __length)
+
+    def rotate(self, vector: VEC3) -> VEC3:
+        ''' Rotates a vector by this quaternion. '''
+        __axis = VEC3(self.x, self.y, self.z)
+        __t = __axis.cross(vector) * 2
+        return vector + __t * self.w + __axis.cross(__t)
+
+    def to_matrix(self) -> 'MAT4':
+        return MAT4(MAT4.rotation_array(np.array([tuple(self)], dtype=np.float32))[0])
+
+
+class MAT4:
+    '''
+    A 4x4 float32 matrix for column vectors.
+
+    Args:
+        data (np.ndarray | list, optional): The 4x4 values in row-major order. Defaults to the identity matrix.
+    '''
+    __slots__ = ('_data',)
+
+    def __init__(self, data: 'np.ndarray | list' = None):
+        if data is None:
+            self._data = np.identity(4, dtype=np.float32)
+        else:
+            self._data = np.array(data, dtype=np.float32).reshape(4, 4)
+
+    @property
+    def data(self) -> np.ndarray:
+        ''' The 4x4 values of the matrix, indexed as `[row, column]`. '''
+        return self._data
+
+    @classmethod
+    def identity(cls) -> 'MAT4':
+        return cls()
+
+    @classmethod
+    def translation(cls, vector: VEC3) -> 'MAT4':
+        __matrix = cls()
+        __matrix.data[:3, 3] = tuple(vector)
+        return __matrix
+
+    @classmethod
+    def scale(cls, vector: VEC3) -> 'MAT4':
+        __matrix = cls()
+        __matrix.data[0, 0], __matrix.data[1, 1], __matrix.data[2, 2] = tuple(vector)
+        return __matrix
+
+    @classmethod
+    def rotation(cls, quat: QUAT) -> 'MAT4':
+        return quat.to_matrix()
+
+    @classmethod
+    def perspective(cls, fov: float, aspect: float, near: float, far: float) -> 'MAT4':
+        ''' The OpenGL perspective projection, `fov` is the vertical field of view in radians. '''
+        __f = 1 / math.tan(fov / 2)
+        return cls([
+            [__f / aspect, 0, 0, 0],
+            [0, __f, 0, 0],
+            [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+            [0, 0, -1, 0],
+        ])
+
+    @classmethod
+    def orthographic(cls, left: float, right: float, bottom: float, top: float, near: float, far: float) -> 'MAT4':
+        return cls([
+            [2 / (right - left), 0, 0, -(right + left) / (right - left)],
+            [0, 2 / (top - bottom), 0, -(top + bottom) / (top - bottom)],
+            [0, 0, -2 / (far - near), -(far + near) / (far - near)],
+            [0, 0, 0, 1],
+        ])
+
+    @classmethod
+    def look_at(cls, eye: VEC3, target: VEC3, up: VEC3 = VEC3(0, 1, 0)) -> 'MAT4':
+        ''' The view matrix of a camera at `eye` looking at `target`. '''
+        __forward = np.array(tuple(target - eye), dtype=np.float32)
+        __forward /= np.linalg.norm(__forward)
+        __side = np.cross(__forward, np.array(tuple(up), dtype=np.float32))
+        __side /= np.linalg.norm(__side)
+        __up = np.cross(__side, __forward)
+        __eye = np.array(tuple(eye), dtype=np.float32)
+        return cls([
+            [*__side, -__side.dot(__eye)],
+            [*__up, -__up.dot(__eye)],
+            [*-__forward, __forward.dot(__eye)],
+            [0, 0, 0, 1],
+        ])
+
+    @staticmethod
+    def rotation_array(quats: np.ndarray) -> np.ndarray:
+        ''' The rotation matrices of an `(n, 4)` array of `x, y, z, w` quaternions, as an `(n, 4, 4)` array. '''
+        __x, __y, __z, __w = quats[:, 0], quats[:, 1], quats[:, 2], quats[:, 3]
+        __matrices = np.zeros((len(quats), 4, 4), dtype=np.float32)
+        __matrices[:, 0, 0] = 1 - 2 * (__y * __y + __z * __z)
+        __matrices[:, 0, 1] = 2 * (__x * __y - __z * __w)
+        __matrices[:, 0, 2] = 2 * (__x * __z + __y * __w)
+        __matrices[:, 1, 0] = 2 * (__x * __y + __z * __w)
+        __matrices[:, 1, 1] = 1 - 2 * (__x * __x + __z * __z)
+        __matrices[:, 1, 2] = 2 * (__y * __z - __x * __w)
+        __matrices[:, 2, 0] = 2 * (__x * __z - __y * __w)
+        __matrices[:, 2, 1] = 2 * (__y * __z + __x * __w)
+        __matrices[:, 2, 2] = 1 - 2 * (__x * __x + __y * __y)
+        __matrices[:, 3, 3] = 1
+        return __matrices
+
+    @staticmethod
+    def compose_array(positions: np.ndarray, rotations: np.ndarray, scales: np.ndarray) -> np.ndarray:
+        ''' The `T @ R @ S` matrices of `(n, 3)` positions, `(n, 4)` quaternions and `(n, 3)` scales, as an `(n, 4, 4)` array. '''
+        __matrices = MAT4.rotation_array(rotations)
+        __matrices[:, :3, :3] *= scales[:, None, :]
+        __matrices[:, :3, 3] = positions
+        return __matrices
+
+    def __repr__(self):
+        return f"MAT4({self._data.tolist()})"
+
+    def __eq__(self, other):
+        if isinstance(other, MAT4):
+            return bool(np.array_equal(self._data, other.data))
+        return False
+
+    def __matmul__(self, other):
+        if isinstance(other, MAT4):
+            return MAT4(self._data @ other.data)
+        if isinstance(other, VEC3):
+            return self.transform_point(other)
+        if isinstance(other, VEC3Array):
+            return VEC3Array(other.data @ self._data[:3, :3].T + self._data[:3, 3])
+        return NotImplemented
+
+    def transform_point(self, point: VEC3) -> VEC3:
+        ''' Transforms a point, dividing by `w` for projection matrices. '''
+        __x, __y, __z, __w = self._data @ np.array((point.x, point.y, point.z, 1), dtype=np.float32)
+        if __w != 0 and __w != 1:
+            return VEC3(float(__x / __w), float(__y / __w), float(__z / __w))
+        return VEC3(float(__x), float(__y), float(__z))
+
+    def transform_vector(self, vector: VEC3) -> VEC3:
+        ''' Transforms a direction, ignoring the translation. '''
+        return VEC3(*(float(value) for value in self._data[:3, :3] @ np.array(tuple(vector), dtype=np.float32)))
+
+    def transpose(self) -> 'MAT4':
+        return MAT4(self._data.T)
+
+    def inverse(self) -> 'MAT4':
+        return MAT4(np.linalg.inv(self._data))
+
+    def to_pyglet(self) -> Mat4:
+        ''' Converts the matrix to a column-major `pyglet.math.Mat4`, e.g. for `program['view']`. '''
+        return Mat4(*self._data.T.flatten().tolist())
+
+
+class TRANSFORM:
+    '''
+    A position, rotation and scale, composed into the local matrix `T @ R @ S`.
+
+    Args:
+        position (VEC3, optional): The translation. Defaults to VEC3(0, 0, 0).
+        rotation (QUAT, optional): The rotation. Defaults to no rotation.
+        scale (VEC3, optional): The scale. Defaults to VEC3(1, 1, 1).
+    '''
+    __slots__ = ('position', 'rotation', 'scale')
+
+    def __init__(self, position: VEC3 = None, rotation: QUAT = None, scale: VEC3 = None):
+        self.position = position if position is not None else VEC3(0, 0, 0)
+        self.rotation = rotation if rotation is not None else QUAT()
+        self.scale = scale if scale is not None else VEC3(1, 1, 1)
+
+    def __repr__(self):
+        return f"TRANSFORM(position={self.position}, rotation={self.rotation}, scale={self.scale})"
+
+    def to_matrix(self) -> MAT4:
+        return MAT4(MAT4.compose_array(np.array([tuple(self.position)], dtype=np.float32),
+                                       np.array([tuple(self.rotation)], dtype=np.float32),
+                                       np.array([tuple(self.scale)], dtype=np.float32))[0])
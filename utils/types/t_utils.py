@@ -1,24 +1,268 @@
-import pyglet, os
+import pyglet, os, threading
+import numpy as np
+from collections import OrderedDict
 from utils.types.t_vectors import SVEC2
 
+class ICON_ATLAS:
+    '''
+    Packs icon images into a single texture.
+
+    The `ICON_ATLAS` class loads every PNG of a directory into one `pyglet.image.atlas.TextureBin` and hands out regions of it. 
+    All icons then share one texture, so the sprites of the title bars differ only by their texture coordinates and are drawn together by the batch.
+    Images are decoded and packed on demand by `get()`, the first time an icon is used. `prefetch()` decodes images in a background thread
+    ahead of time, so only the texture upload is left for the first use; `load()` packs a whole directory at once.
+    Relative paths are resolved by `resolve()`, against the root of the package then the `pyglet.resource.path`, not against the current directory.
+    The images are kept under the paths they were asked by, so the paths saved with a workspace stay relative.
+    Args:
+        directory (str): The directory of the icons packed by `load()`.
+        texture_size (int): The width and height of the atlas texture.
+    '''
+    _default:'ICON_ATLAS' = None
+    # The directory of the package, which holds `static`
+    ROOT:str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    def __init__(self, directory:str = 'static/icons', texture_size:int = 512):
+        self._directory = directory
+        self._bin = pyglet.image.atlas.TextureBin(texture_size, texture_size)
+        self._regions = {}
+        self._paths = {}
+        self._decoded = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_default(cls) -> 'ICON_ATLAS':
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @classmethod
+    def resolve(cls, path:str) -> str:
+        """
+        The file of an image: `path` if it is absolute, otherwise the file of the package root or, failing that, the file found by `pyglet.resource`.
+        Raises a `FileNotFoundError` if there is none.
+        """
+        if os.path.isabs(path):
+            if os.path.isfile(path):
+                return path
+        else:
+            __path = os.path.join(cls.ROOT, path)
+            if os.path.isfile(__path):
+                return __path
+            try:
+                __location = pyglet.resource.location(path.replace(os.sep, '/'))
+            except pyglet.resource.ResourceNotFoundException:
+                __location = None
+            if isinstance(__location, pyglet.resource.FileLocation) and os.path.isfile(os.path.join(__location.path, path)):
+                return os.path.join(__location.path, path)
+        raise FileNotFoundError(f"Image not found: {path}, neither in {cls.ROOT} nor in pyglet.resource.path {pyglet.resource.path}")
+
+    def exists(self, path:str) -> bool:
+        """ Checks if the image at `path` is packed or can be found by `resolve()`. """
+        if self.contains(path):
+            return True
+        try:
+            self.resolve(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def get_directory_paths(self) -> list:
+        """ The paths of the PNG images of the directory of the atlas, a relative directory being in the package root. """
+        __directory = self._directory if os.path.isabs(self._directory) else os.path.join(self.ROOT, self._directory)
+        if not os.path.isdir(__directory):
+            return []
+        return [os.path.join(self._directory, name) for name in sorted(os.listdir(__directory)) if name.lower().endswith('.png')]
+
+    @property
+    def textures(self) -> list:
+        return [atlas.texture for atlas in self._bin.atlases]
+
+    def load(self) -> None:
+        """ Packs all PNG images of the directory of the atlas. """
+        for path in self.get_directory_paths():
+            self.pack(path)
+
+    def prefetch(self, paths:list = None) -> threading.Thread:
+        """ 
+        Decodes the images at `paths`, by default all PNG images of the directory of the atlas, in a background thread.
+        Decoding does not use OpenGL, the decoded images are uploaded to the atlas texture by `pack()` on the main thread.
+        Returns the started thread.
+        """
+        if paths is None:
+            paths = self.get_directory_paths()
+        __paths = [os.path.normpath(path) for path in paths]
+
+        def decode() -> None:
+            for path in __paths:
+                with self._lock:
+                    if path in self._regions or path in self._decoded:
+                        continue
+                try:
+                    __image = pyglet.image.load(self.resolve(path)).get_image_data()
+                except FileNotFoundError:
+                    # `pack()` raises the error on the main thread
+                    continue
+                with self._lock:
+                    self._decoded.setdefault(path, __image)
+
+        __thread = threading.Thread(target=decode, name='ICON_ATLAS.prefetch', daemon=True)
+        __thread.start()
+        return __thread
+
+    def pack(self, path:str) -> pyglet.image.TextureRegion:
+        """
+        Packs the image at `path` into the atlas once and returns its region. Images decoded by `prefetch()` are not decoded again.
+        Raises a `FileNotFoundError` if the image can not be found, see `resolve()`.
+        """
+        path = os.path.normpath(path)
+        if path not in self._regions:
+            with self._lock:
+                __image = self._decoded.pop(path, None)
+            __region = self._bin.add(__image if __image is not None else pyglet.image.load(self.resolve(path)))
+            self._regions[path] = __region
+            self._paths[(__region.owner.id, __region.x, __region.y, __region.z)] = path
+        return self._regions[path]
+
+    def get(self, path:str) -> pyglet.image.TextureRegion:
+        """ 
+        Returns a new region of the atlas showing the image at `path`, packing it first if needed. 
+        Each call returns its own region, so resizing it does not resize the other users of the image.
+        """
+        __region = self.pack(path)
+        return __region.get_region(0, 0, __region.width, __region.height)
+
+    def contains(self, path:str) -> bool:
+        """ Checks if the image at `path` is packed into the atlas. """
+        return os.path.normpath(path) in self._regions
+
+    def find(self, image:pyglet.image.AbstractImage) -> str:
+        """ Returns the path of the image shown by a region returned by `get()`, or None if the image is not in the atlas. """
+        __owner = getattr(image, 'owner', None)
+        if __owner is None:
+            return None
+        return self._paths.get((__owner.id, image.x, image.y, image.z))
+
+    def get_size(self, path:str) -> SVEC2:
+        """ Returns the size of the image at `path` in the atlas, packing it first if needed. """
+        __region = self.pack(path)
+        return SVEC2(__region.width, __region.height)
+
+class GLYPH_CACHE:
+    '''
+    Caches the glyphs of strings by font, size and string.
+
+    `get_glyphs()` looks the glyphs of a string up once, the next calls with the same font, size and string return the same tuple.
+    The characters are looked up one by one, without shaping, so the glyphs of a character do not depend on its neighbours:
+    this suits numbers and short labels, whose glyphs are placed in fixed cells by `ComponentNumericLabel`.
+    The `capacity` most recently used strings are kept.
+    `get_quads()` returns the glyphs of long strings, such as the lines of a console, as arrays instead, from a table per font.
+
+    Args:
+        capacity (int): The number of strings kept by the cache.
+    '''
+    _default:'GLYPH_CACHE' = None
+
+    def __init__(self, capacity:int = 4096):
+        self._capacity = capacity
+        self._fonts = {}
+        self._characters = {}
+        self._strings = OrderedDict()
+        self._tables = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def get_default(cls) -> 'GLYPH_CACHE':
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def get_font(self, name:str, size:float, bold:bool = False, italic:bool = False) -> 'pyglet.font.base.Font':
+        """ Returns the font a `Label` with the same style uses. """
+        __key = (name, size, bold, italic)
+        __font = self._fonts.get(__key)
+        if __font is None:
+            __font = self._fonts[__key] = pyglet.font.load(name, size, weight='bold' if bold else 'normal', italic=italic)
+        return __font
+
+    def get_glyphs(self, name:str, size:float, text:str, bold:bool = False, italic:bool = False) -> tuple:
+        """ Returns the glyphs of the characters of `text`. """
+        __key = (name, size, bold, italic, text)
+        __glyphs = self._strings.get(__key)
+        if __glyphs is not None:
+            self._strings.move_to_end(__key)
+            self.hits += 1
+            return __glyphs
+
+        self.misses += 1
+        __characters = self._characters.setdefault((name, size, bold, italic), {})
+        __font = None
+        for character in text:
+            if character not in __characters:
+                __font = __font or self.get_font(name, size, bold, italic)
+                __characters[character] = __font.get_glyphs(character)[0][0]
+        __glyphs = self._strings[__key] = tuple(__characters[character] for character in text)
+        if len(self._strings) > self._capacity:
+            self._strings.popitem(last=False)
+        return __glyphs
+
+    def get_quads(self, name:str, size:float, text:str, bold:bool = False, italic:bool = False) -> tuple:
+        """
+        Returns the quads of the glyphs of `text` as NumPy arrays: the vertices of every glyph relative to its origin and its texture
+        coordinates, of shape `(len(text), 12)`, and the ids of the textures of the glyphs, 0 for the spaces, whose quads are empty.
+        The glyphs of a font are kept in a table indexed by code point, so a string costs a few array operations, not a lookup per character.
+        """
+        __key = (name, size, bold, italic)
+        __table = self._tables.get(__key)
+        if __table is None:
+            __table = self._tables[__key] = {'slots': np.full(128, -1, dtype=np.int32), 'quads': np.zeros((0, 12), dtype=np.float32),
+                                             'tex_coords': np.zeros((0, 12), dtype=np.float32), 'owners': np.zeros(0, dtype=np.int64)}
+        __codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        if len(__codes) and __codes.max() >= len(__table['slots']):
+            __slots = np.full(int(__codes.max()) + 1, -1, dtype=np.int32)
+            __slots[:len(__table['slots'])] = __table['slots']
+            __table['slots'] = __slots
+
+        __slots = __table['slots'][__codes]
+        if (__slots < 0).any():
+            __missing = np.unique(__codes[__slots < 0])
+            __glyphs = self.get_glyphs(name, size, ''.join(map(chr, __missing.tolist())), bold, italic)
+            __quads, __owners = [], []
+            for code, glyph in zip(__missing.tolist(), __glyphs):
+                v0, v1, v2, v3 = glyph.vertices if code != 32 else (0, 0, 0, 0)
+                __quads.append((v0, v1, 0, v2, v1, 0, v2, v3, 0, v0, v3, 0))
+                __owners.append(id(glyph.owner) if code != 32 else 0)
+            __table['slots'][__missing] = np.arange(len(__table['owners']), len(__table['owners']) + len(__missing), dtype=np.int32)
+            __table['quads'] = np.concatenate((__table['quads'], np.array(__quads, dtype=np.float32)))
+            __table['tex_coords'] = np.concatenate((__table['tex_coords'], np.array([glyph.tex_coords for glyph in __glyphs], dtype=np.float32)))
+            __table['owners'] = np.concatenate((__table['owners'], np.array(__owners, dtype=np.int64)))
+            __slots = __table['slots'][__codes]
+        return __table['quads'][__slots], __table['tex_coords'][__slots], __table['owners'][__slots]
+
+    def get_width(self, name:str, size:float, text:str, bold:bool = False, italic:bool = False) -> int:
+        """ Returns the advance of `text` in pixels, without kerning. """
+        return sum(round(glyph.advance) for glyph in self.get_glyphs(name, size, text, bold, italic))
+
+
 class ICON:
     '''
     Represents an icon with a specified size and image.
     
     The `ICON` class provides a way to manage an icon, including its size and the underlying image. It supports both loading an image from a file path or using a pre-existing `pyglet.image.AbstractImage` instance.
     The class provides properties to access and modify the icon's size and image, as well as methods to load an image from a file path.
+    An icon created from a path is a lazy handle: the image is decoded and packed into the default `ICON_ATLAS` the first time `icon` is read,
+    so creating icons, e.g. at import time, costs nothing. A path that can not be found, see `ICON_ATLAS.resolve()`, raises a `FileNotFoundError` then.
     Args:
         icon (pyglet.image.AbstractImage | str): The image representing the icon. Can be a path to an image file or a pre-existing `pyglet.image.AbstractImage` instance.
         size (SVEC2): The size of the icon.
     '''
-    def __init__(self, icon:pyglet.image.AbstractImage | str = pyglet.resource.image('static/favicon.ico'), size:SVEC2 = SVEC2(24,24)):
+    def __init__(self, icon:pyglet.image.AbstractImage | str = 'static/favicon.ico', size:SVEC2 = SVEC2(24,24)):
         self._size = size
+        self._path = None
+        self._icon = None
 
         if isinstance(icon, str):
-            if os.path.isfile(icon):
-                self._icon = pyglet.resource.image(icon)
-                self._icon.width = self.size.width
-                self._icon.height = self.size.height
+            self._path = icon
         else:
             self._icon = icon
 
@@ -30,13 +274,25 @@ class ICON:
     def size(self, size:SVEC2) -> None:
         self._size = size
 
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def loaded(self) -> bool:
+        """ Checks if the image of the icon has been loaded. """
+        return self._icon is not None
+
     @property
     def icon(self) -> pyglet.image.AbstractImage:
+        if self._icon is None and self._path is not None:
+            self._icon = ICON_ATLAS.get_default().get(self._path)
+            self._icon.width = self.size.width
+            self._icon.height = self.size.height
         return self._icon
 
     @icon.setter
     def icon(self, path:str) -> None:
-        if os.path.isfile(path):
-            self._icon = pyglet.resource.image(path)
-            self._icon.width = self.size.width
-            self._icon.height = self.size.height
\ No newline at end of file
+        ICON_ATLAS.resolve(path)
+        self._path = path
+        self._icon = None
@@ -8,6 +8,9 @@ The `SVEC2` and `SVEC3` classes are subclasses of `VEC2` and `VEC3`, respectivel
 The `GRID4` class represents a 2D grid defined by its west, east, north, and south boundaries, and provides methods for performing grid-related operations such as addition, subtraction, and scalar multiplication.
 
 All of these classes are designed to be used as part of a larger application or library, and are intended to provide a consistent and easy-to-use interface for working with 2D and 3D vector and grid data.
+
+The classes use `__slots__` and store every component once: `width`/`height`/`depth` of `SVEC2` and `SVEC3` are other names for `x`/`y`/`z`. 
+The layout creates several vectors per child on every pass, so the types avoid a `__dict__` and property calls on attribute access.
 """
 from pydantic_core import core_schema
 
@@ -20,60 +23,71 @@ class VEC2:
         x (float): The x-coordinate of the vector.
         y (float): The y-coordinate of the vector.
     '''
+    __slots__ = ('x', 'y')
+
     def __init__(self, x: float, y: float):
-        self._x = x
-        self._y = y
+        self.x = x
+        self.y = y
 
-    @property
-    def x(self) -> float:
-        return self._x
-    
-    @x.setter
-    def x(self, x:float) -> None:
-        self._x = x
+    def __iter__(self):
+        yield self.x
+        yield self.y
 
-    @property
-    def y(self) -> float:
-        return self._y
-    
-    @y.setter
-    def y(self, y:float) -> None:
-        self._y = y
+    def copy(self) -> 'VEC2':
+        return self.__class__(self.x, self.y)
+
+    def __deepcopy__(self, memo):
+        # The generic deep copy is slow for slotted classes
+        return self.copy()
 
     def __repr__(self):
-        return f"VEC2(x={self._x}, y={self._y})"
+        return f"VEC2(x={self.x}, y={self.y})"
 
     def __eq__(self, other):
         if isinstance(other, VEC2):
-            return self._x == other.x and self._y == other.y
+            return self.x == other.x and self.y == other.y
         return False
 
     def __add__(self, other):
         if isinstance(other, VEC2):
-            return VEC2(self._x + other.x, self._y + other.y)
+            return self.__class__(self.x + other.x, self.y + other.y)
         return NotImplemented
 
     def __sub__(self, other):
         if isinstance(other, VEC2):
-            return VEC2(self._x - other.x, self._y - other.y)
+            return self.__class__(self.x - other.x, self.y - other.y)
         return NotImplemented
 
     def __mul__(self, scalar: float):
-        return VEC2(self._x * scalar, self._y * scalar)
+        return self.__class__(self.x * scalar, self.y * scalar)
 
     def __rmul__(self, scalar: float):
         return self.__mul__(scalar)
 
     def dot(self, other):
         if isinstance(other, VEC2):
-            return self._x * other.x + self._y * other.y 
+            return self.x * other.x + self.y * other.y 
         return NotImplemented
     
-    def __get_pydantic_core_schema__(self, handler):
-        return core_schema.typed_dict_schema({
-                'x': core_schema.typed_dict_field(core_schema.float_schema()),
-                'y': core_schema.typed_dict_field(core_schema.float_schema()),
-            })
+    @classmethod
+    def validate(cls, value) -> 'VEC2':
+        ''' Converts a VEC2, a dict of its components or a sequence of them to this class. Used by pydantic. '''
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, VEC2):
+            return cls(value.x, value.y)
+        if isinstance(value, dict) and all(key in value for key in ('x', 'y')):
+            return cls(float(value['x']), float(value['y']))
+        if isinstance(value, (tuple, list)) and len(value) == 2:
+            return cls(*(float(component) for component in value))
+        raise ValueError(f"Cannot convert {value!r} to {cls.__name__}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda value: {'x': value.x, 'y': value.y})
+        )
 
 class VEC3:
     '''
@@ -83,79 +97,81 @@ class VEC3:
         y (float): The y-coordinate of the vector.
         z (float): The z-coordinate of the vector.
     '''
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, x: float, y: float, z: float):
-        self._x = x
-        self._y = y
-        self._z = z
+        self.x = x
+        self.y = y
+        self.z = z
 
-    @property
-    def x(self) -> float:
-        return self._x
-    
-    @x.setter
-    def x(self, x:float) -> None:
-        self._x = x
+    def __iter__(self):
+        yield self.x
+        yield self.y
+        yield self.z
 
-    @property
-    def y(self) -> float:
-        return self._y
-    
-    @y.setter
-    def y(self, y:float) -> None:
-        self._y = y
+    def copy(self) -> 'VEC3':
+        return self.__class__(self.x, self.y, self.z)
 
-    @property
-    def z(self) -> float:
-        return self._z
-    
-    @z.setter
-    def z(self, z:float) -> None:
-        self._z = z
+    def __deepcopy__(self, memo):
+        return self.copy()
 
     def __repr__(self):
-        return f"VEC3(x={self._x}, y={self._y}, z={self._z})"
+        return f"VEC3(x={self.x}, y={self.y}, z={self.z})"
 
     def __eq__(self, other):
         if isinstance(other, VEC3):
-            return self._x == other.x and self._y == other.y and self._z == other.z
+            return self.x == other.x and self.y == other.y and self.z == other.z
         return False
 
     def __add__(self, other):
         if isinstance(other, VEC3):
-            return VEC3(self._x + other.x, self._y + other.y, self._z + other.z)
+            return self.__class__(self.x + other.x, self.y + other.y, self.z + other.z)
         return NotImplemented
 
     def __sub__(self, other):
         if isinstance(other, VEC3):
-            return VEC3(self._x - other.x, self._y - other.y, self._z - other.z)
+            return self.__class__(self.x - other.x, self.y - other.y, self.z - other.z)
         return NotImplemented
 
     def __mul__(self, scalar: float):
-        return VEC3(self._x * scalar, self._y * scalar, self._z * scalar)
+        return self.__class__(self.x * scalar, self.y * scalar, self.z * scalar)
 
     def __rmul__(self, scalar: float):
         return self.__mul__(scalar)
 
     def dot(self, other):
         if isinstance(other, VEC3):
-            return self._x * other.x + self._y * other.y + self._z * other.z
+            return self.x * other.x + self.y * other.y + self.z * other.z
         return NotImplemented
 
     def cross(self, other):
         if isinstance(other, VEC3):
-            return VEC3(
-                self._y * other.z - self._z * other.y,
-                self._z * other.x - self._x * other.z,
-                self._x * other.y - self._y * other.x
+            return self.__class__(
+                self.y * other.z - self.z * other.y,
+                self.z * other.x - self.x * other.z,
+                self.x * other.y - self.y * other.x
             )
         return NotImplemented
     
-    def __get_pydantic_core_schema__(self, handler):
-        return core_schema.typed_dict_schema({
-                'x': core_schema.typed_dict_field(core_schema.float_schema()),
-                'y': core_schema.typed_dict_field(core_schema.float_schema()),
-                'z': core_schema.typed_dict_field(core_schema.float_schema()),
-            })
+    @classmethod
+    def validate(cls, value) -> 'VEC3':
+        ''' Converts a VEC3, a dict of its components or a sequence of them to this class. Used by pydantic. '''
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, VEC3):
+            return cls(value.x, value.y, value.z)
+        if isinstance(value, dict) and all(key in value for key in ('x', 'y', 'z')):
+            return cls(float(value['x']), float(value['y']), float(value['z']))
+        if isinstance(value, (tuple, list)) and len(value) == 3:
+            return cls(*(float(component) for component in value))
+        raise ValueError(f"Cannot convert {value!r} to {cls.__name__}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda value: {'x': value.x, 'y': value.y, 'z': value.z})
+        )
     
 class SVEC2(VEC2):
     """
@@ -169,25 +185,15 @@ class SVEC2(VEC2):
         height (float): The height of the vector.
     """
         
-    def __init__(self, width: float, height: float):
-        self._x = self._width = width
-        self._y = self._height = height
+    __slots__ = ()
 
-    @property
-    def width(self) -> float:
-        return self._width
-    
-    @width.setter
-    def width(self, width:float) -> None:
-        self._width = width
+    def __init__(self, width: float, height: float):
+        self.x = width
+        self.y = height
 
-    @property
-    def height(self) -> float:
-        return self._height
-    
-    @height.setter
-    def height(self, height:float) -> None:
-        self._height = height
+    # `width` and `height` are the `x` and `y` slots under other names
+    width = VEC2.x
+    height = VEC2.y
 
 
 
@@ -204,34 +210,17 @@ class SVEC3(VEC3):
         depth (float): The depth of the vector.
     """
         
-    def __init__(self, width: float, height: float, depth: float):
-        self._x = self._width = width
-        self._y = self._height = height
-        self._z = self._depth = depth
-
-    @property
-    def width(self) -> float:
-        return self._width
-    
-    @width.setter
-    def width(self, width:float) -> None:
-        self._width = width
+    __slots__ = ()
 
-    @property
-    def height(self) -> float:
-        return self._height
-    
-    @height.setter
-    def height(self, height:float) -> None:
-        self._height = height
+    def __init__(self, width: float, height: float, depth: float):
+        self.x = width
+        self.y = height
+        self.z = depth
 
-    @property
-    def depth(self) -> float:
-        return self._depth
-    
-    @depth.setter
-    def depth(self, depth:float) -> None:
-        self._depth = depth
+    # `width`, `height` and `depth` are the `x`, `y` and `z` slots under other names
+    width = VEC3.x
+    height = VEC3.y
+    depth = VEC3.z
 
 class GRID4:
     '''
@@ -248,43 +237,19 @@ class GRID4:
         south (float): The south bound of the grid.
     '''
 
-    def __init__(self, west: float, east: float, north: float, south: float):
-        self._west = west
-        self._east = east
-        self._north = north
-        self._south = south
-
-    @property
-    def west(self) -> float:
-        return self._west
-    
-    @west.setter
-    def west(self, west:float) -> None:
-        self._west = west
+    __slots__ = ('west', 'east', 'north', 'south')
 
-    @property
-    def east(self) -> float:
-        return self._east
-    
-    @east.setter
-    def east(self, east:float) -> None:
-        self._east = east
+    def __init__(self, west: float, east: float, north: float, south: float):
+        self.west = west
+        self.east = east
+        self.north = north
+        self.south = south
 
-    @property
-    def north(self) -> float:
-        return self._north
-    
-    @north.setter
-    def north(self, north:float) -> None:
-        self._north = north
+    def copy(self) -> 'GRID4':
+        return self.__class__(self.west, self.east, self.north, self.south)
 
-    @property
-    def south(self) -> float:
-        return self._south
-    
-    @south.setter
-    def south(self, south:float) -> None:
-        self._south = south
+    def __deepcopy__(self, memo):
+        return self.copy()
 
     def __repr__(self):
         return f"GRID(west={self.west}, east={self.east}, north={self.north}, south={self.south})"
@@ -315,10 +280,22 @@ class GRID4:
             return self.west * other.west + self.east * other.east + self.north * other.north + self.south * other.south
         return NotImplemented
     
-    def __get_pydantic_core_schema__(self, handler):
-        return core_schema.typed_dict_schema({
-                'west': core_schema.typed_dict_field(core_schema.float_schema()),
-                'east': core_schema.typed_dict_field(core_schema.float_schema()),
-                'north': core_schema.typed_dict_field(core_schema.float_schema()),
-                'south': core_schema.typed_dict_field(core_schema.float_schema()),
-            })
\ No newline at end of file
+    @classmethod
+    def validate(cls, value) -> 'GRID4':
+        ''' Converts a GRID4, a dict of its components or a sequence of them to this class. Used by pydantic. '''
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, GRID4):
+            return cls(value.west, value.east, value.north, value.south)
+        if isinstance(value, dict) and all(key in value for key in ('west', 'east', 'north', 'south')):
+            return cls(float(value['west']), float(value['east']), float(value['north']), float(value['south']))
+        if isinstance(value, (tuple, list)) and len(value) == 4:
+            return cls(*(float(component) for component in value))
+        raise ValueError(f"Cannot convert {value!r} to {cls.__name__}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda value: {'west': value.west, 'east': value.east, 'north': value.north, 'south': value.south})
+        )
\ No newline at end of file